@@ -0,0 +1,85 @@
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.model.library import Library  # noqa: E402
+from src.core.model.library_repository import LibraryRepository  # noqa: E402
+from src.core.model.profile import Profile  # noqa: E402
+from src.core.model.script import Script  # noqa: E402
+
+sys_param = {
+    'script_count': 100000,
+    'scripts_per_library': 100,
+    'root': os.path.join(os.sep, 'benchmark', 'library'),
+}
+
+
+def get_paths(count: int, per_library: int):
+    paths = []
+    for i in range(count):
+        directory = os.path.join(sys_param['root'], str(i // per_library))
+        paths.append(os.path.join(directory, 'script{}.ahk'.format(i)))
+
+    return paths
+
+
+def measure(build) -> int:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+
+    kept = build()
+
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    del kept
+    return after - before
+
+
+def build_scripts(paths):
+    return [Script(path) for path in paths]
+
+
+def build_repository(paths):
+    repository = LibraryRepository()
+    libraries = {}
+
+    for path in paths:
+        directory = os.path.dirname(path)
+        library = libraries.get(directory)
+        if not library:
+            library = libraries[directory] = Library(directory)
+            repository.add(library)
+
+        library.add(Script(path))
+
+    profile = Profile('benchmark')
+    for path in paths:
+        profile.add(path)
+
+    return repository, profile
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 \
+        else sys_param['script_count']
+    paths = get_paths(count, sys_param['scripts_per_library'])
+
+    # path strings are created before measuring, only models are counted
+    script_bytes = measure(lambda: build_scripts(paths))
+    repository_bytes = measure(lambda: build_repository(paths))
+
+    print('Scripts: {}'.format(count))
+    print('Script objects: {:.0f} bytes per script'.format(
+        script_bytes / count))
+    print('Repository and profile: {:.0f} bytes per script'.format(
+        repository_bytes / count))
+
+
+if __name__ == '__main__':
+    main()
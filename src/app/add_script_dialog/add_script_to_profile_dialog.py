@@ -189,18 +189,9 @@ class AddScriptToProfileDialog(QDialog):
         if not profile:
             return
 
-        self.available_scripts = []
         self.selected_scripts = []
-        scripts = library_service.get_all_scripts()
-
-        for script_id in profile.script_id_list:
-            found = next((x for x in scripts if x.has_id(script_id)), None)
-            if not found:
-                continue
-
-            scripts.remove(found)
-
-        self.available_scripts = scripts
+        self.available_scripts = list(library_service.iter_scripts(
+            lambda x: not profile.has_script(x.key)))
 
     def _select_script(self, script_id):
         script = next((x for x in self.available_scripts
@@ -1,5 +1,4 @@
-from typing import List
-from typing import Callable
+from typing import Callable, Collection, List
 
 from src.core.model.app_model import AppModel
 from src.core.model.library import Library
@@ -26,12 +25,13 @@ class AppService:
     def get_profile_list(self) -> List[Profile]:
         return profile_service.repository.profile_list
 
-    def get_selected_library_scripts(self) -> List[Script]:
+    def get_selected_library_scripts(self) -> Collection[Script]:
         if not self.app_model.selected_library_id:
             return []
 
+        # scripts are not copied, view of the library
         library = library_service.find(self.app_model.selected_library_id)
-        return library.script_list if library else []
+        return library.scripts.values() if library else []
 
     def get_selected_profile_scripts(self) -> List[Library]:
         if not self.app_model.selected_profile_id:
@@ -45,7 +45,8 @@ class AppService:
 
     def save_configuration(self):
         self.configuration.save(profile_service.repository,
-                                library_service.repository)
+                                library_service.repository,
+                                library_service.scan_cache)
 
     # endregion public methods
 
@@ -40,6 +40,9 @@ class LibraryListWidget(ListWidget):
         remove_text = 'Remove'
         start_text = 'Start'
         stop_text = 'Stop'
+        start_tree_text = 'Start with sub-libraries'
+        stop_tree_text = 'Stop with sub-libraries'
+        pause_tree_text = 'Pause with sub-libraries'
         open_in_explorer_text = 'Open in Explorer'
 
         item_selected = self.selectedItems()
@@ -48,6 +51,10 @@ class LibraryListWidget(ListWidget):
             menu.addAction(start_text)
             menu.addAction(stop_text)
             menu.addSeparator()
+            menu.addAction(start_tree_text)
+            menu.addAction(stop_tree_text)
+            menu.addAction(pause_tree_text)
+            menu.addSeparator()
             menu.addAction(remove_text)
             menu.addSeparator()
             menu.addAction(open_in_explorer_text)
@@ -70,6 +77,12 @@ class LibraryListWidget(ListWidget):
             self._open_in_explorer(self.selectedItems())
         elif text == stop_text:
             self._stop(self.selectedItems())
+        elif text == start_tree_text:
+            self._run_tree(self.selectedItems(), library_service.start_tree)
+        elif text == stop_tree_text:
+            self._run_tree(self.selectedItems(), library_service.stop_tree)
+        elif text == pause_tree_text:
+            self._run_tree(self.selectedItems(), library_service.pause_tree)
 
         self.refresh()
 
@@ -142,6 +155,17 @@ class LibraryListWidget(ListWidget):
 
         self._post_process(result)
 
+    def _run_tree(self, items: List[ListWidgetItem], command):
+        if not items:
+            return
+
+        result = ActionResult()
+        for item in items:
+            temp_result, _ = command(item.identifier)
+            result.merge(temp_result)
+
+        self._post_process(result)
+
     def _post_process(self, result: ActionResult):
         self._show_error_dialog(result)
         self.app_service.save_configuration()
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Collection, List
 
 from PyQt5.QtCore import QPoint
 from PyQt5.QtWidgets import QMenu
@@ -46,7 +46,7 @@ class LibraryTableWidget(TableWidget):
 
     # region method implementations
 
-    def get_scripts(self)->List[Script]:
+    def get_scripts(self) -> Collection[Script]:
         return self.app_service.get_selected_library_scripts()
 
     def open_menu(self, position: QPoint):
@@ -1,5 +1,5 @@
 import abc
-from typing import List
+from typing import Collection
 
 from PyQt5.QtCore import QPoint, Qt
 from PyQt5.QtWidgets import (QAbstractItemView, QHeaderView, QTableWidget,
@@ -65,7 +65,7 @@ class TableWidget(QTableWidget):
     # region abstract methods
 
     @abc.abstractmethod
-    def get_scripts(self) -> List[Script]:
+    def get_scripts(self) -> Collection[Script]:
         # return self.app_service.app_model.profile_scripts
         raise NotImplementedError()
 
@@ -81,10 +81,8 @@ class TableWidget(QTableWidget):
             self.setRowCount(0)
             return
 
-        count = len(scripts)
-        self.setRowCount(count)
-        for i in range(0, count):
-            script = scripts[i]
+        self.setRowCount(len(scripts))
+        for i, script in enumerate(scripts):
 
             for column in self.columns:
                 if column == 'Name':
@@ -21,6 +21,8 @@ dialog_message_stop = 'All script has been stopped'
 dialog_message_pause = 'All script has been paused'
 dialog_message_resume = 'All script has been resumed'
 
+tool_tip_running = '{} script(s) running'
+
 # endregion constants
 
 
@@ -59,8 +61,14 @@ class TrayIcon(QSystemTrayIcon):
         exit_action.triggered.connect(self.on_exit_triggered)
 
         self.setContextMenu(menu)
+        self.refresh()
         self.show()
 
+    def refresh(self):
+        # * Running scripts are indexed, count without checking each script
+        self.setToolTip(tool_tip_running.format(
+            len(library_service.get_running_scripts())))
+
     def on_activated(self, reason):
         if reason == QSystemTrayIcon.DoubleClick:
             self.show_triggered()
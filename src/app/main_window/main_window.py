@@ -1,12 +1,14 @@
 import sys
 
-from PyQt5.QtCore import QEvent, Qt
+from PyQt5.QtCore import QEvent, Qt, QTimer
 from PyQt5.QtWidgets import QAction, QMainWindow, QVBoxLayout, QWidget
 
 from src.core.model.library_repository import LibraryRepository
 from src.core.model.profile_repository import ProfileRepository
+from src.core.model.scan_cache import ScanCache
 from src.core.service.library_service import library_service
 from src.core.service.profile_service import profile_service
+from src.core.service.watcher_service import watcher_service
 from src.core.utility.configuration import Configuration
 
 from src.app.application.app_service import AppService
@@ -19,6 +21,8 @@ class MainWindow(QMainWindow):
     configuration = Configuration()
     app_service = AppService()
 
+    watcher_timer_interval = 250
+
     def __init__(self):
         QMainWindow.__init__(self)
 
@@ -39,6 +43,13 @@ class MainWindow(QMainWindow):
         # add tray icon
         self.tray_icon = TrayIcon(self)
 
+        # update libraries when files changed on disk
+        self.watcher_timer = QTimer(self)
+        if self.configuration.utility.enable_watcher:
+            watcher_service.start()
+            self.watcher_timer.timeout.connect(self.on_watcher_timeout)
+            self.watcher_timer.start(self.watcher_timer_interval)
+
         self.refresh()
         self.show()
 
@@ -54,15 +65,26 @@ class MainWindow(QMainWindow):
     # region events
 
     def closeEvent(self, event):
+        self.watcher_timer.stop()
+        watcher_service.stop()
         library_service.stop_all()
 
         # Save configuration when window is closed
         self.configuration.main_window.width = self.width()
         self.configuration.main_window.height = self.height()
         self.app_service.save_configuration()
+        self.configuration.flush()
         self.tray_icon.hide()
         sys.exit()
 
+    def on_watcher_timeout(self):
+        _, changed = watcher_service.process_events()
+        if not changed:
+            return
+
+        self.app_service.save_configuration()
+        self.refresh()
+
     def changeEvent(self, event):
         if event.type() == QEvent.WindowStateChange:
             if self.windowState() & Qt.WindowMinimized:
@@ -74,6 +96,7 @@ class MainWindow(QMainWindow):
 
     def refresh(self):
         self.tab_widget.refresh()
+        self.tray_icon.refresh()
 
     # endregion public methods
 
@@ -82,12 +105,22 @@ class MainWindow(QMainWindow):
     def _load_configs(self):
         # load saved settings
         self.configuration.load()
-        repo = self.configuration.load_libraries()
+        repo, records = self.configuration.load_libraries()
         if repo:
             library_service.repository = LibraryRepository.from_json(repo)
-        repo = self.configuration.load_profiles()
+        library_service.repository.replay(records)
+        repo, records = self.configuration.load_profiles()
+        # profiles refer to scripts by handles of the library repository
+        registry = library_service.repository.registry
         if repo:
-            profile_service.repository = ProfileRepository.from_json(repo)
+            profile_service.repository = ProfileRepository.from_json(
+                repo, registry)
+        else:
+            profile_service.repository = ProfileRepository(registry)
+        profile_service.repository.replay(records)
+        cache = self.configuration.load_scan_cache()
+        if cache:
+            library_service.scan_cache = ScanCache.from_json(cache)
 
     def _create_menus(self):
         main_menu = self.menuBar()
@@ -1,4 +1,4 @@
-from typing import Tuple
+from typing import List, Tuple
 
 from src.core.manager.script_manager import ScriptManager
 from src.core.model.action_result import ActionResult
@@ -12,12 +12,16 @@ class LibraryManager():
     script_manager = ScriptManager()
     utility: Utility = Utility()
 
-    def init_library(self, path: str) -> Tuple[ActionResult, Library]:
+    def init_library(self, path: str, files: List[str] = None) \
+            -> Tuple[ActionResult, Library]:
         """
         Initialize directory and all its sub-directories
 
         Args:
             path (str): directory path
+            files (List[str], optional): Defaults to None. Files already
+                listed by directory scan, the directory will not be
+                listed again when provided
 
         Returns:
             Tuple[ActionResult, Library]: return error
@@ -26,13 +30,16 @@ class LibraryManager():
         result = ActionResult()
         path = self.utility.format_path(path)
 
-        # check whether path is a valid directory
-        if not self.utility.is_dir(path):
-            result.add_error(
-                ErrorMessages.path_is_not_directory_path.format(path))
-            return result, None
+        check_file = files is None
+        if check_file:
+            # check whether path is a valid directory
+            if not self.utility.is_dir(path):
+                result.add_error(
+                    ErrorMessages.path_is_not_directory_path.format(path))
+                return result, None
+
+            files = self.utility.get_files_in_directory(path)
 
-        files = self.utility.get_files_in_directory(path)
         if not files:
             # ignore the directory do not have any file
             result.add_warning(
@@ -42,7 +49,8 @@ class LibraryManager():
         library = Library(path)
         for file in files:
             # initialize script file
-            temp_result, script = self.script_manager.init_script(file)
+            temp_result, script = self.script_manager.init_script(
+                file, check_file)
             result.merge(temp_result)
 
             # only add script to the list when no error returned.
@@ -77,35 +85,44 @@ class LibraryManager():
 
         # fresh all script
         # remove script that is not found
-        for script in library.script_list:
+        for script in list(library.scripts.values()):
             # remove from the script list script failed to refresh
-            temp_result, script = self.script_manager.refresh(script)
+            temp_result, refreshed = self.script_manager.refresh(script)
             result.merge(temp_result)
 
-            if not temp_result.success() or not script:
+            if not temp_result.success() or not refreshed:
                 library.remove(script)
 
         return result
 
-    def reload(self, library: Library)-> Tuple[ActionResult, Library]:
+    def reload(self, library: Library, files: List[str] = None) \
+            -> Tuple[ActionResult, Library]:
         """
         Reload library path, search for new script that not in the library
 
         Args:
             library (Library): library object
+            files (List[str], optional): Defaults to None. Files already
+                listed by directory scan, the directory will not be
+                listed again when provided
 
         Returns:
             Tuple[ActionResult, Library]:
                 ActionResult: return error when library path not exists
         """
         result = ActionResult()
-        # check whether path is a valid directory
-        if not library.exists():
-            result.add_error(
-                ErrorMessages.library_path_not_exists.format(library.path))
-            return result, None
 
-        files = self.utility.get_files_in_directory(library.path)
+        check_file = files is None
+        if check_file:
+            # check whether path is a valid directory
+            if not library.exists():
+                result.add_error(
+                    ErrorMessages.library_path_not_exists
+                    .format(library.path))
+                return result, None
+
+            files = self.utility.get_files_in_directory(library.path)
+
         if not files:
             # ignore the directory do not have any file
             return result, None
@@ -115,7 +132,8 @@ class LibraryManager():
 
             if not script:
                 # initialize script file
-                temp_result, script = self.script_manager.init_script(file)
+                temp_result, script = self.script_manager.init_script(
+                    file, check_file)
                 result.merge(temp_result)
 
                 # only add script to the list when no error returned.
@@ -138,18 +156,12 @@ class LibraryManager():
         result = ActionResult()
 
         # remove each script from the library
-        i = 0
-        while i < len(library.script_list):
-            script = library.script_list[i]
-
+        for script in list(library.scripts.values()):
             temp_result = self.script_manager.remove(script)
             result.merge(temp_result)
 
             if temp_result.success():
-                del library.script_list[i]
-                i -= 1
-
-            i += 1
+                library.remove(script)
 
         if not result.success():
             result.add_error(
@@ -178,7 +190,7 @@ class LibraryManager():
 
         result = ActionResult()
 
-        for script in library.script_list:
+        for script in library.scripts.values():
             temp_result, script = self.script_manager.start(script)
             result.merge(temp_result)
 
@@ -200,7 +212,7 @@ class LibraryManager():
 
         result = ActionResult()
 
-        for script in library.script_list:
+        for script in library.find_running_scripts():
             temp_result, script = self.script_manager.stop(script)
             result.merge(temp_result)
 
@@ -223,7 +235,7 @@ class LibraryManager():
         if library.is_running():
             library.pause()
 
-        for script in library.script_list:
+        for script in library.find_running_scripts():
             temp_result, script = self.script_manager.pause(script)
             result.merge(temp_result)
 
@@ -244,12 +256,92 @@ class LibraryManager():
         if library.is_paused():
             library.resume()
 
-        for script in library.script_list:
+        for script in library.find_paused_scripts():
             temp_result, script = self.script_manager.resume(script)
             result.merge(temp_result)
 
         return result, library
 
+    def start_tree(self, library: Library) -> Tuple[ActionResult, Library]:
+        """
+        Start library, all libraries under it and all their scripts,
+        scripts are started in one pass
+
+        Args:
+            library (Library): library object
+
+        Returns:
+            Tuple[ActionResult, Library]:
+                ActionResult: return error
+                    if failed to start any scripts
+        """
+
+        result = ActionResult()
+        libraries = list(library.iter_tree())
+
+        for script in [x for lib in libraries for x in lib.scripts.values()]:
+            temp_result, script = self.script_manager.start(script)
+            result.merge(temp_result)
+
+        for tree_library in libraries:
+            tree_library.start()
+
+        return result, library
+
+    def stop_tree(self, library: Library) -> Tuple[ActionResult, Library]:
+        """
+        Stop library, all libraries under it and all their scripts,
+        scripts are stopped in one pass
+
+        Args:
+            library (Library): library object
+
+        Returns:
+            Tuple[ActionResult, Library]:
+                ActionResult: return error
+                    if failed to stop any script
+        """
+
+        result = ActionResult()
+        libraries = list(library.iter_tree())
+
+        for script in [x for lib in libraries
+                       for x in lib.find_running_scripts()]:
+            temp_result, script = self.script_manager.stop(script)
+            result.merge(temp_result)
+
+        for tree_library in libraries:
+            tree_library.stop()
+
+        return result, library
+
+    def pause_tree(self, library: Library) -> Tuple[ActionResult, Library]:
+        """
+        Pause library, all libraries under it and all their scripts,
+        scripts are paused in one pass
+
+        Args:
+            library (Library): library object
+
+        Returns:
+            Tuple[ActionResult, Library]:
+                return error when script cannot be stopped
+        """
+
+        result = ActionResult()
+        libraries = list(library.iter_tree())
+
+        for tree_library in libraries:
+            if tree_library.is_running():
+                tree_library.pause()
+
+        for script in [x for lib in libraries
+                       for x in lib.find_running_scripts()]:
+            temp_result, script = self.script_manager.pause(script)
+            result.merge(temp_result)
+
+        return result, library
+
     # endregion command
 
     # def delete(self, library: Library) -> bool:
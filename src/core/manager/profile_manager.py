@@ -5,7 +5,6 @@ from src.core.model.action_result import ActionResult
 from src.core.model.error_messages import ErrorMessages
 from src.core.model.profile import Profile
 from src.core.model.script import Script
-from src.core.service.library_service import library_service
 
 
 class ProfileManager:
@@ -42,8 +41,10 @@ class ProfileManager:
 
         result = ActionResult()
 
-        for script_id in profile.script_id_list:
-            temp_result, _ = library_service.start_script(script_id)
+        for handle in profile.script_handles:
+            temp_result, script = self._check_script_exists(profile, handle)
+            if script:
+                temp_result, _ = self.script_manager.start(script)
             result.merge(temp_result)
 
         profile.start()
@@ -63,8 +64,10 @@ class ProfileManager:
 
         result = ActionResult()
 
-        for script_id in profile.script_id_list:
-            temp_result, _ = library_service.stop_script(script_id)
+        for handle in profile.script_handles:
+            temp_result, script = self._check_script_exists(profile, handle)
+            if script:
+                temp_result, _ = self.script_manager.stop(script)
             result.merge(temp_result)
 
         profile.stop()
@@ -85,8 +88,10 @@ class ProfileManager:
         result = ActionResult()
         profile.stop()
 
-        for script_id in profile.script_id_list:
-            temp_result, _ = library_service.restart_script(script_id)
+        for handle in profile.script_handles:
+            temp_result, script = self._check_script_exists(profile, handle)
+            if script:
+                temp_result, _ = self.script_manager.restart(script)
             result.merge(temp_result)
 
         profile.start()
@@ -107,8 +112,10 @@ class ProfileManager:
 
         result = ActionResult()
 
-        for script_id in profile.script_id_list:
-            script = library_service.find_script(script_id)
+        # profile may be changed while iterating
+        for handle in list(profile.script_handles):
+            script_id = profile.registry.get_path(handle)
+            script = profile.registry.get_script(handle)
 
             if script:
                 temp_result, script = self.script_manager.refresh(script)
@@ -116,7 +123,7 @@ class ProfileManager:
 
                 # remove from the script list script failed to refresh
                 if not temp_result.success() or not script:
-                    profile.remove(script)
+                    profile.remove(script_id)
             else:
                 result.add_error(
                     ErrorMessages.could_not_find_script.format(script_id))
@@ -150,10 +157,24 @@ class ProfileManager:
         profile.add(script.identifier())
 
         if profile.is_running():
-            temp_result, script = library_service.start_script(
-                script.identifier())
+            temp_result, script = self.script_manager.start(script)
             result.merge(temp_result)
 
         return result, profile
 
     # endregion public methods
+
+    # region private methods
+
+    def _check_script_exists(self, profile: Profile, handle: int) \
+            -> Tuple[ActionResult, Script]:
+        result = ActionResult()
+
+        script = profile.registry.get_script(handle)
+        if not script:
+            result.add_error(ErrorMessages.could_not_find_script.format(
+                profile.registry.get_path(handle)))
+
+        return result, script
+
+    # endregion private methods
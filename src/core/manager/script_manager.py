@@ -14,12 +14,16 @@ class ScriptManager:
     configuration = Configuration()
     utility: Utility = Utility()
 
-    def init_script(self, path: str) -> Tuple[ActionResult, Script]:
+    def init_script(self, path: str, check_file: bool = True) \
+            -> Tuple[ActionResult, Script]:
         """
         Initialize script
 
         Args:
             path (str): script path
+            check_file (bool, optional): Defaults to True. Set to false
+                when path is already known to be a file, e.g. found by
+                directory scan, only file type will be checked
 
         Returns:
             Tuple[ActionResult, Script]: return error
@@ -30,7 +34,7 @@ class ScriptManager:
 
         path = self.utility.format_path(path)
         # check if path not the file type we want
-        temp_result = self._is_script_file(path)
+        temp_result = self._is_script_file(path, check_file)
         result.merge(temp_result)
 
         if not temp_result.success():
@@ -273,10 +277,11 @@ class ScriptManager:
         script.start(process)
         return result, script
 
-    def _is_script_file(self, path: str) -> ActionResult:
+    def _is_script_file(self, path: str, check_file: bool = True) \
+            -> ActionResult:
         result = ActionResult()
 
-        if not self.utility.is_file(path):
+        if check_file and not self.utility.is_file(path):
             result.add_error(ErrorMessages.path_is_not_file.format(path))
             return result
 
@@ -1,11 +1,51 @@
-class UtilityConfiguration():
+class ConfigurationModel():
+    """
+    Base of configuration models, counts changes of the settings,
+    so unchanged configuration is not saved
+    """
+
+    def __init__(self):
+        # incremented when any setting is assigned
+        self.version = 0
+
+    def __setattr__(self, name, value):
+        if name != 'version':
+            object.__setattr__(self, 'version',
+                               getattr(self, 'version', 0) + 1)
+
+        object.__setattr__(self, name, value)
+
+
+class UtilityConfiguration(ConfigurationModel):
     def __init__(self):
+        super().__init__()
         self.enable_save = True
         self.enable_logging = False
         self.log_level = 2
         self.enable_debugging = True
         self.file_types = ['.ahk', '.txt']
         self.ahk_executable = 'C:\\Program Files\\AutoHotkey\\AutoHotkey.exe'
+        # number of threads listing directories when adding library,
+        # useful for network drive
+        self.scan_workers = 1
+        # update libraries when script files are created or deleted,
+        # directories are polled where native events are not supported
+        self.enable_watcher = False
+        self.watcher_debounce = 500
+        self.watcher_poll_interval = 2.0
+        # cache file stat result, seconds a result is valid
+        self.enable_stat_cache = False
+        self.stat_cache_ttl = 1.0
+        # repository changes logged before saving a new snapshot
+        self.journal_compact_size = 5000
+        # milliseconds to coalesce save requests, saved in background
+        self.save_delay = 500
+        # flush config files to disk before replacing, survives power loss
+        self.sync_save = False
+        # save each library in its own file, changed libraries only
+        self.shard_libraries = False
+        # number of threads loading library files
+        self.shard_load_workers = 4
 
     def to_json(self):
         out = {}
@@ -16,6 +56,17 @@ class UtilityConfiguration():
         out['enable_debugging'] = self.enable_debugging
         out['file_types'] = self.file_types
         out['ahk_executable'] = self.ahk_executable
+        out['scan_workers'] = self.scan_workers
+        out['enable_watcher'] = self.enable_watcher
+        out['watcher_debounce'] = self.watcher_debounce
+        out['watcher_poll_interval'] = self.watcher_poll_interval
+        out['enable_stat_cache'] = self.enable_stat_cache
+        out['stat_cache_ttl'] = self.stat_cache_ttl
+        out['journal_compact_size'] = self.journal_compact_size
+        out['save_delay'] = self.save_delay
+        out['sync_save'] = self.sync_save
+        out['shard_libraries'] = self.shard_libraries
+        out['shard_load_workers'] = self.shard_load_workers
 
         return out
 
@@ -28,12 +79,32 @@ class UtilityConfiguration():
         config.enable_debugging = json_str['enable_debugging']
         config.file_types = json_str['file_types']
         config.ahk_executable = json_str['ahk_executable']
+        config.scan_workers = json_str.get('scan_workers', config.scan_workers)
+        config.enable_watcher = json_str.get(
+            'enable_watcher', config.enable_watcher)
+        config.watcher_debounce = json_str.get(
+            'watcher_debounce', config.watcher_debounce)
+        config.watcher_poll_interval = json_str.get(
+            'watcher_poll_interval', config.watcher_poll_interval)
+        config.enable_stat_cache = json_str.get(
+            'enable_stat_cache', config.enable_stat_cache)
+        config.stat_cache_ttl = json_str.get(
+            'stat_cache_ttl', config.stat_cache_ttl)
+        config.journal_compact_size = json_str.get(
+            'journal_compact_size', config.journal_compact_size)
+        config.save_delay = json_str.get('save_delay', config.save_delay)
+        config.sync_save = json_str.get('sync_save', config.sync_save)
+        config.shard_libraries = json_str.get(
+            'shard_libraries', config.shard_libraries)
+        config.shard_load_workers = json_str.get(
+            'shard_load_workers', config.shard_load_workers)
 
         return config
 
 
-class MainWindowConfiguration():
+class MainWindowConfiguration(ConfigurationModel):
     def __init__(self):
+        super().__init__()
         self.name = 'AHK Manager'
         self.width = 1000
         self.height = 800
@@ -60,8 +131,9 @@ class MainWindowConfiguration():
         return config
 
 
-class AddScriptDialogConfiguration():
+class AddScriptDialogConfiguration(ConfigurationModel):
     def __init__(self):
+        super().__init__()
         self.name = 'Add script to profile'
         self.width = 1000
         self.height = 800
@@ -85,8 +157,9 @@ class AddScriptDialogConfiguration():
         return config
 
 
-class SettingsDialogConfiguration():
+class SettingsDialogConfiguration(ConfigurationModel):
     def __init__(self):
+        super().__init__()
         self.name = 'Settings'
         self.width = 400
         self.height = 300
@@ -0,0 +1,40 @@
+from enum import IntEnum
+
+
+class FileEventType(IntEnum):
+    CREATED = 0
+    DELETED = 1
+    # events were lost, watched directories need a full scan
+    OVERFLOWED = 2
+
+
+class FileEvent():
+    """
+    File system change reported by file watcher
+
+    Rename is reported as deleted old path and created new path
+    """
+
+    def __init__(self, event_type: FileEventType, path: str,
+                 is_directory: bool = False) -> None:
+        self.type: FileEventType = FileEventType(event_type)
+        self.path: str = path
+        self.is_directory: bool = is_directory
+
+    def __str__(self):
+        out = []
+        out.append('FileEvent:')
+        out.append('\t Type: {}'.format(str(self.type)))
+        out.append('\t Path: {}'.format(self.path))
+        out.append('\t Directory: {}'.format(str(self.is_directory)))
+
+        return '\n'.join(out)
+
+    def __repr__(self):
+        out = 'FileEvent('
+        out += 'type={}, '.format(self.type.name)
+        out += 'path={}, '.format(self.path)
+        out += 'is_directory={}'.format(self.is_directory)
+        out += ')'
+
+        return out
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Callable, Dict, Iterator, List
 
 from src.core.model.script import Script
 from src.core.model.state import State
@@ -11,23 +11,76 @@ class Library():
     which directly map to the file system (directory/folder)
 
     Library uses directory path as ID, which uniquely exists in the system
+
+    Library in the repository is linked to the library of the closest
+    parent directory and the libraries directly under it
     """
+    __slots__ = ('state', 'name', 'path', 'key', 'scripts',
+                 'running_scripts', 'paused_scripts', 'repository',
+                 'parent', 'children')
+
     utility: Utility = Utility()
 
     def __init__(self, path: str) -> None:
         self.state: State = State()
         self.name: str = self.utility.get_file_name_no_extension(path)
+        # canonical path, used to index and compare libraries
+        self.key: str = self.utility.get_path_key(path)
+        # share the string when path is already canonical
         self.path: str = self.utility.format_path(path)
-        self.script_list: List[Script] = []
+        if self.path == self.key:
+            self.path = self.key
+        # script key -> script, in insertion order
+        self.scripts: Dict[str, Script] = {}
+        # script key -> running script
+        self.running_scripts: Dict[str, Script] = {}
+        # script key -> paused script
+        self.paused_scripts: Dict[str, Script] = {}
+
+        # repository contains the library, keeps script index updated
+        self.repository = None
+
+        # linked by repository
+        self.parent: 'Library' = None
+        # library key -> child library
+        self.children: Dict[str, 'Library'] = {}
 
     # region public methods
 
+    @property
+    def script_list(self) -> List[Script]:
+        """
+        Get scripts in the order they were added,
+        the list is a copy, change it does not change the library
+
+        Returns:
+            List[Script]: list of scripts
+        """
+
+        return list(self.scripts.values())
+
+    def iter_tree(self) -> Iterator['Library']:
+        """
+        Iterate the library and all libraries under it, parent first
+
+        Returns:
+            Iterator[Library]: libraries
+        """
+
+        stack = [self]
+        while stack:
+            library = stack.pop()
+            yield library
+
+            stack.extend(reversed(list(library.children.values())))
+
     def start(self):
         """
         Set library running state to True
         """
 
         self.state.running = True
+        self._state_changed()
 
     def stop(self):
         """
@@ -35,6 +88,7 @@ class Library():
         """
 
         self.state.running = False
+        self._state_changed()
 
     def pause(self):
         """
@@ -42,23 +96,47 @@ class Library():
         """
 
         self.state.paused = True
+        self._state_changed()
 
     def is_paused(self):
         return self.state.paused
 
     def resume(self):
         self.state.paused = False
-        self.start()
+        self.state.running = True
+        self._state_changed()
+
+    def restore_state(self, flags: int):
+        """
+        Set saved state flags, e.g. loaded from the journal,
+        running and paused state is kept
+
+        Args:
+            flags (int): State flags
+        """
+
+        self._state_changed(self.state.restore(flags))
 
     def add(self, script: Script):
         """
-        Add script into the library
+        Add script into the library,
+        replaces the script has the same path
 
         Args:
             script (Script): script object
         """
 
-        self.script_list.append(script)
+        existing = self.scripts.get(script.key)
+        if existing:
+            self.remove(existing)
+
+        self.scripts[script.key] = script
+
+        script.library = self
+        self._update_script_state(script)
+
+        if self.repository:
+            self.repository.index_script(self, script)
 
     def remove(self, script: Script):
         """
@@ -68,8 +146,15 @@ class Library():
             script (Script): script object
         """
 
-        if script in self.script_list:
-            self.script_list.remove(script)
+        if self.scripts.get(script.key) is script:
+            del self.scripts[script.key]
+
+            script.library = None
+            self.running_scripts.pop(script.key, None)
+            self.paused_scripts.pop(script.key, None)
+
+            if self.repository:
+                self.repository.unindex_script(script)
 
     def find(self, identifier: str) -> Script:
         """
@@ -82,13 +167,37 @@ class Library():
             Script: script object
         """
 
-        # below statement will benefit when large amount script
-        if not self.may_contains_script(identifier):
-            return None
+        return self.scripts.get(self.utility.get_path_key(identifier))
+
+    def iter_scripts(self, predicate: Callable[[Script], bool] = None,
+                     start: int = 0, stop: int = None) -> Iterator[Script]:
+        """
+        Iterate scripts in the order they were added,
+        library must not be changed while iterating
+
+        Args:
+            predicate (Callable[[Script], bool], optional): Defaults to None.
+                Function returns true for script to include
+            start (int, optional): Defaults to 0. Index of first match
+            stop (int, optional): Defaults to None. Index after last match
+
+        Returns:
+            Iterator[Script]: scripts
+        """
+
+        return self.utility.iter_items(
+            self.scripts.values(), predicate, start, stop)
+
+    def iter_running_scripts(self) -> Iterator[Script]:
+        """
+        Iterate running scripts,
+        scripts must not be started or stopped while iterating
+
+        Returns:
+            Iterator[Script]: scripts
+        """
 
-        # loop to find the script
-        return next(
-            (x for x in self.script_list if x.has_id(identifier)), None)
+        return iter(self.running_scripts.values())
 
     def find_running_scripts(self) -> List[Script]:
         """
@@ -98,7 +207,33 @@ class Library():
             List[Script]: list of scripts
         """
 
-        return list(filter(lambda x: x.is_running(), self.script_list))
+        return list(self.running_scripts.values())
+
+    def find_paused_scripts(self) -> List[Script]:
+        """
+        Find all paused scripts
+
+        Returns:
+            List[Script]: list of scripts
+        """
+
+        return list(self.paused_scripts.values())
+
+    def update_script_state(self, script: Script, saved: bool = False):
+        """
+        Update running and paused scripts,
+        called when script state changed
+
+        Args:
+            script (Script): script object
+            saved (bool, optional): Defaults to False.
+                Whether saved state flags changed
+        """
+
+        self._update_script_state(script)
+
+        if self.repository:
+            self.repository.update_script_state(script, saved)
 
     def has_script(self, identifier: str) -> bool:
         """
@@ -111,11 +246,7 @@ class Library():
             bool: return true when script in the library
         """
 
-        for script in self.script_list:
-            if script.has_id(identifier):
-                return True
-
-        return False
+        return self.utility.get_path_key(identifier) in self.scripts
 
     def has_id(self, identifier: str) -> bool:
         """
@@ -128,8 +259,7 @@ class Library():
             bool: return true when id matches
         """
 
-        _id = self.utility.format_path(identifier)
-        return self.identifier() == _id
+        return self.key == self.utility.get_path_key(identifier)
 
     def identifier(self) -> str:
         """
@@ -178,11 +308,30 @@ class Library():
                 script's parent directory
         """
 
-        return self.path == self.utility.format_path(
+        return self.key == self.utility.get_path_key(
             self.utility.get_parent_directory(identifier))
 
     # endregion public methods
 
+    # region private methods
+
+    def _state_changed(self, saved: bool = False):
+        if self.repository:
+            self.repository.update_library_state(self, saved)
+
+    def _update_script_state(self, script: Script):
+        if script.is_running():
+            self.running_scripts[script.key] = script
+        else:
+            self.running_scripts.pop(script.key, None)
+
+        if script.is_paused():
+            self.paused_scripts[script.key] = script
+        else:
+            self.paused_scripts.pop(script.key, None)
+
+    # endregion private methods
+
     # region to string
 
     def to_json(self):
@@ -193,7 +342,7 @@ class Library():
         out['state'] = self.state.to_json()
 
         out_script_list = []
-        for script in self.script_list:
+        for script in self.scripts.values():
             out_script_list.append(script.to_json())
 
         out['script_list'] = out_script_list
@@ -208,7 +357,7 @@ class Library():
         library.state = State.from_json(json_str['state'])
 
         for script in json_str['script_list']:
-            library.script_list.append(Script.from_json(script))
+            library.add(Script.from_json(script))
 
         return library
 
@@ -219,7 +368,7 @@ class Library():
         out.append('\t Path: {}'.format(self.path))
         out.append('\t State: {}'.format(str(self.state)))
 
-        for script in self.script_list:
+        for script in self.scripts.values():
             out.append(str(script))
 
         return '\n'.join(out)
@@ -229,7 +378,7 @@ class Library():
         out += 'name={}, '.format(self.name)
         out += 'path={}, '.format(self.path)
         out += 'state={}, '.format(repr(self.state))
-        out += 'script_count={}'.format(len(self.script_list))
+        out += 'script_count={}'.format(len(self.scripts))
         out += ')'
 
         return out
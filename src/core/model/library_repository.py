@@ -1,20 +1,82 @@
-from typing import List
+from typing import Callable, Dict, Iterator, List, Optional, Set
 
 from src.core.model.library import Library
 from src.core.model.script import Script
+from src.core.model.script_registry import ScriptRegistry
+from src.core.utility.path_trie import PathTrie
+from src.core.utility.utility import Utility
 
 
 class LibraryRepository():
     """
     Library repository is a library container.
     Stores a list of libraries
+
+    Libraries and scripts are indexed by path key,
+    library keeps the index updated when script added or removed
+    and when script state changed.
+
+    Libraries and scripts are also stored in path tries,
+    for queries of everything under a directory
+
+    Repository has its own script registry, scripts are bound to it.
+    Running libraries own their scripts in the registry,
+    repository acquires and releases the scripts as libraries start,
+    stop, get or lose scripts and are added or removed
+
+    Changes are recorded for the journal, so only the changes are saved
     """
 
-    def __init__(self):
-        self.library_list: List[Library] = []
+    utility: Utility = Utility()
+
+    # more changes than this are not recorded, snapshot is saved instead
+    max_changes: int = 10000
+
+    def __init__(self, registry: ScriptRegistry = None):
+        # script handles, shared with profile repository
+        self.registry: ScriptRegistry = registry or ScriptRegistry()
+
+        # library key -> library, in insertion order
+        self.libraries: Dict[str, Library] = {}
+        # script key -> script
+        self.scripts: Dict[str, Script] = {}
+        # script key -> library contains the script
+        self.script_libraries: Dict[str, Library] = {}
+        # script key -> running script
+        self.running_scripts: Dict[str, Script] = {}
+        # script key -> paused script
+        self.paused_scripts: Dict[str, Script] = {}
+        # library key -> running library, owns its scripts
+        self.running_libraries: Dict[str, Library] = {}
+        # library key -> paused library
+        self.paused_libraries: Dict[str, Library] = {}
+
+        # library key -> library, script key -> script
+        self.library_tree: PathTrie = PathTrie()
+        self.script_tree: PathTrie = PathTrie()
+
+        # journal records since last save,
+        # None when not recorded and snapshot must be saved
+        self.changes: Optional[List[list]] = None
+        # incremented by every change
+        self.version: int = 0
+        # keys of libraries changed since taken, None when all changed
+        self.modified_libraries: Optional[Set[str]] = None
 
     # region public methods
 
+    @property
+    def library_list(self) -> List[Library]:
+        """
+        Get libraries in the order they were added,
+        the list is a copy, change it does not change the repository
+
+        Returns:
+            List[Library]: list of libraries
+        """
+
+        return list(self.libraries.values())
+
     def add(self, library: Library):
         """
         Add library into the repository
@@ -23,7 +85,28 @@ class LibraryRepository():
             library (Library): library object
         """
 
-        self.library_list.append(library)
+        existing = self.libraries.get(library.key)
+        if existing:
+            self.remove(existing)
+
+        library.repository = self
+        self.libraries[library.key] = library
+        self._record('library', library.path, library.state.saved_flags)
+        self._modify(library)
+
+        # * Link to the closest parent, take over its children under library
+        parent = self.library_tree.find_longest_prefix(
+            self.utility.get_parent_directory(library.key))
+        self.library_tree.add(library.key, library)
+        self._link(parent, library)
+
+        for child in self.library_tree.iter_subtree(library.key):
+            if child is not library and child.parent is parent:
+                self._link(library, child)
+        for script in library.scripts.values():
+            self.index_script(library, script)
+        self._update_running(library)
+        self._update_paused(library)
 
     def find(self, identifier: str) -> Library:
         """
@@ -36,8 +119,7 @@ class LibraryRepository():
             Library: library object or None
         """
 
-        return next(
-            (x for x in self.library_list if x.has_id(identifier)), None)
+        return self.libraries.get(self.utility.get_path_key(identifier))
 
     def find_script(self, identifier: str) -> Script:
         """
@@ -50,12 +132,63 @@ class LibraryRepository():
             Script: script object or None
         """
 
-        for library in self.library_list:
-            script = library.find(identifier)
-            if script:
-                return script
+        return self.scripts.get(self.utility.get_path_key(identifier))
+
+    def find_library_contains_script(self, identifier: str) -> Library:
+        """
+        Find library contains the script has given id
+
+        Args:
+            identifier (str): Script path
+
+        Returns:
+            Library: library object or None
+        """
+
+        return self.script_libraries.get(
+            self.utility.get_path_key(identifier))
+
+    def find_closest_library(self, identifier: str) -> Library:
+        """
+        Find the library of the path or the closest parent directory
+
+        Args:
+            identifier (str): file or directory path
+
+        Returns:
+            Library: library object or None
+        """
+
+        return self.library_tree.find_longest_prefix(
+            self.utility.get_path_key(identifier))
+
+    def find_libraries_under(self, identifier: str) -> List[Library]:
+        """
+        Find the library of the directory and all libraries under it
 
-        return None
+        Args:
+            identifier (str): directory path
+
+        Returns:
+            List[Library]: list of libraries, parent first
+        """
+
+        return list(self.library_tree.iter_subtree(
+            self.utility.get_path_key(identifier)))
+
+    def find_scripts_under(self, identifier: str) -> List[Script]:
+        """
+        Find scripts in the directory and all directories under it
+
+        Args:
+            identifier (str): directory path
+
+        Returns:
+            List[Script]: list of scripts
+        """
+
+        return list(self.script_tree.iter_subtree(
+            self.utility.get_path_key(identifier)))
 
     def remove(self, instance: Library):
         """
@@ -65,8 +198,179 @@ class LibraryRepository():
             instance (Library): library instance
         """
 
-        if instance in self.library_list:
-            self.library_list.remove(instance)
+        if self.libraries.get(instance.key) is not instance:
+            return
+
+        del self.libraries[instance.key]
+        self.library_tree.remove(instance.key)
+
+        # * Children are linked to the parent of the removed library
+        for child in list(instance.children.values()):
+            self._link(instance.parent, child)
+        self._link(None, instance)
+
+        for script in instance.scripts.values():
+            self.script_tree.remove(script.key)
+            self._unindex_script(script)
+        self.running_libraries.pop(instance.key, None)
+        self.paused_libraries.pop(instance.key, None)
+        instance.repository = None
+
+        self._record('remove_library', instance.path)
+
+    def remove_tree(self, identifier: str) -> List[Library]:
+        """
+        Remove the library of the directory and all libraries under it
+
+        Args:
+            identifier (str): directory path
+
+        Returns:
+            List[Library]: removed libraries
+        """
+
+        key = self.utility.get_path_key(identifier)
+        libraries = self.library_tree.remove_subtree(key)
+        self._record('remove_tree', identifier)
+
+        for script in self.script_tree.remove_subtree(key):
+            self._unindex_script(script)
+
+        for library in libraries:
+            # * Top libraries of the subtree are linked to parents kept,
+            # there is more than one when no library of the directory
+            self._link(None, library)
+            del self.libraries[library.key]
+            self.running_libraries.pop(library.key, None)
+            self.paused_libraries.pop(library.key, None)
+            library.repository = None
+            library.parent = None
+            library.children = {}
+
+        return libraries
+
+    def index_script(self, library: Library, script: Script):
+        """
+        Add script into the indexes, called when script added into library
+
+        Args:
+            library (Library): library contains the script
+            script (Script): script object
+        """
+
+        self.scripts[script.key] = script
+        self.script_libraries[script.key] = library
+        self.script_tree.add(script.key, script)
+        self._update_script_state(script)
+        handle = self.registry.bind(script)
+        if library.key in self.running_libraries:
+            self.registry.acquire(handle)
+
+        self._record('script', library.path, script.path,
+                     script.state.saved_flags)
+        self._modify(library)
+
+    def unindex_script(self, script: Script):
+        """
+        Remove script from the indexes,
+        called when script removed from library
+
+        Args:
+            script (Script): script object
+        """
+
+        if self.scripts.get(script.key) is not script:
+            return
+
+        self._modify(self.script_libraries[script.key])
+        self.script_tree.remove(script.key)
+        self._unindex_script(script)
+
+        self._record('remove_script', script.path)
+
+    def update_script_state(self, script: Script, saved: bool = False):
+        """
+        Update running and paused scripts, called when script state changed.
+        State is recorded only when saved flags changed
+
+        Args:
+            script (Script): script object
+            saved (bool, optional): Defaults to False.
+                Whether saved state flags changed
+        """
+
+        self._update_script_state(script)
+        self.registry.update_state(script)
+        if not saved:
+            return
+
+        self._record('state', script.path, script.state.saved_flags)
+
+        library = self.script_libraries.get(script.key)
+        if library:
+            self._modify(library)
+
+    def update_library_state(self, library: Library, saved: bool = False):
+        """
+        Update running and paused libraries,
+        called when library state changed.
+        State is recorded only when saved flags changed
+
+        Args:
+            library (Library): library object
+            saved (bool, optional): Defaults to False.
+                Whether saved state flags changed
+        """
+
+        self._update_running(library)
+        self._update_paused(library)
+        if not saved:
+            return
+
+        self._record('library_state', library.path,
+                     library.state.saved_flags)
+        self._modify(library)
+
+    def get_running_scripts(self) -> List[Script]:
+        """
+        Get running scripts from all libraries
+
+        Returns:
+            List[Script]: list of scripts
+        """
+
+        return list(self.running_scripts.values())
+
+    def get_paused_scripts(self) -> List[Script]:
+        """
+        Get paused scripts from all libraries
+
+        Returns:
+            List[Script]: list of scripts
+        """
+
+        return list(self.paused_scripts.values())
+
+    def iter_scripts(self, predicate: Callable[[Script], bool] = None,
+                     start: int = 0, stop: int = None) -> Iterator[Script]:
+        """
+        Iterate scripts of all libraries,
+        repository must not be changed while iterating
+
+        Args:
+            predicate (Callable[[Script], bool], optional): Defaults to None.
+                Function returns true for script to include
+            start (int, optional): Defaults to 0. Index of first match
+            stop (int, optional): Defaults to None. Index after last match
+
+        Returns:
+            Iterator[Script]: scripts
+        """
+
+        scripts = (x for library in self.libraries.values()
+                   for x in library.scripts.values())
+
+        return self.utility.iter_items(scripts, predicate, start, stop)
 
     def get_all_scripts(self) -> List[Script]:
         """
@@ -76,29 +380,190 @@ class LibraryRepository():
             List[Script]: list of scripts
         """
 
-        scripts: List[Script] = []
-        for library in self.library_list:
-            scripts.extend(library.script_list)
-
-        return scripts
+        return list(self.iter_scripts())
 
     def clear(self):
         """
         Clear repository
         """
 
-        self.library_list = []
+        for library in self.libraries.values():
+            library.repository = None
+            library.parent = None
+            library.children = {}
+
+        for script in self.scripts.values():
+            if self.script_libraries[script.key].key \
+                    in self.running_libraries:
+                self.registry.release(self.registry.find_handle(script.key))
+            self.registry.unbind(script)
+
+        self.libraries = {}
+        self.scripts = {}
+        self.script_libraries = {}
+        self.running_scripts = {}
+        self.paused_scripts = {}
+        self.running_libraries = {}
+        self.paused_libraries = {}
+        self.library_tree.clear()
+        self.script_tree.clear()
+        self.changes = None
+        self.version += 1
+        self.modified_libraries = None
+
+    def take_changes(self) -> Optional[List[list]]:
+        """
+        Take journal records since last call, recording continues
+
+        Returns:
+            Optional[List[list]]: records,
+                None when snapshot must be saved instead
+        """
+
+        changes = self.changes
+        self.changes = []
 
+        return changes
+
+    def take_modified_libraries(self) -> Optional[Set[str]]:
+        """
+        Take keys of libraries changed since last call,
+        e.g. to save changed libraries only
+
+        Returns:
+            Optional[Set[str]]: library keys, None when all changed
+        """
+
+        modified = self.modified_libraries
+        self.modified_libraries = set()
+
+        return modified
+
+    def replay(self, records: List[list]):
+        """
+        Apply journal records, in the order they were recorded,
+        record of library or script not found is skipped
+
+        Args:
+            records (List[list]): journal records
+        """
+
+        for record in records:
+            self._apply(*record)
+
+        # replayed changes are saved already
+        self.changes = []
 
     # endregion public methods
 
+    # region private methods
+
+    def _link(self, parent: Library, child: Library):
+        if child.parent:
+            child.parent.children.pop(child.key, None)
+
+        child.parent = parent
+        if parent:
+            parent.children[child.key] = child
+
+    def _update_running(self, library: Library):
+        was_running = library.key in self.running_libraries
+        if was_running == library.is_running():
+            return
+
+        if was_running:
+            del self.running_libraries[library.key]
+        else:
+            self.running_libraries[library.key] = library
+
+        # * Library started or stopped owning its scripts
+        for script in library.scripts.values():
+            handle = self.registry.find_handle(script.key)
+            if was_running:
+                self.registry.release(handle)
+            else:
+                self.registry.acquire(handle)
+
+    def _update_paused(self, library: Library):
+        if library.is_paused():
+            self.paused_libraries[library.key] = library
+        else:
+            self.paused_libraries.pop(library.key, None)
+
+    def _update_script_state(self, script: Script):
+        if script.is_running():
+            self.running_scripts[script.key] = script
+        else:
+            self.running_scripts.pop(script.key, None)
+
+        if script.is_paused():
+            self.paused_scripts[script.key] = script
+        else:
+            self.paused_scripts.pop(script.key, None)
+
+    def _record(self, *record):
+        self.version += 1
+        if self.changes is None:
+            return
+
+        if len(self.changes) >= self.max_changes:
+            self.changes = None
+        else:
+            self.changes.append(list(record))
+
+    def _modify(self, library: Library):
+        if self.modified_libraries is not None:
+            self.modified_libraries.add(library.key)
+
+    def _apply(self, kind: str, path: str, *values):
+        if kind == 'library':
+            library = Library(path)
+            library.state.restore(values[0])
+            self.add(library)
+        elif kind == 'remove_library':
+            library = self.find(path)
+            if library:
+                self.remove(library)
+        elif kind == 'remove_tree':
+            self.remove_tree(path)
+        elif kind == 'library_state':
+            library = self.find(path)
+            if library:
+                library.restore_state(values[0])
+        elif kind == 'script':
+            library = self.find(path)
+            if library:
+                script = Script(values[0])
+                script.state.restore(values[1])
+                library.add(script)
+        elif kind == 'remove_script':
+            script = self.find_script(path)
+            if script:
+                script.library.remove(script)
+        elif kind == 'state':
+            script = self.find_script(path)
+            if script:
+                script.restore_state(values[0])
+
+    def _unindex_script(self, script: Script):
+        library = self.script_libraries.pop(script.key)
+        if library.key in self.running_libraries:
+            self.registry.release(self.registry.find_handle(script.key))
+
+        del self.scripts[script.key]
+        self.running_scripts.pop(script.key, None)
+        self.paused_scripts.pop(script.key, None)
+        self.registry.unbind(script)
+
+    # endregion private methods
+
     # region to string
 
     def to_json(self):
         out = {}
 
         out_library_list = []
-        for library in self.library_list:
+        for library in self.libraries.values():
             out_library_list.append(library.to_json())
 
         out['library_list'] = out_library_list
@@ -110,7 +575,11 @@ class LibraryRepository():
         repo = LibraryRepository()
 
         for library in json_str['library_list']:
-            repo.library_list.append(Library.from_json(library))
+            repo.add(Library.from_json(library))
+
+        # loaded from snapshot, record changes made after it
+        repo.changes = []
+        repo.modified_libraries = set()
 
         return repo
 
@@ -118,14 +587,14 @@ class LibraryRepository():
         out = []
         out.append('Library repository:')
 
-        for library in self.library_list:
+        for library in self.libraries.values():
             out.append(str(library))
 
         return '\n'.join(out)
 
     def __repr__(self):
         out = 'LibraryRepository('
-        out += 'library_count={}'.format(len(self.library_list))
+        out += 'library_count={}'.format(len(self.libraries))
         out += ')'
 
         return out
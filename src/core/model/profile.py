@@ -1,27 +1,61 @@
-from typing import List
+from typing import Dict, List, Optional
 
+from src.core.model.script_registry import ScriptRegistry
 from src.core.model.state import State
 
 
 class Profile():
     """
-    Profile is a script container, stores a list of script IDs.
+    Profile is a script container, stores an ordered set of scripts.
 
     Profile stores script ID only, not script object.
     If script id needed use ProfileService,
     search in library repository using the script id
     The script ids can be used to search script in the library.
 
+    In memory scripts are referred by script registry handle only,
+    script id (path) is kept by the registry and saved to file.
+    Profile in a repository uses the registry of the repository,
+    otherwise its own registry
+
     Profile uses name as ID, which uniquely exists in the system
     """
 
-    def __init__(self, name):
+    __slots__ = ('name', 'state', 'script_handles', '_script_bits',
+                 'registry', 'repository')
+
+    def __init__(self, name, registry: ScriptRegistry = None):
         self.name: str = name
         self.state: State = State()
-        self.script_id_list: List[str] = []
+        # ordered set of script handles, value is not used
+        self.script_handles: Dict[int, None] = {}
+        # the same scripts as bits, None until built
+        self._script_bits: Optional[int] = None
+        # assigns the script handles
+        self.registry: ScriptRegistry = registry or ScriptRegistry()
+
+        # repository contains the profile, keeps script index updated
+        self.repository = None
 
     # region public methods
 
+    @property
+    def script_bits(self) -> int:
+        """
+        Get scripts as bits over script handles, bit n is set for handle n,
+        for set operations between profiles.
+        Bits are built when scripts changed, in O(max handle),
+        so use script_handles for single script
+
+        Returns:
+            int: script bits
+        """
+
+        if self._script_bits is None:
+            self._script_bits = self.registry.to_bits(self.script_handles)
+
+        return self._script_bits
+
     def start(self):
         """
         Set profile running state to true
@@ -29,6 +63,9 @@ class Profile():
 
         self.state.running = True
 
+        if self.repository:
+            self.repository.update_running(self)
+
     def stop(self):
         """
         Set profile running state to false
@@ -36,15 +73,39 @@ class Profile():
 
         self.state.running = False
 
+        if self.repository:
+            self.repository.update_running(self)
+
+    def restore_state(self, flags: int):
+        """
+        Set saved state flags, e.g. loaded from the journal,
+        running state is kept
+
+        Args:
+            flags (int): State flags
+        """
+
+        if self.state.restore(flags) and self.repository:
+            self.repository.update_running(self, True)
+
     def add(self, script_id: str):
         """
-        Add script into profile
+        Add script into profile, script already in profile is ignored
 
         Args:
             script_id (str): script id
         """
 
-        self.script_id_list.append(script_id)
+        handle = self.registry.get_handle(script_id)
+        if handle in self.script_handles:
+            self.registry.free_handle(handle)
+            return
+
+        self.script_handles[handle] = None
+        self._script_bits = None
+
+        if self.repository:
+            self.repository.index_script(self, handle)
 
     def remove(self, script_id: str):
         """
@@ -54,8 +115,37 @@ class Profile():
             script_id (str):
         """
 
-        if script_id in self.script_id_list:
-            self.script_id_list.remove(script_id)
+        handle = self.registry.find_handle(script_id)
+        if handle in self.script_handles:
+            del self.script_handles[handle]
+            self._script_bits = None
+
+            if self.repository:
+                self.repository.unindex_script(self, handle)
+
+            self.registry.free_handle(handle)
+
+    def set_registry(self, registry: ScriptRegistry):
+        """
+        Move script handles to the registry,
+        called when profile added into or removed from repository
+
+        Args:
+            registry (ScriptRegistry): script registry
+        """
+
+        if registry is self.registry:
+            return
+
+        script_handles = {}
+        for handle in self.script_handles:
+            script_handles[registry.get_handle(
+                self.registry.get_path(handle))] = None
+            self.registry.free_handle(handle)
+
+        self.registry = registry
+        self.script_handles = script_handles
+        self._script_bits = None
 
     def has_script(self, identifier: str) -> bool:
         """
@@ -68,10 +158,18 @@ class Profile():
             bool: return true script id found
         """
 
-        if identifier in self.script_id_list:
-            return True
+        return self.registry.find_handle(identifier) in self.script_handles
 
-        return False
+    def get_script_ids(self) -> List[str]:
+        """
+        Get script ids in the order they were added,
+        resolved from the registry
+
+        Returns:
+            List[str]: list of script ids
+        """
+
+        return [self.registry.get_path(x) for x in self.script_handles]
 
     def has_id(self, identifier: str) -> bool:
         """
@@ -120,22 +218,19 @@ class Profile():
 
         out['state'] = self.state.to_json()
 
-        out_script_id_list = []
-        for script_id in self.script_id_list:
-            out_script_id_list.append(script_id)
-
-        out['script_id_list'] = out_script_id_list
+        out['script_id_list'] = self.get_script_ids()
 
         return out
 
     @staticmethod
-    def from_json(json_str):
+    def from_json(json_str, registry: ScriptRegistry = None):
         name = json_str['name']
-        profile = Profile(name)
+        profile = Profile(name, registry)
         profile.state = State.from_json(json_str['state'])
 
+        # duplicated ids saved by older versions are dropped
         for script_id in json_str['script_id_list']:
-            profile.script_id_list.append(script_id)
+            profile.add(script_id)
 
         return profile
 
@@ -145,7 +240,7 @@ class Profile():
         out.append('\t Name: {}'.format(self.name))
         out.append('\t State: {}'.format(str(self.state)))
 
-        for script_id in self.script_id_list:
+        for script_id in self.get_script_ids():
             out.append(script_id)
 
         return '\n'.join(out)
@@ -154,7 +249,7 @@ class Profile():
         out = 'Profile('
         out += 'name={}, '.format(self.name)
         out += 'state={}, '.format(repr(self.state))
-        out += 'script_count={}'.format(len(self.script_id_list))
+        out += 'script_count={}'.format(len(self.script_handles))
         out += ')'
 
         return out
@@ -1,17 +1,48 @@
-from typing import List
+from typing import Dict, List, Optional
 
 from src.core.model.profile import Profile
+from src.core.model.script_registry import ScriptRegistry
 
 
 class ProfileRepository():
     """
     Profile repository is a profile container.
     Stores a list of profiles
+
+    Profiles are indexed by script ID, profile keeps the index updated
+    when script added or removed and when started or stopped
+
+    Profiles use the script registry of the repository, which is
+    the registry of the library repository contains the scripts.
+    Running profiles own their scripts in the registry,
+    repository acquires and releases the scripts as profiles start,
+    stop, get or lose scripts and are added or removed
+
+    Changes are recorded for the journal, so only the changes are saved
     """
 
-    def __init__(self):
+    # more changes than this are not recorded, snapshot is saved instead
+    max_changes: int = 10000
+
+    def __init__(self, registry: ScriptRegistry = None):
+        # script handles, shared with library repository
+        self.registry: ScriptRegistry = registry or ScriptRegistry()
+
         self.profile_list: List[Profile] = []
 
+        # profile name -> profile
+        self.profiles: Dict[str, Profile] = {}
+        # script handle -> profiles contains the script, by profile name
+        self.script_profiles: Dict[int, Dict[str, Profile]] = {}
+        # profile name -> running profile
+        self.running_profiles: Dict[str, Profile] = {}
+
+        # journal records since last save,
+        # None when not recorded and snapshot must be saved
+        self.changes: Optional[List[list]] = None
+        # incremented by every change
+        self.version: int = 0
+
     # region public methods
 
     def add(self, profile: Profile):
@@ -24,6 +55,16 @@ class ProfileRepository():
 
         self.profile_list.append(profile)
 
+        profile.set_registry(self.registry)
+        profile.repository = self
+        self.profiles[profile.identifier()] = profile
+        self._record('profile', profile.identifier(),
+                     profile.state.saved_flags)
+
+        for handle in profile.script_handles:
+            self.index_script(profile, handle)
+        self._update_running(profile)
+
     def find(self, identifier: str) -> Profile:
         """
         Find profile using the identifier (name)
@@ -35,8 +76,57 @@ class ProfileRepository():
             Profile: profile object or None
         """
 
-        return next((x for x in self.profile_list
-                     if x.has_id(identifier)), None)
+        return self.profiles.get(identifier)
+
+    def find_profiles_contains_script(self, script_id: str) \
+            -> List[Profile]:
+        """
+        Find profiles that contains the script
+
+        Args:
+            script_id (str): script id
+
+        Returns:
+            List[Profile]: list of profiles
+        """
+
+        handle = self.registry.find_handle(script_id)
+        return list(self.script_profiles.get(handle, {}).values())
+
+    def find_running_profiles_contains_script(self, script_id: str) \
+            -> List[Profile]:
+        """
+        Find running profiles that contains the script
+
+        Args:
+            script_id (str): script id
+
+        Returns:
+            List[Profile]: list of profiles
+        """
+
+        handle = self.registry.find_handle(script_id)
+        return [x for name, x in self.script_profiles.get(handle, {}).items()
+                if name in self.running_profiles]
+
+    def get_running_script_bits(self, exclude: Profile = None) -> int:
+        """
+        Get scripts of all running profiles as bits
+
+        Args:
+            exclude (Profile, optional): Defaults to None.
+                Profile not included
+
+        Returns:
+            int: union of running profiles script bits
+        """
+
+        bits = 0
+        for profile in self.running_profiles.values():
+            if profile is not exclude:
+                bits |= profile.script_bits
+
+        return bits
 
     def remove(self, instance: Profile):
         """
@@ -46,11 +136,161 @@ class ProfileRepository():
             instance (Profile): profile instance
         """
 
-        if instance in self.profile_list:
-            self.profile_list.remove(instance)
+        if self.profiles.get(instance.identifier()) is not instance:
+            return
+
+        self.profile_list.remove(instance)
+
+        del self.profiles[instance.identifier()]
+        for handle in instance.script_handles:
+            self._unindex_script(instance, handle)
+        self.running_profiles.pop(instance.identifier(), None)
+        instance.repository = None
+        instance.set_registry(ScriptRegistry())
+
+        self._record('remove_profile', instance.identifier())
+
+    def index_script(self, profile: Profile, handle: int):
+        """
+        Add profile into script index, called when script added into profile
+
+        Args:
+            profile (Profile): profile contains the script
+            handle (int): script handle
+        """
+
+        profiles = self.script_profiles.setdefault(handle, {})
+        profiles[profile.identifier()] = profile
+        if profile.identifier() in self.running_profiles:
+            self.registry.acquire(handle)
+
+        self._record('add', profile.identifier(),
+                     self.registry.get_path(handle))
+
+    def unindex_script(self, profile: Profile, handle: int):
+        """
+        Remove profile from script index,
+        called when script removed from profile
+
+        Args:
+            profile (Profile): profile contained the script
+            handle (int): script handle
+        """
+
+        self._unindex_script(profile, handle)
+        self._record('remove', profile.identifier(),
+                     self.registry.get_path(handle))
+
+    def update_running(self, profile: Profile, saved: bool = False):
+        """
+        Update running profiles, called when profile state changed.
+        State is recorded only when saved flags changed
+
+        Args:
+            profile (Profile): profile object
+            saved (bool, optional): Defaults to False.
+                Whether saved state flags changed
+        """
+
+        self._update_running(profile)
+        if saved:
+            self._record('state', profile.identifier(),
+                         profile.state.saved_flags)
+
+    def take_changes(self) -> Optional[List[list]]:
+        """
+        Take journal records since last call, recording continues
+
+        Returns:
+            Optional[List[list]]: records,
+                None when snapshot must be saved instead
+        """
+
+        changes = self.changes
+        self.changes = []
+
+        return changes
+
+    def replay(self, records: List[list]):
+        """
+        Apply journal records, in the order they were recorded,
+        record of profile not found is skipped
+
+        Args:
+            records (List[list]): journal records
+        """
+
+        for record in records:
+            self._apply(*record)
+
+        # replayed changes are saved already
+        self.changes = []
 
     # endregion public methods
 
+    # region private methods
+
+    def _unindex_script(self, profile: Profile, handle: int):
+        profiles = self.script_profiles.get(handle)
+        if not profiles or profile.identifier() not in profiles:
+            return
+
+        del profiles[profile.identifier()]
+        if not profiles:
+            del self.script_profiles[handle]
+
+        if profile.identifier() in self.running_profiles:
+            self.registry.release(handle)
+
+    def _update_running(self, profile: Profile):
+        was_running = profile.identifier() in self.running_profiles
+        if was_running == profile.is_running():
+            return
+
+        if was_running:
+            del self.running_profiles[profile.identifier()]
+        else:
+            self.running_profiles[profile.identifier()] = profile
+
+        # * Profile started or stopped owning its scripts
+        for handle in profile.script_handles:
+            if was_running:
+                self.registry.release(handle)
+            else:
+                self.registry.acquire(handle)
+
+    def _record(self, *record):
+        self.version += 1
+        if self.changes is None:
+            return
+
+        if len(self.changes) >= self.max_changes:
+            self.changes = None
+        else:
+            self.changes.append(list(record))
+
+    def _apply(self, kind: str, name: str, *values):
+        if kind == 'profile':
+            profile = Profile(name, self.registry)
+            profile.state.restore(values[0])
+            self.add(profile)
+            return
+
+        profile = self.find(name)
+        if not profile:
+            return
+
+        if kind == 'remove_profile':
+            self.remove(profile)
+        elif kind == 'add':
+            profile.add(values[0])
+        elif kind == 'remove':
+            profile.remove(values[0])
+        elif kind == 'state':
+            profile.restore_state(values[0])
+
+    # endregion private methods
+
     # region to string
 
     def to_json(self):
@@ -62,11 +302,14 @@ class ProfileRepository():
         return out
 
     @staticmethod
-    def from_json(json_str):
-        repo = ProfileRepository()
+    def from_json(json_str, registry: ScriptRegistry = None):
+        repo = ProfileRepository(registry)
 
         for profile in json_str['profile_list']:
-            repo.profile_list.append(Profile.from_json(profile))
+            repo.add(Profile.from_json(profile, repo.registry))
+
+        # loaded from snapshot, record changes made after it
+        repo.changes = []
 
         return repo
 
@@ -0,0 +1,185 @@
+import os
+from typing import Dict, List, Tuple
+
+from src.core.utility.utility import Utility
+
+
+class ScanCacheEntry():
+    """
+    Last listing of a directory,
+    valid while directory modified time and inode are unchanged
+    """
+
+    __slots__ = ('mtime', 'inode', 'directories', 'files')
+
+    def __init__(self, mtime: int, inode: int,
+                 directories: List[str], files: List[str]) -> None:
+        self.mtime: int = mtime
+        self.inode: int = inode
+        self.directories: List[str] = directories
+        self.files: List[str] = files
+
+    # region public methods
+
+    def matches(self, stat: os.stat_result) -> bool:
+        """
+        Check whether directory is unchanged since the entry was created
+
+        Args:
+            stat (os.stat_result): current directory stat
+
+        Returns:
+            bool: return true when modified time and inode are the same
+        """
+
+        return self.mtime == stat.st_mtime_ns and self.inode == stat.st_ino
+
+    # endregion public methods
+
+    # region to string
+
+    def to_json(self):
+        out = {}
+
+        out['mtime'] = self.mtime
+        out['inode'] = self.inode
+        out['directories'] = self.directories
+        out['files'] = self.files
+
+        return out
+
+    @staticmethod
+    def from_json(json_str):
+        return ScanCacheEntry(json_str['mtime'], json_str['inode'],
+                              json_str['directories'], json_str['files'])
+
+    def __repr__(self):
+        out = 'ScanCacheEntry('
+        out += 'mtime={}, '.format(self.mtime)
+        out += 'inode={}, '.format(self.inode)
+        out += 'directory_count={}, '.format(len(self.directories))
+        out += 'file_count={}'.format(len(self.files))
+        out += ')'
+
+        return out
+
+    # endregion to string
+
+
+class ScanCache():
+    """
+    Scan cache stores the last listing of each scanned directory.
+
+    Directory modified time changes when entry is added, removed or renamed,
+    so an unchanged directory costs a single stat instead of a listing
+    """
+
+    utility: Utility = Utility()
+
+    def __init__(self):
+        self.entries: Dict[str, ScanCacheEntry] = {}
+        self.modified: bool = False
+
+    # region public methods
+
+    def scan_directory(self, dir_path: str) -> Tuple[List[str], List[str]]:
+        """
+        List the immediate directory,
+        cached listing is used when directory is unchanged
+
+        Args:
+            dir_path (str): directory path
+
+        Returns:
+            Tuple[List[str], List[str]]:
+                List[str]: list of sub-directory path
+                List[str]: list of file path
+        """
+
+        try:
+            stat = os.stat(dir_path)
+        except Exception:
+            self.remove(dir_path)
+            return [], []
+
+        entry = self.entries.get(dir_path)
+        if entry and entry.matches(stat):
+            return entry.directories, entry.files
+
+        directories, files = self.utility.scan_directory(dir_path)
+        self.entries[dir_path] = ScanCacheEntry(
+            stat.st_mtime_ns, stat.st_ino, directories, files)
+        self.modified = True
+
+        return directories, files
+
+    def retain(self, dir_path: str, directories: List[str]):
+        """
+        Remove entries under the directory which are not in the given list,
+        e.g. sub-directory deleted since last scan
+
+        Args:
+            dir_path (str): directory path
+            directories (List[str]): directories to keep
+        """
+
+        keep = set(directories)
+        prefix = os.path.join(dir_path, '')
+
+        for path in list(self.entries):
+            if path.startswith(prefix) and path not in keep:
+                self.remove(path)
+
+    def remove(self, dir_path: str):
+        """
+        Remove directory entry
+
+        Args:
+            dir_path (str): directory path
+        """
+
+        if self.entries.pop(dir_path, None):
+            self.modified = True
+
+    def clear(self):
+        """
+        Clear cache
+        """
+
+        self.entries = {}
+        self.modified = True
+
+    # endregion public methods
+
+    # region to string
+
+    def to_json(self):
+        out = {}
+
+        out_entry_list = []
+        for path, entry in self.entries.items():
+            out_entry = entry.to_json()
+            out_entry['path'] = path
+            out_entry_list.append(out_entry)
+
+        out['entry_list'] = out_entry_list
+
+        return out
+
+    @staticmethod
+    def from_json(json_str):
+        cache = ScanCache()
+
+        for entry in json_str['entry_list']:
+            cache.entries[entry['path']] = ScanCacheEntry.from_json(entry)
+
+        return cache
+
+    def __repr__(self):
+        out = 'ScanCache('
+        out += 'entry_count={}'.format(len(self.entries))
+        out += ')'
+
+        return out
+
+    # endregion to string
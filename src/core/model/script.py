@@ -11,14 +11,24 @@ class Script():
     Script is a AutoHotKey file
     """
 
+    __slots__ = ('name', 'path', 'key', 'state', 'process', 'library')
+
     utility: Utility = Utility()
 
     def __init__(self, path: str) -> None:
         self.name: str = self.utility.get_file_name_no_extension(path)
+        # canonical path, used to index and compare scripts
+        self.key: str = self.utility.get_path_key(path)
+        # share the string when path is already canonical
         self.path: str = self.utility.format_path(path)
+        if self.path == self.key:
+            self.path = self.key
         self.state: State = State()
         self.process: Optional[Popen] = None
 
+        # library contains the script, keeps running scripts updated
+        self.library = None
+
     # region public methods
 
     def start(self, process: Popen):
@@ -32,6 +42,7 @@ class Script():
 
         self.process = process
         self.state.running = True
+        self._state_changed()
 
     def stop(self):
         """
@@ -40,6 +51,7 @@ class Script():
 
         self.process = None
         self.state.running = False
+        self._state_changed()
 
     def pause(self):
         """
@@ -47,12 +59,14 @@ class Script():
         """
         self.process = None
         self.state.paused = True
+        self._state_changed()
 
     def is_paused(self) -> bool:
         return self.state.paused
 
     def resume(self):
         self.state.paused = False
+        self._state_changed()
 
     def identifier(self)->str:
         """
@@ -75,8 +89,7 @@ class Script():
             bool:
         """
 
-        _id = self.utility.format_path(identifier)
-        return self.identifier() == _id
+        return self.key == self.utility.get_path_key(identifier)
 
     def exists(self) -> bool:
         """
@@ -115,14 +128,29 @@ class Script():
         Set script locked state to true
         """
 
+        saved = not self.state.lock
         self.state.lock = True
+        self._state_changed(saved)
 
     def startup(self):
         """
         Set script startup state to true
         """
 
+        saved = not self.state.startup
         self.state.startup = True
+        self._state_changed(saved)
+
+    def restore_state(self, flags: int):
+        """
+        Set saved state flags, e.g. loaded from the journal,
+        running and paused state is kept
+
+        Args:
+            flags (int): State flags
+        """
+
+        self._state_changed(self.state.restore(flags))
 
     def is_running(self) -> bool:
         """
@@ -137,6 +165,14 @@ class Script():
 
     # endregion public methods
 
+    # region private methods
+
+    def _state_changed(self, saved: bool = False):
+        if self.library:
+            self.library.update_script_state(self, saved)
+
+    # endregion private methods
+
     # region string
 
     def to_json(self):
@@ -0,0 +1,319 @@
+import heapq
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from src.core.model.script import Script
+from src.core.model.state_table import StateTable
+from src.core.utility.utility import Utility
+
+
+class ScriptRegistry():
+    """
+    Script registry assigns integer handle to each script path.
+
+    Handle of a path is kept while it is referred, by the script bound
+    to it or by profiles contain it, so profiles can hold handles
+    instead of paths. The path is kept once per handle, as first given.
+    Handle not referred anymore is freed and assigned to another path
+    later, lowest first.
+    Script bound to the handle is resolved by list index.
+
+    Set of scripts can be represented as bits (int), bit n is set
+    when the script of handle n is in the set.
+
+    Registry also counts running owners (profiles and libraries)
+    of each script, script with no owner can be stopped,
+    and keeps state of bound scripts in a state table.
+
+    Each library repository has its own registry,
+    shared with the profile repository
+    """
+
+    utility: Utility = Utility()
+
+    def __init__(self):
+        # script key -> handle
+        self.handles: Dict[str, int] = {}
+        # handle -> script key, None when freed
+        self.keys: List[Optional[str]] = []
+        # handle -> script path as first given, None when freed
+        self.paths: List[Optional[str]] = []
+        # handle -> script in library repository or None
+        self.scripts: List[Optional[Script]] = []
+        # handle -> number of running profiles and libraries contain it
+        self.owner_counts: List[int] = []
+        # handle -> number of references, bound script and profiles
+        self.ref_counts: List[int] = []
+        # freed handles, as heap
+        self.free_handles: List[int] = []
+        # handle -> state of bound script
+        self.states: StateTable = StateTable()
+
+    # region public methods
+
+    def get_handle(self, identifier: str) -> int:
+        """
+        Get handle of the script path and add a reference to it,
+        new handle assigned when not exists.
+        The reference must be removed by free_handle when not used
+
+        Args:
+            identifier (str): script path
+
+        Returns:
+            int: handle
+        """
+
+        key = self.utility.get_path_key(identifier)
+        handle = self.handles.get(key)
+        if handle is None:
+            handle = self._new_handle(key, identifier)
+
+        self.ref_counts[handle] += 1
+        return handle
+
+    def free_handle(self, handle: int):
+        """
+        Remove a reference to the handle,
+        handle not referred anymore is freed
+
+        Args:
+            handle (int): handle
+        """
+
+        self.ref_counts[handle] -= 1
+        if self.ref_counts[handle] > 0:
+            return
+
+        del self.handles[self.keys[handle]]
+        self.keys[handle] = None
+        self.paths[handle] = None
+        self.scripts[handle] = None
+        self.owner_counts[handle] = 0
+        heapq.heappush(self.free_handles, handle)
+
+    def find_handle(self, identifier: str) -> Optional[int]:
+        """
+        Find handle of the script path
+
+        Args:
+            identifier (str): script path
+
+        Returns:
+            Optional[int]: handle or None when not assigned
+        """
+
+        return self.handles.get(self.utility.get_path_key(identifier))
+
+    def get_path(self, handle: int) -> Optional[str]:
+        """
+        Get script path of the handle, e.g. to save profile scripts
+
+        Args:
+            handle (int): handle
+
+        Returns:
+            Optional[str]: script path or None when freed
+        """
+
+        return self.paths[handle]
+
+    def get_script(self, handle: int) -> Optional[Script]:
+        """
+        Get script bound to the handle
+
+        Args:
+            handle (int): handle
+
+        Returns:
+            Optional[Script]: script object or None
+        """
+
+        return self.scripts[handle]
+
+    def get_scripts(self, bits: int) -> List[Script]:
+        """
+        Get scripts bound to the handles in the bits
+
+        Args:
+            bits (int): set of handles
+
+        Returns:
+            List[Script]: list of scripts, handle not bound is skipped
+        """
+
+        scripts = []
+        for handle in self.iter_handles(bits):
+            script = self.scripts[handle]
+            if script:
+                scripts.append(script)
+
+        return scripts
+
+    @staticmethod
+    def iter_handles(bits: int) -> Iterator[int]:
+        """
+        Iterate handles in the bits, from the lowest
+
+        Args:
+            bits (int): set of handles
+
+        Returns:
+            Iterator[int]: handles
+        """
+
+        while bits:
+            lowest = bits & -bits
+            yield lowest.bit_length() - 1
+            bits ^= lowest
+
+    @staticmethod
+    def to_bits(handles: Iterable[int]) -> int:
+        """
+        Get set of handles as bits, built in one pass
+
+        Args:
+            handles (Iterable[int]): handles
+
+        Returns:
+            int: set of handles
+        """
+
+        handles = list(handles)
+        if not handles:
+            return 0
+
+        out = bytearray(max(handles) // 8 + 1)
+        for handle in handles:
+            out[handle >> 3] |= 1 << (handle & 7)
+
+        return int.from_bytes(out, 'little')
+
+    def acquire(self, handle: int):
+        """
+        Add a running owner to the script,
+        called when running container starts or gets the script
+
+        Args:
+            handle (int): script handle
+        """
+
+        self.owner_counts[handle] += 1
+
+    def release(self, handle: int):
+        """
+        Remove a running owner from the script,
+        called when running container stops or loses the script
+
+        Args:
+            handle (int): script handle
+        """
+
+        if self.owner_counts[handle] > 0:
+            self.owner_counts[handle] -= 1
+
+    def get_owner_count(self, handle: int) -> int:
+        """
+        Get number of running profiles and libraries contain the script
+
+        Args:
+            handle (int): script handle
+
+        Returns:
+            int: owner count
+        """
+
+        return self.owner_counts[handle]
+
+    def bind(self, script: Script) -> int:
+        """
+        Bind script to the handle of its path, replaces the script bound,
+        called when script added into library repository
+
+        Args:
+            script (Script): script object
+
+        Returns:
+            int: handle
+        """
+
+        handle = self.get_handle(script.path)
+        # * Bound script is referred once
+        if self.scripts[handle] is not None:
+            self.free_handle(handle)
+
+        self.scripts[handle] = script
+        self.states.update(handle, script.state.flags, self._get_pid(script))
+        return handle
+
+    def unbind(self, script: Script):
+        """
+        Unbind script from its handle,
+        handle is freed when not referred by any profile
+
+        Args:
+            script (Script): script object
+        """
+
+        handle = self.handles.get(script.key)
+        if handle is not None and self.scripts[handle] is script:
+            self.scripts[handle] = None
+            self.states.remove(handle)
+            self.free_handle(handle)
+
+    def update_state(self, script: Script):
+        """
+        Store state of bound script, called when script state changed
+
+        Args:
+            script (Script): script object
+        """
+
+        handle = self.handles.get(script.key)
+        if handle is not None and self.scripts[handle] is script:
+            self.states.update(handle, script.state.flags,
+                               self._get_pid(script))
+
+    def select_scripts(self, flags: int, excluded: int = 0) -> List[Script]:
+        """
+        Select bound scripts in the state from the state table
+
+        Args:
+            flags (int): State flags required, e.g. State.RUNNING
+            excluded (int, optional): Defaults to 0. State flags
+                must not be set
+
+        Returns:
+            List[Script]: list of scripts, in handle order
+        """
+
+        return [self.scripts[x] for x in self.states.select(flags, excluded)]
+
+    # endregion public methods
+
+    # region private methods
+
+    def _get_pid(self, script: Script) -> int:
+        pid = getattr(script.process, 'pid', 0)
+        return pid if isinstance(pid, int) else 0
+
+    def _new_handle(self, key: str, path: str) -> int:
+        # share the string when path is already canonical
+        if path == key:
+            path = key
+
+        if self.free_handles:
+            handle = heapq.heappop(self.free_handles)
+            self.keys[handle] = key
+            self.paths[handle] = path
+        else:
+            handle = len(self.keys)
+            self.keys.append(key)
+            self.paths.append(path)
+            self.scripts.append(None)
+            self.owner_counts.append(0)
+            self.ref_counts.append(0)
+
+        self.handles[key] = handle
+        return handle
+
+    # endregion private methods
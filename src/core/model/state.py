@@ -1,10 +1,83 @@
 class State():
+    """
+    State of script, library or profile.
+    The flags are stored as bits of one int
+    """
+
+    __slots__ = ('flags',)
+
+    LOCK = 1
+    STARTUP = 2
+    RUNNING = 4
+    PAUSED = 8
+
+    # flags saved to file, running and paused are not kept after restart
+    SAVED = LOCK | STARTUP
 
     def __init__(self):
-        self.lock: bool = False
-        self.startup: bool = False
-        self.running: bool = False
-        self.paused: bool = False
+        self.flags: int = 0
+
+    # region flags
+
+    @property
+    def lock(self) -> bool:
+        return bool(self.flags & State.LOCK)
+
+    @lock.setter
+    def lock(self, value: bool):
+        self._set_flag(State.LOCK, value)
+
+    @property
+    def startup(self) -> bool:
+        return bool(self.flags & State.STARTUP)
+
+    @startup.setter
+    def startup(self, value: bool):
+        self._set_flag(State.STARTUP, value)
+
+    @property
+    def running(self) -> bool:
+        return bool(self.flags & State.RUNNING)
+
+    @running.setter
+    def running(self, value: bool):
+        self._set_flag(State.RUNNING, value)
+
+    @property
+    def paused(self) -> bool:
+        return bool(self.flags & State.PAUSED)
+
+    @paused.setter
+    def paused(self, value: bool):
+        self._set_flag(State.PAUSED, value)
+
+    @property
+    def saved_flags(self) -> int:
+        return self.flags & State.SAVED
+
+    def restore(self, flags: int) -> bool:
+        """
+        Set saved flags, running and paused are kept
+
+        Args:
+            flags (int): State flags
+
+        Returns:
+            bool: return true when saved flags changed
+        """
+
+        changed = (self.flags ^ flags) & State.SAVED
+        self.flags ^= changed
+
+        return bool(changed)
+
+    def _set_flag(self, flag: int, value: bool):
+        if value:
+            self.flags |= flag
+        else:
+            self.flags &= ~flag
+
+    # endregion flags
 
     # region to string
 
@@ -0,0 +1,123 @@
+from array import array
+from typing import Dict, Iterable, List, Tuple
+
+
+class StateTable():
+    """
+    State of scripts stored by column, indexed by script handle.
+
+    State flags of each script are one byte of the flags column and
+    process id is one item of the pids column, 0 when script has no
+    process. Updating a script is O(1), selecting scripts in a state
+    maps the flags column through a byte table and searches it,
+    both done by bytearray methods instead of checking each script
+    """
+
+    def __init__(self):
+        # handle -> State flags
+        self.flags: bytearray = bytearray()
+        # handle -> process id
+        self.pids: array = array('q')
+
+        # (flags, excluded) -> byte table, 1 for flags selected
+        self._masks: Dict[Tuple[int, int], bytes] = {}
+
+    # region public methods
+
+    def update(self, handle: int, flags: int, pid: int = 0):
+        """
+        Store state of the script
+
+        Args:
+            handle (int): script handle
+            flags (int): State flags
+            pid (int, optional): Defaults to 0. Process id
+        """
+
+        if handle >= len(self.flags):
+            size = handle + 1 - len(self.flags)
+            self.flags.extend(bytes(size))
+            self.pids.frombytes(bytes(size * self.pids.itemsize))
+
+        self.flags[handle] = flags
+        self.pids[handle] = pid
+
+    def remove(self, handle: int):
+        """
+        Clear state of the script
+
+        Args:
+            handle (int): script handle
+        """
+
+        if handle < len(self.flags):
+            self.flags[handle] = 0
+            self.pids[handle] = 0
+
+    def select(self, flags: int, excluded: int = 0) -> List[int]:
+        """
+        Select scripts having all the flags and none of excluded flags
+
+        Args:
+            flags (int): State flags required, e.g. State.RUNNING
+            excluded (int, optional): Defaults to 0. State flags
+                must not be set
+
+        Returns:
+            List[int]: handles of selected scripts, in order
+        """
+
+        selected = self.flags.translate(self._get_mask(flags, excluded))
+
+        handles = []
+        handle = selected.find(1)
+        while handle >= 0:
+            handles.append(handle)
+            handle = selected.find(1, handle + 1)
+
+        return handles
+
+    def count(self, flags: int, excluded: int = 0) -> int:
+        """
+        Count scripts having all the flags and none of excluded flags
+
+        Args:
+            flags (int): State flags required, e.g. State.RUNNING
+            excluded (int, optional): Defaults to 0. State flags
+                must not be set
+
+        Returns:
+            int: number of scripts
+        """
+
+        return self.flags.translate(
+            self._get_mask(flags, excluded)).count(1)
+
+    def get_pids(self, handles: Iterable[int]) -> List[int]:
+        """
+        Get process ids of the scripts
+
+        Args:
+            handles (Iterable[int]): script handles
+
+        Returns:
+            List[int]: process ids, script has no process is skipped
+        """
+
+        return [x for x in map(self.pids.__getitem__, handles) if x]
+
+    # endregion public methods
+
+    # region private methods
+
+    def _get_mask(self, flags: int, excluded: int) -> bytes:
+        mask = self._masks.get((flags, excluded))
+        if mask is None:
+            # ? Script not stored has no flags, selected only by no flags
+            mask = bytes(int(x & flags == flags and not x & excluded)
+                         for x in range(256))
+            self._masks[(flags, excluded)] = mask
+
+        return mask
+
+    # endregion private methods
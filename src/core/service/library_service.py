@@ -1,4 +1,4 @@
-from typing import List
+from typing import Callable, Dict, Iterable, Iterator, List
 from typing import Tuple
 
 from src.core.manager.library_manager import LibraryManager
@@ -7,7 +7,10 @@ from src.core.model.action_result import ActionResult
 from src.core.model.error_messages import ErrorMessages
 from src.core.model.library import Library
 from src.core.model.library_repository import LibraryRepository
+from src.core.model.scan_cache import ScanCache
 from src.core.model.script import Script
+from src.core.model.state import State
+from src.core.utility.configuration import Configuration
 from src.core.utility.utility import Utility
 
 
@@ -15,9 +18,11 @@ class LibraryService:
 
     library_manager: LibraryManager = LibraryManager()
     script_manager: ScriptManager = ScriptManager()
+    configuration: Configuration = Configuration()
     utility: Utility = Utility()
 
     repository: LibraryRepository = LibraryRepository()
+    scan_cache: ScanCache = ScanCache()
 
     # region add
 
@@ -42,25 +47,66 @@ class LibraryService:
         result = ActionResult()
         path = self.utility.format_path(path)
 
+        # * Drop cached stat results before scanning
+        self.utility.stat_cache.new_generation()
+
         # * Check whether path is a valid directory
         if not self.utility.is_dir(path):
             result.add_error(
                 ErrorMessages.path_is_not_directory_path.format(path))
             return result
-        # * Add path itself to repository
-        temp_result = self._init_library(path)
-        result.merge(temp_result)
 
-        # * Initialize all sub directories
-        directories = self.utility.get_directories(path)
-        for directory in directories:
-            temp_result = self._init_library(directory)
+        # * Initialize path itself and all sub directories,
+        # * only directories changed since last scan are listed
+        scan_workers = self.configuration.utility.scan_workers
+        directories = []
+        for directory, files in self.utility.walk_directories(
+                path, scan_workers, self.scan_cache.scan_directory):
+            directories.append(directory)
+            temp_result = self._init_library(directory, files)
             result.merge(temp_result)
 
+        # * Forget directories deleted since last scan
+        self.scan_cache.retain(path, directories)
+
         # ignore errors, initialize library only return warning,
         result.ignore_error()
         return result
 
+    def add_script(self, identifier: str) -> ActionResult:
+        """
+        Add a single script file into the library of its directory,
+        library will be created when not exists
+
+        Args:
+            identifier (str): script path
+
+        Returns:
+            ActionResult: return error when path is not a script file
+        """
+
+        result = ActionResult()
+        identifier = self.utility.format_path(identifier)
+
+        # * Script already in the repository
+        if self.find_script(identifier):
+            return result
+
+        temp_result, script = self.script_manager.init_script(identifier)
+        result.merge(temp_result)
+        if not temp_result.success() or not script:
+            return result
+
+        # * Add script into its library
+        directory = self.utility.get_parent_directory(identifier)
+        library = self.find(directory)
+        if not library:
+            library = Library(directory)
+            self.repository.add(library)
+
+        library.add(script)
+        return result
+
     # endregion add
 
     # region find
@@ -103,9 +149,7 @@ class LibraryService:
             Library: library or None
         """
 
-        identifier = self.utility.format_path(identifier)
-        return next((x for x in self.repository.library_list
-                     if x.has_script(identifier)), None)
+        return self.repository.find_library_contains_script(identifier)
 
     # endregion find
 
@@ -138,6 +182,40 @@ class LibraryService:
 
         return result
 
+    def remove_tree(self, identifier: str) -> ActionResult:
+        """
+        Remove library of the directory and all libraries under it,
+        e.g. the root directory added
+
+        Args:
+            identifier (str): directory path
+
+        Returns:
+            ActionResult: return error when failed to stop any script,
+                libraries failed to stop are kept
+        """
+
+        result = ActionResult()
+        failed = set()
+
+        for library in self.repository.find_libraries_under(identifier):
+            temp_result = self.library_manager.remove(library)
+            result.merge(temp_result)
+
+            if not temp_result.success():
+                failed.add(library)
+
+        # * Remove the whole tree at once when everything is removed
+        if not failed:
+            self.repository.remove_tree(identifier)
+            return result
+
+        for library in self.repository.find_libraries_under(identifier):
+            if library not in failed:
+                self.repository.remove(library)
+
+        return result
+
     def remove_script(self, identifier: str) -> ActionResult:
         """
         Remove script using script ID
@@ -207,6 +285,25 @@ class LibraryService:
 
         return self.library_manager.start(library)
 
+    def start_tree(self, identifier: str) -> Tuple[ActionResult, Library]:
+        """
+        Start library and all libraries under it using library ID
+
+        Args:
+            identifier (str): library path
+
+        Returns:
+            Tuple[ActionResult, Library]:
+                ActionResult: return error when library is not found and
+                    failed to start
+        """
+
+        temp_result, library = self._check_library_exists(identifier)
+        if not temp_result.success() or not library:
+            return temp_result, None
+
+        return self.library_manager.start_tree(library)
+
     def start_script(self, identifier: str) -> Tuple[ActionResult, Script]:
         """
         Start script using script ID
@@ -261,6 +358,25 @@ class LibraryService:
 
         return self.library_manager.stop(library)
 
+    def stop_tree(self, identifier: str) -> Tuple[ActionResult, Library]:
+        """
+        Stop library and all libraries under it using library ID
+
+        Args:
+            identifier (str): library path
+
+        Returns:
+            Tuple[ActionResult, Library]:
+                ActionResult: return error when library is not found and
+                    failed to stop
+        """
+
+        temp_result, library = self._check_library_exists(identifier)
+        if not temp_result.success() or not library:
+            return temp_result, None
+
+        return self.library_manager.stop_tree(library)
+
     def stop_script(self, identifier: str) -> Tuple[ActionResult, Script]:
         """
         Stop script using script ID
@@ -279,6 +395,25 @@ class LibraryService:
 
         return self.script_manager.stop(script)
 
+    def pause_tree(self, identifier: str) -> Tuple[ActionResult, Library]:
+        """
+        Pause library and all libraries under it using library ID
+
+        Args:
+            identifier (str): library path
+
+        Returns:
+            Tuple[ActionResult, Library]:
+                ActionResult: return error when library is not found and
+                    failed to pause
+        """
+
+        temp_result, library = self._check_library_exists(identifier)
+        if not temp_result.success() or not library:
+            return temp_result, None
+
+        return self.library_manager.pause_tree(library)
+
     def stop_all(self) -> ActionResult:
         """
         Stop all library in the repository
@@ -288,8 +423,13 @@ class LibraryService:
         """
 
         result = ActionResult()
+        libraries = self._get_libraries(
+            self.repository.registry.select_scripts(
+                State.RUNNING, State.PAUSED),
+            self.repository.running_libraries,
+            self.repository.paused_libraries)
 
-        for library in self.repository.library_list:
+        for library in libraries:
             temp_result, library = self.library_manager.stop(library)
             result.merge(temp_result)
 
@@ -305,8 +445,12 @@ class LibraryService:
         """
 
         result = ActionResult()
+        libraries = self._get_libraries(
+            self.repository.registry.select_scripts(
+                State.RUNNING, State.PAUSED),
+            self.repository.running_libraries)
 
-        for library in self.repository.library_list:
+        for library in libraries:
             temp_result, library = self.library_manager.pause(library)
             result.merge(temp_result)
 
@@ -322,8 +466,11 @@ class LibraryService:
         """
 
         result = ActionResult()
+        libraries = self._get_libraries(
+            self.repository.registry.select_scripts(State.PAUSED),
+            self.repository.paused_libraries)
 
-        for library in self.repository.library_list:
+        for library in libraries:
             temp_result, library = self.library_manager.resume(library)
             result.merge(temp_result)
 
@@ -347,7 +494,10 @@ class LibraryService:
 
         result = ActionResult()
 
-        for library in self.repository.library_list:
+        # * Each path is checked at most once in this refresh
+        self.utility.stat_cache.new_generation()
+
+        for library in list(self.repository.libraries.values()):
             temp_result = self.library_manager.refresh(library)
 
             if not temp_result.success():
@@ -357,6 +507,24 @@ class LibraryService:
 
         result.ignore_error()
 
+    def iter_scripts(self, predicate: Callable[[Script], bool] = None,
+                     start: int = 0, stop: int = None) -> Iterator[Script]:
+        """
+        Iterate scripts in the repository without copying them into a list,
+        repository must not be changed while iterating
+
+        Args:
+            predicate (Callable[[Script], bool], optional): Defaults to None.
+                Function returns true for script to include
+            start (int, optional): Defaults to 0. Index of first match
+            stop (int, optional): Defaults to None. Index after last match
+
+        Returns:
+            Iterator[Script]: scripts
+        """
+
+        return self.repository.iter_scripts(predicate, start, stop)
+
     def get_all_scripts(self) -> List[Script]:
         """
         Get all scripts in the repository
@@ -367,6 +535,16 @@ class LibraryService:
 
         return self.repository.get_all_scripts()
 
+    def get_running_scripts(self) -> List[Script]:
+        """
+        Get running scripts in the repository
+
+        Returns:
+            List[Script]: list of running scripts
+        """
+
+        return self.repository.get_running_scripts()
+
     # endregion public methods
 
     # region private methods
@@ -394,7 +572,22 @@ class LibraryService:
 
         return result, script
 
-    def _init_library(self, path: str) -> ActionResult:
+    def _get_libraries(self, scripts: Iterable[Script],
+                       *libraries: Dict[str, Library]) -> List[Library]:
+        # * Libraries in the indexes and libraries contain the scripts
+        # selected from the state table,
+        # copied since commands change the indexes
+        out = {}
+        for index in libraries:
+            out.update(index)
+
+        for script in scripts:
+            library = self.repository.script_libraries[script.key]
+            out[library.key] = library
+
+        return list(out.values())
+
+    def _init_library(self, path: str, files: List[str]) -> ActionResult:
         result = ActionResult()
 
         library = self.find(path)
@@ -402,11 +595,13 @@ class LibraryService:
             # ? Library already in the repository, reload library
             result.add_info(
                 ErrorMessages.library_already_exists.format(library.path))
-            temp_result, library = self.library_manager.reload(library)
+            temp_result, library = self.library_manager.reload(
+                library, files)
             result.merge(temp_result)
         else:
             # ? Initialize library when not exists
-            temp_result, library = self.library_manager.init_library(path)
+            temp_result, library = self.library_manager.init_library(
+                path, files)
             result.merge(temp_result)
 
             if temp_result.success() and library:
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Callable, Iterator, List
 from typing import Tuple
 
 from src.core.manager.profile_manager import ProfileManager
@@ -8,14 +8,19 @@ from src.core.model.error_messages import ErrorMessages
 from src.core.model.profile import Profile
 from src.core.model.profile_repository import ProfileRepository
 from src.core.model.script import Script
+from src.core.model.state import State
 from src.core.service.library_service import library_service
+from src.core.utility.utility import Utility
 
 
 class ProfileService:
     profile_manager: ProfileManager = ProfileManager()
     script_manager: ScriptManager = ScriptManager()
+    utility: Utility = Utility()
 
-    repository: ProfileRepository = ProfileRepository()
+    # scripts are referred by handles of the library repository
+    repository: ProfileRepository = ProfileRepository(
+        library_service.repository.registry)
 
     # region add
 
@@ -135,8 +140,7 @@ class ProfileService:
             List[Profile]: list of profiles
         """
 
-        return list(filter(lambda x: x.has_script(identifier),
-                           self.repository.profile_list))
+        return self.repository.find_profiles_contains_script(identifier)
 
     def find_running_profiles_contains_script(self, identifier: str) \
             -> List[Profile]:
@@ -150,9 +154,81 @@ class ProfileService:
             List[Profile]: list of profiles
         """
 
-        return list(filter(lambda x: x.is_running()
-                           and x.has_script(identifier),
-                           self.repository.profile_list))
+        return self.repository.find_running_profiles_contains_script(
+            identifier)
+
+    def get_script_bits(self, identifier: str) -> int:
+        """
+        Get profile scripts as bits over script handles
+
+        Args:
+            identifier (str): profile name
+
+        Returns:
+            int: script bits, 0 when profile not found
+        """
+
+        profile = self.find(identifier)
+        if not profile:
+            return 0
+
+        return profile.script_bits
+
+    def get_running_script_bits(self, exclude: str = '') -> int:
+        """
+        Get scripts needed by running profiles as bits over script handles
+
+        Args:
+            exclude (str, optional): Defaults to ''. Name of profile
+                not included, e.g. the profile being stopped
+
+        Returns:
+            int: union of running profiles script bits
+        """
+
+        return self.repository.get_running_script_bits(self.find(exclude))
+
+    def get_scripts(self, bits: int) -> List[Script]:
+        """
+        Get scripts of the bits, e.g. result of set operations
+        between profile script bits
+
+        Args:
+            bits (int): script bits
+
+        Returns:
+            List[Script]: list of scripts
+        """
+
+        return self.repository.registry.get_scripts(bits)
+
+    def is_script_needed(self, script_id: str, exclude: str = '') -> bool:
+        """
+        Check whether script is needed by a running profile
+        or its running library
+
+        Args:
+            script_id (str): script path
+            exclude (str, optional): Defaults to ''. Name of profile
+                not checked
+
+        Returns:
+            bool: return true when script should keep running
+        """
+
+        handle = self.repository.registry.find_handle(script_id)
+        if handle is None:
+            return False
+
+        count = self.repository.registry.get_owner_count(handle)
+
+        # the excluded profile is one of the owners
+        profile = self.find(exclude)
+        if profile and profile.is_running() and \
+                handle in profile.script_handles:
+            count -= 1
+
+        return count > 0
 
     def get_profile_scripts(self, identifier: str) -> List[Script]:
         """
@@ -165,17 +241,35 @@ class ProfileService:
             List[Script]: list of scripts
         """
 
-        scripts = []
+        return list(self.iter_profile_scripts(identifier))
+
+    def iter_profile_scripts(self, identifier: str,
+                             predicate: Callable[[Script], bool] = None,
+                             start: int = 0, stop: int = None) \
+            -> Iterator[Script]:
+        """
+        Iterate scripts in the given profile, script not found is skipped.
+        Profile must not be changed while iterating
+
+        Args:
+            identifier (str): profile name
+            predicate (Callable[[Script], bool], optional): Defaults to None.
+                Function returns true for script to include
+            start (int, optional): Defaults to 0. Index of first match
+            stop (int, optional): Defaults to None. Index after last match
+
+        Returns:
+            Iterator[Script]: scripts
+        """
+
         profile = self.find(identifier)
         if not profile:
-            return []
+            return iter(())
 
-        for script_id in profile.script_id_list:
-            script = library_service.find_script(script_id)
-            if script:
-                scripts.append(script)
+        scripts = (x for x in map(self.repository.registry.get_script,
+                                  profile.script_handles) if x)
 
-        return scripts
+        return self.utility.iter_items(scripts, predicate, start, stop)
 
     # endregion find
 
@@ -210,19 +304,10 @@ class ProfileService:
             return result
 
         # trying to stop script before remove
-        for profile in self.repository.profile_list:
-            i = 0
-            while i < len(profile.script_id_list):
-                script_id = profile.script_id_list[i]
-
-                temp_result = self.remove_script_from_profile(
-                    profile.identifier(), script_id)
-                result.merge(temp_result)
-
-                if temp_result.success():
-                    i -= 1
-
-                i += 1
+        for script_id in profile.get_script_ids():
+            temp_result = self.remove_script_from_profile(
+                profile.identifier(), script_id)
+            result.merge(temp_result)
 
         self.repository.remove(profile)
         result.ignore_error()
@@ -248,19 +333,14 @@ class ProfileService:
         if not temp_result.success() or not profile:
             return temp_result
 
-        if script_id not in profile.script_id_list:
+        if not profile.has_script(script_id):
             result.add_warning(
                 ErrorMessages.script_not_in_profile
                 .format(profile=profile.identifier(), script=script_id))
             return result
 
         # try to stop script if no one else if running this script
-        # get all profiles and libraries currently running contains script
-        profiles = self.find_running_profiles_contains_script(script_id)
-        library = library_service.find_library_contains_script(script_id)
-
-        # check to see anything is running other than this script
-        if len(profiles) <= 1 and not (library and library.is_running()):
+        if not self.is_script_needed(script_id, profile.identifier()):
             temp_result, _ = library_service.stop_script(
                 script_id)
             result.merge(temp_result)
@@ -287,18 +367,14 @@ class ProfileService:
         # if identifier is a library, delete all script belongs to that library
         library = library_service.find(identifier)
         if library:
-            for script in library.script_list:
-                profiles = self.find_profiles_contains_script(
-                    script.identifier())
-
-                if profiles:
-                    for profile in profiles:
-                        profile.remove(script.identifier())
+            script_ids = list(library.scripts)
         else:
-            profiles = self.find_profiles_contains_script(identifier)
-            if profiles:
-                for profile in profiles:
-                    profile.remove(identifier)
+            script_ids = [identifier]
+
+        # only profiles contain the script are visited
+        for script_id in script_ids:
+            for profile in self.find_profiles_contains_script(script_id):
+                profile.remove(script_id)
 
         result.ignore_error()
         return result
@@ -345,6 +421,71 @@ class ProfileService:
 
         return self.profile_manager.stop(profile)
 
+    def switch(self, from_id: str, to_id: str) \
+            -> Tuple[ActionResult, Profile]:
+        """
+        Switch from one profile to another, only scripts not needed anymore
+        are stopped and only scripts not running are started.
+        Scripts of the other running profiles and running libraries
+        are kept running
+
+        Args:
+            from_id (str): name of profile to stop
+            to_id (str): name of profile to start
+
+        Returns:
+            Tuple[ActionResult, Profile]:
+                ActionResult: return error if profile not found
+                    return warning if script cannot be stopped or started
+                Profile: the started profile
+        """
+
+        result = ActionResult()
+
+        temp_result, from_profile = self._check_profile_exists(from_id)
+        if not temp_result.success() or not from_profile:
+            return temp_result, None
+
+        temp_result, to_profile = self._check_profile_exists(to_id)
+        if not temp_result.success() or not to_profile:
+            return temp_result, None
+
+        if from_profile is to_profile:
+            return self.profile_manager.start(to_profile)
+
+        # * Scripts still needed after the switch
+        needed_bits = self.repository.get_running_script_bits(
+            from_profile) | to_profile.script_bits
+
+        # ? Scripts of the profile not running may not be running either
+        running_bits = from_profile.script_bits \
+            if from_profile.is_running() else 0
+
+        for script in self.get_scripts(
+                from_profile.script_bits & ~needed_bits):
+            # library is running, keep its scripts running
+            if script.library and script.library.is_running():
+                continue
+
+            temp_result, _ = self.script_manager.stop(script)
+            result.merge(temp_result)
+
+        for handle in self.repository.registry.iter_handles(
+                to_profile.script_bits & ~running_bits):
+            script = self.repository.registry.get_script(handle)
+            if not script:
+                result.add_error(ErrorMessages.could_not_find_script.format(
+                    self.repository.registry.get_path(handle)))
+                continue
+
+            temp_result, _ = self.script_manager.start(script)
+            result.merge(temp_result)
+
+        from_profile.stop()
+        to_profile.start()
+        result.ignore_error()
+        return result, to_profile
+
     def stop_all(self) -> ActionResult:
         """
         Stop all script in repository
@@ -354,10 +495,17 @@ class ProfileService:
         """
 
         result = ActionResult()
+        registry = self.repository.registry
 
-        for profile in self.repository.profile_list:
-            temp_result, profile = self.profile_manager.stop(profile)
-            result.merge(temp_result)
+        # * Running scripts of any profile, selected from the state table
+        for handle in registry.states.select(State.RUNNING, State.PAUSED):
+            if handle in self.repository.script_profiles:
+                temp_result, _ = self.script_manager.stop(
+                    registry.get_script(handle))
+                result.merge(temp_result)
+
+        for profile in list(self.repository.running_profiles.values()):
+            profile.stop()
 
         result.ignore_error()
         return result
@@ -390,6 +538,9 @@ class ProfileService:
 
         result = ActionResult()
 
+        # * Each path is checked at most once in this refresh
+        self.utility.stat_cache.new_generation()
+
         for profile in self.repository.profile_list:
             temp_result, profile = self.profile_manager.refresh(profile)
             result.merge(temp_result)
@@ -0,0 +1,199 @@
+import queue
+import time
+from typing import Dict, List, Set, Tuple
+
+from src.core.model.action_result import ActionResult
+from src.core.model.file_event import FileEvent, FileEventType
+from src.core.service.library_service import LibraryService, library_service
+from src.core.utility.configuration import Configuration
+from src.core.utility.file_watcher import FileWatcher, create_file_watcher
+from src.core.utility.utility import Utility
+
+
+class WatcherService:
+    """
+    Keep libraries up to date with the file system.
+
+    Watcher thread only reports events, libraries are updated
+    in process_events(), which should be called on the thread
+    owning the repositories (e.g. by UI timer).
+    Watched directories are synced only when libraries changed
+    """
+
+    configuration: Configuration = Configuration()
+    utility: Utility = Utility()
+    library_service: LibraryService = library_service
+
+    def __init__(self):
+        self.watcher: FileWatcher = None
+
+        # path -> (latest event, time received)
+        self.pending: Dict[str, Tuple[FileEvent, float]] = {}
+        # (id, version) of library repository when last synced
+        self.synced_version: tuple = None
+
+    # region public methods
+
+    def start(self):
+        """
+        Start watching all library directories
+        """
+
+        if self.watcher:
+            return
+
+        self.watcher = create_file_watcher(
+            self.configuration.utility.watcher_poll_interval)
+        self.sync()
+        self.watcher.start()
+
+    def stop(self):
+        """
+        Stop watching, pending events are dropped
+        """
+
+        if not self.watcher:
+            return
+
+        self.watcher.stop()
+        self.watcher = None
+        self.pending = {}
+        self.synced_version = None
+
+    def sync(self):
+        """
+        Watch directories of all libraries and scanned directories,
+        e.g. after library added or removed
+        """
+
+        if not self.watcher:
+            return
+
+        repository = self.library_service.repository
+        self.synced_version = (id(repository), repository.version)
+        self.watcher.sync(self._get_directories())
+
+    def process_events(self) -> Tuple[ActionResult, bool]:
+        """
+        Apply events received more than debounce time ago,
+        later event of the same path replaces the earlier one
+
+        Returns:
+            Tuple[ActionResult, bool]:
+                ActionResult: return warning only
+                bool: return true when any library changed
+        """
+
+        result = ActionResult()
+        if not self.watcher:
+            return result, False
+
+        now = time.monotonic()
+        while True:
+            try:
+                event = self.watcher.events.get_nowait()
+            except queue.Empty:
+                break
+
+            self.pending[event.path] = (event, now)
+
+        debounce = self.configuration.utility.watcher_debounce / 1000
+        ready = [event for event, received in self.pending.values()
+                 if now - received >= debounce]
+
+        changed = False
+        for event in ready:
+            del self.pending[event.path]
+
+            temp_result, temp_changed = self._apply(event)
+            result.merge(temp_result)
+            changed = changed or temp_changed
+
+        # * Watch new directories and forget removed ones,
+        # libraries may also be added or removed by user
+        repository = self.library_service.repository
+        version = (id(repository), repository.version)
+        if ready or version != self.synced_version:
+            self.sync()
+
+        result.ignore_error()
+        return result, changed
+
+    # endregion public methods
+
+    # region private methods
+
+    def _apply(self, event: FileEvent) -> Tuple[ActionResult, bool]:
+        if event.type == FileEventType.OVERFLOWED:
+            return self._rescan()
+
+        self.utility.stat_cache.invalidate(event.path)
+
+        if event.is_directory:
+            if event.type == FileEventType.CREATED:
+                return self.library_service.add(event.path), True
+
+            return self._remove_directory(event.path)
+
+        if event.type == FileEventType.CREATED:
+            result = self.library_service.add_script(event.path)
+            return result, result.success()
+
+        # ? Script deleted, the process is stopped as well
+        if not self.library_service.find_script(event.path):
+            return ActionResult(), False
+
+        return self.library_service.remove_script(event.path), True
+
+    def _remove_directory(self, dir_path: str) -> Tuple[ActionResult, bool]:
+        result = ActionResult()
+
+        libraries = self.library_service.repository.find_libraries_under(
+            dir_path)
+        if libraries:
+            result.merge(self.library_service.remove_tree(dir_path))
+
+        # forget deleted directories, so they will not be watched
+        self.library_service.scan_cache.retain(dir_path, [])
+        self.library_service.scan_cache.remove(dir_path)
+
+        return result, bool(libraries)
+
+    def _rescan(self) -> Tuple[ActionResult, bool]:
+        # events lost, scan all root directories again
+        result = ActionResult()
+
+        for root in self._get_roots(self._get_directories()):
+            result.merge(self.library_service.add(root))
+
+        self.library_service.refresh()
+        return result, True
+
+    def _get_directories(self) -> Set[str]:
+        repository = self.library_service.repository
+        directories = set(self.library_service.scan_cache.entries)
+        directories.update(x.path for x in repository.libraries.values())
+
+        return directories
+
+    def _get_roots(self, directories: Set[str]) -> List[str]:
+        roots = []
+
+        for path in directories:
+            parent = self.utility.get_parent_directory(path)
+            while parent not in directories:
+                grandparent = self.utility.get_parent_directory(parent)
+
+                # reached file system root, no parent is watched
+                if grandparent == parent:
+                    roots.append(path)
+                    break
+
+                parent = grandparent
+
+        return sorted(roots)
+
+    # endregion private methods
+
+
+watcher_service = WatcherService()
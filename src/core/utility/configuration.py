@@ -1,12 +1,18 @@
 import json
 import os
+import threading
+from typing import Any, Dict, List, Tuple
 
 from src.core.model.configuration_models import (AddScriptDialogConfiguration,
                                              MainWindowConfiguration,
                                              SettingsDialogConfiguration,
                                              UtilityConfiguration)
 from src.core.service.message_service import MessageService
+from src.core.utility.journal import Journal
 from src.core.utility.logger import Logger
+from src.core.utility.save_worker import SaveWorker
+from src.core.utility.shard_store import ShardStore
+from src.core.utility.utility import Utility
 
 
 class Configuration:
@@ -17,6 +23,29 @@ class Configuration:
     config_path = os.getcwd() + '\\configs\\ahk_manager.config'
     library_config_path = os.getcwd() + '\\configs\\library.config'
     profile_config_path = os.getcwd() + '\\configs\\profile.config'
+    scan_cache_config_path = os.getcwd() + '\\configs\\scan_cache.config'
+
+    # saves are prepared by the caller and written by the save worker,
+    # file path -> json to write
+    _pending: Dict[str, Any] = {}
+    # journal path -> [journal, snapshot or None, records,
+    #                  shard store or None, shard file name -> item json]
+    _pending_journals: Dict[str, list] = {}
+    # also guards journal record counts, changed by the save worker
+    _pending_lock = threading.Lock()
+
+    # repositories are saved as snapshot and log of changes
+    library_journal = Journal(library_config_path, _pending_lock)
+    profile_journal = Journal(profile_config_path, _pending_lock)
+    # libraries saved in own files when sharded, snapshot is the manifest
+    library_shards = ShardStore(os.getcwd() + '\\configs\\libraries')
+
+    # files are written by one thread at a time
+    _write_lock = threading.Lock()
+    save_worker: SaveWorker = None
+    # file path -> (id, version) of each saved section when last taken,
+    # section not changed since is not saved again
+    _saved_versions: Dict[str, tuple] = {}
 
     # configuration paths
     utility = UtilityConfiguration()
@@ -24,30 +53,66 @@ class Configuration:
     add_script_dialog = AddScriptDialogConfiguration()
     settings_dialog = SettingsDialogConfiguration()
 
+    file_utility: Utility = Utility()
+
     # region public methods
 
-    def save(self, profile_repository, library_repository):
+    def save(self, profile_repository, library_repository, scan_cache=None):
         """
-        Save configurations including general config and repositories
+        Save configurations including general config and repositories.
+
+        Changes are taken from the repositories on the calling thread,
+        files are written by the save worker, saves requested within
+        utility.save_delay are written once
 
         Args:
             profile_repository (ProfileRepository): profile repository
             library_repository (LibraryRepository): library repository
+            scan_cache (ScanCache, optional): Defaults to None.
+                directory scan cache, saved only when modified
         """
 
-        # Save general settings
-        self.save_general_configs()
+        modified = False
+
+        with self._pending_lock:
+            # Save general settings
+            if self._take_modified(self.config_path,
+                                   *self._get_general_models()):
+                self._pending[self.config_path] = \
+                    self._get_general_configs()
+                modified = True
+
+            if self.utility.enable_save:
+                # Save profile repository
+                modified |= self._take_journal(profile_repository,
+                                               self.profile_journal)
+                # Save library repository
+                modified |= self._take_journal(library_repository,
+                                               self.library_journal,
+                                               self.library_shards)
+                # Save directory scan cache
+                if scan_cache and scan_cache.modified:
+                    self._pending[self.scan_cache_config_path] = \
+                        scan_cache.to_json()
+                    scan_cache.modified = False
+                    modified = True
 
         if not self.utility.enable_save:
             # ! This for testing purpose only
             # ! Save should always enabled in release version
             self.logger.info('Saving is not enabled')
-            return
 
-        # Save profile repository
-        self._save_repository(profile_repository, self.profile_config_path)
-        # Save library repository
-        self._save_repository(library_repository, self.library_config_path)
+        # ? Nothing changed, nothing to write
+        if modified:
+            self._get_save_worker().request(self.utility.save_delay / 1000)
+
+    def flush(self):
+        """
+        Write pending saves and stop the save worker, e.g. before exit
+        """
+
+        if self.save_worker:
+            self.save_worker.stop()
 
     def save_general_configs(self):
         """
@@ -55,26 +120,17 @@ class Configuration:
         and dialog sizes
         """
 
-        # * Make parent directories
-        if not self._make_dirs(self.config_path):
-            # ! Failed to create parent directory, file cannot be saved
-            return
-
-        # Build output json string
-        out = {}
+        with self._write_lock:
+            with self._pending_lock:
+                if not self._take_modified(self.config_path,
+                                           *self._get_general_models()):
+                    return
 
-        out['utility'] = self.utility.to_json()
-        out['main_window'] = self.main_window.to_json()
-        out['add_script_dialog'] = self.add_script_dialog.to_json()
-        out['settings_dialog'] = self.settings_dialog.to_json()
+                # pending general configs are older
+                self._pending.pop(self.config_path, None)
+                out = self._get_general_configs()
 
-        # Save json string to file
-        try:
-            with open(self.config_path, 'w') as outfile:
-                outfile.write(json.dumps(out, indent=4))
-        except Exception:
-            # ! Something went wrong when saving the file
-            return
+            self._write_json(self.config_path, out)
 
     def load(self):
         """
@@ -82,76 +138,259 @@ class Configuration:
         """
 
         # ? config file is not found?
-        if not os.path.exists(self.config_path):
+        temp = self._read_json(self.config_path)
+        if temp is None:
             self.logger.info('Configuration does not exists')
             self.save_general_configs()
             return
 
         try:
-            with open(self.config_path, 'r') as infile:
-                temp = json.load(infile)
-                self.utility = UtilityConfiguration \
-                    .from_json(temp['utility'])
-                self.main_window = MainWindowConfiguration \
-                    .from_json(temp['main_window'])
-                self.add_script_dialog = AddScriptDialogConfiguration \
-                    .from_json(temp['add_script_dialog'])
-                self.settings_dialog = SettingsDialogConfiguration \
-                    .from_json(temp['settings_dialog'])
+            # set on the class, configurations are shared by all instances
+            Configuration.utility = UtilityConfiguration \
+                .from_json(temp['utility'])
+            Configuration.main_window = MainWindowConfiguration \
+                .from_json(temp['main_window'])
+            Configuration.add_script_dialog = AddScriptDialogConfiguration \
+                .from_json(temp['add_script_dialog'])
+            Configuration.settings_dialog = SettingsDialogConfiguration \
+                .from_json(temp['settings_dialog'])
+
+            # loaded settings are saved already
+            with self._pending_lock:
+                self._take_modified(self.config_path,
+                                    *self._get_general_models())
         except Exception:
             # if error, then override the saved config
             # ensure no error next time
             self.save_general_configs()
 
-    def load_profiles(self) -> str:
+        Utility.stat_cache.configure(self.utility.enable_stat_cache,
+                                     self.utility.stat_cache_ttl)
+
+    def load_profiles(self) -> Tuple[Any, List[list]]:
         """
         Load profile from config file
 
         Returns:
-            str: json format string
+            Tuple[Any, List[list]]:
+                Any: snapshot json format string
+                List[list]: journal records to replay on the snapshot
         """
 
-        return self._load_repository(self.profile_config_path)
+        return self._load_journal(self.profile_journal)
 
-    def load_libraries(self) -> str:
+    def load_libraries(self) -> Tuple[Any, List[list]]:
         """
         Load libray from config file
 
+        Returns:
+            Tuple[Any, List[list]]:
+                Any: snapshot json format string
+                List[list]: journal records to replay on the snapshot
+        """
+
+        snapshot, records = self._load_journal(self.library_journal)
+
+        # ? Libraries are saved in own files, snapshot is the manifest
+        if ShardStore.is_manifest(snapshot):
+            # previous manifest lists older files of damaged libraries
+            backup = self.library_journal.load_backup()
+            if not ShardStore.is_manifest(backup):
+                backup = None
+
+            snapshot = {'library_list': self.library_shards.load(
+                snapshot, self.utility.shard_load_workers, backup)}
+
+        return snapshot, records
+
+    def load_scan_cache(self) -> str:
+        """
+        Load directory scan cache from config file
+
         Returns:
             str: json format string
         """
 
-        return self._load_repository(self.library_config_path)
+        return self._load_repository(self.scan_cache_config_path)
 
     # endregion public methods
 
     # region private methods
 
-    def _save_repository(self, repository, path: str):
-        if not self._make_dirs(path):
+    def _get_general_models(self) -> tuple:
+        return (self.utility, self.main_window, self.add_script_dialog,
+                self.settings_dialog)
+
+    def _take_modified(self, path: str, *sections) -> bool:
+        # called with pending lock held,
+        # return true and mark sections saved when any changed
+        versions = tuple((id(x), x.version) for x in sections)
+        if self._saved_versions.get(path) == versions:
+            return False
+
+        self._saved_versions[path] = versions
+        return True
+
+    def _get_general_configs(self) -> Dict[str, Any]:
+        out = {}
+
+        out['utility'] = self.utility.to_json()
+        out['main_window'] = self.main_window.to_json()
+        out['add_script_dialog'] = self.add_script_dialog.to_json()
+        out['settings_dialog'] = self.settings_dialog.to_json()
+
+        return out
+
+    def _get_save_worker(self) -> SaveWorker:
+        if not self.save_worker:
+            Configuration.save_worker = SaveWorker(self._write_pending)
+
+        # started again after flush
+        self.save_worker.start()
+        return self.save_worker
+
+    def _take_journal(self, repository, journal: Journal,
+                      shards: ShardStore = None) -> bool:
+        # called with pending lock held,
+        # return true when anything to write
+        modified = self._take_modified(journal.path, repository)
+        pending = self._pending_journals.get(journal.path)
+
+        # ? Saved in the other layout, e.g. sharding enabled
+        relayout = shards is not None and bool(repository.libraries) and \
+            bool(shards.files) != self.utility.shard_libraries
+
+        # ? Log cannot be appended to, snapshot is needed even not changed
+        if not modified and not relayout and \
+                (journal.record_count is not None or pending):
+            return False
+
+        changes = repository.take_changes()
+        if pending and pending[1] is not None:
+            # snapshot not written yet, changes are appended after it
+            pending[2].extend(changes or [])
+        elif changes is None or relayout or journal.should_compact(
+                len(changes) + (len(pending[2]) if pending else 0),
+                self.utility.journal_compact_size):
+            snapshot, items = self._take_snapshot(repository, shards)
+            self._pending_journals[journal.path] = \
+                [journal, snapshot, [], shards, items]
+        elif changes:
+            if pending:
+                pending[2].extend(changes)
+            else:
+                self._pending_journals[journal.path] = \
+                    [journal, None, changes, shards, None]
+        else:
+            return False
+
+        return True
+
+    def _take_snapshot(self, repository, shards: ShardStore) \
+            -> Tuple[Any, Dict[str, Any]]:
+        # snapshot and items to write in shards, None when not sharded
+        if shards is None:
+            return repository.to_json(), None
+
+        modified = repository.take_modified_libraries()
+        if not self.utility.shard_libraries:
+            shards.clear()
+            return repository.to_json(), None
+
+        # * Only libraries changed since last snapshot are serialized
+        manifest, writes = shards.plan(list(repository.libraries), modified)
+        items = {file_name: repository.libraries[key].to_json()
+                 for file_name, key in writes.items()}
+
+        return manifest, items
+
+    def _write_pending(self) -> bool:
+        with self._write_lock:
+            with self._pending_lock:
+                pending = Configuration._pending
+                journals = Configuration._pending_journals
+                Configuration._pending = {}
+                Configuration._pending_journals = {}
+
+            for path, out in pending.items():
+                self._write_json(path, out)
+
+            for entry in journals.values():
+                self._write_journal(*entry)
+
+        return bool(pending or journals)
+
+    def _write_journal(self, journal: Journal, snapshot,
+                       records: List[list], shards: ShardStore = None,
+                       items: Dict[str, Any] = None):
+        if not self._make_dirs(journal.path):
             return
 
+        sync = self.utility.sync_save
         try:
-            with open(path, 'w') as outfile:
-                outfile.write(json.dumps(repository.to_json(), indent=4))
+            if snapshot is not None:
+                # * Items are written before the manifest listing them
+                if items is not None and not shards.write(items, sync):
+                    raise OSError('Shards not saved')
+                if not journal.compact(snapshot, sync):
+                    raise OSError('Snapshot not saved')
+                if shards is not None:
+                    shards.saved(snapshot if items is not None else None)
+            if records and not journal.append(records, sync):
+                raise OSError('Changes not saved')
         except Exception:
+            # ! Changes are lost, save snapshot next time
+            journal.reset()
+            if shards is not None:
+                with self._pending_lock:
+                    shards.clear()
+
+    def _write_json(self, path: str, out):
+        # * Make parent directories
+        if not self._make_dirs(path):
+            # ! Failed to create parent directory, file cannot be saved
             return
 
+        # Save json string to file, previous file is kept as backup
+        self.file_utility.write_file(path, json.dumps(out, indent=4),
+                                     self.utility.sync_save, backup=True)
+
+    def _read_json(self, path: str):
+        # backup is read when file is damaged or not completely replaced
+        for file_path in (path, path + '.bak'):
+            try:
+                with open(file_path, 'r') as infile:
+                    return json.load(infile)
+            except Exception:
+                continue
+
+        return None
+
+    def _load_journal(self, journal: Journal) -> Tuple[Any, List[list]]:
+        # ! This for testing purpose only
+        # ! Save should always enabled in release version
+        if not self.utility.enable_save:
+            return '', []
+
+        try:
+            return journal.load()
+        except Exception:
+            # snapshot is unknown, log cannot be replayed
+            journal.reset()
+            return '', []
+
     def _load_repository(self, path: str)-> str:
         # ! This for testing purpose only
         # ! Save should always enabled in release version
         if not self.utility.enable_save:
             return ''
 
-        if not os.path.exists(path):
+        out = self._read_json(path)
+        if out is None:
             self.logger.info('Repository does not exists')
             return ''
 
-        try:
-            with open(path, 'r') as infile:
-                return json.load(infile)
-        except Exception:
-            return ""
+        return out
 
     def _find_between(self, in_str, first: str, last: str)->str:
         try:
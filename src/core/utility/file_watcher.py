@@ -0,0 +1,404 @@
+import abc
+import ctypes
+import ctypes.util
+import os
+import queue
+import select
+import struct
+import sys
+import threading
+from typing import Dict, Set, Tuple
+
+from src.core.model.file_event import FileEvent, FileEventType
+from src.core.utility.utility import Utility
+
+
+class FileWatcher(abc.ABC):
+    """
+    File watcher reports file and directory created or deleted
+    in the immediate watched directories.
+
+    Events are put into the events queue from the watcher thread,
+    consumer should read the queue from its own thread
+    """
+
+    def __init__(self):
+        self.events: queue.Queue = queue.Queue()
+        self._thread: threading.Thread = None
+        self._stopped: threading.Event = threading.Event()
+        self._lock: threading.Lock = threading.Lock()
+
+    # region public methods
+
+    def start(self):
+        """
+        Start watcher thread
+        """
+
+        if self._thread:
+            return
+
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name=type(self).__name__, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop watcher thread and wait for it to finish
+        """
+
+        if not self._thread:
+            return
+
+        self._stopped.set()
+        self._thread.join()
+        self._thread = None
+
+    def sync(self, directories: Set[str]):
+        """
+        Watch the given directories only,
+        stop watching directories not in the set
+
+        Args:
+            directories (Set[str]): directory paths
+        """
+
+        watched = self.get_watched()
+
+        for path in watched - directories:
+            self.unwatch(path)
+
+        for path in directories - watched:
+            self.watch(path)
+
+    # endregion public methods
+
+    # region abstract methods
+
+    @abc.abstractmethod
+    def get_watched(self) -> Set[str]:
+        """
+        Get watched directories
+
+        Returns:
+            Set[str]: directory paths
+        """
+
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def watch(self, dir_path: str) -> bool:
+        """
+        Watch the immediate directory
+
+        Args:
+            dir_path (str): directory path
+
+        Returns:
+            bool: return false when directory cannot be watched
+        """
+
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def unwatch(self, dir_path: str):
+        """
+        Stop watching directory
+
+        Args:
+            dir_path (str): directory path
+        """
+
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def _run(self):
+        raise NotImplementedError()
+
+    # endregion abstract methods
+
+    # region private methods
+
+    def _put(self, event_type: FileEventType, path: str,
+             is_directory: bool = False):
+        self.events.put(FileEvent(event_type, path, is_directory))
+
+    # endregion private methods
+
+
+class PollingFileWatcher(FileWatcher):
+    """
+    Platform independent watcher, checks directory modified time
+    on interval and lists the changed directories only
+    """
+
+    utility: Utility = Utility()
+
+    def __init__(self, interval: float = 2.0):
+        FileWatcher.__init__(self)
+        self.interval: float = interval
+
+        # directory path -> (mtime, inode, directories, files)
+        self._snapshots: Dict[str, Tuple] = {}
+
+    # region public methods
+
+    def get_watched(self) -> Set[str]:
+        with self._lock:
+            return set(self._snapshots)
+
+    def watch(self, dir_path: str) -> bool:
+        snapshot = self._take_snapshot(dir_path)
+        if not snapshot:
+            return False
+
+        with self._lock:
+            self._snapshots[dir_path] = snapshot
+
+        return True
+
+    def unwatch(self, dir_path: str):
+        with self._lock:
+            self._snapshots.pop(dir_path, None)
+
+    def poll(self):
+        """
+        Check all watched directories once, report changes since last poll
+        """
+
+        with self._lock:
+            snapshots = list(self._snapshots.items())
+
+        for dir_path, old in snapshots:
+            try:
+                stat = os.stat(dir_path)
+            except Exception:
+                self.unwatch(dir_path)
+                self._put(FileEventType.DELETED, dir_path, True)
+                continue
+
+            # directory unchanged, nothing added, removed or renamed
+            if old[0] == stat.st_mtime_ns and old[1] == stat.st_ino:
+                continue
+
+            new = self._take_snapshot(dir_path)
+            if not new:
+                continue
+
+            with self._lock:
+                # directory may be unwatched meanwhile
+                if dir_path not in self._snapshots:
+                    continue
+                self._snapshots[dir_path] = new
+
+            self._put_changes(old[2], new[2], True)
+            self._put_changes(old[3], new[3], False)
+
+    # endregion public methods
+
+    # region private methods
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self.poll()
+
+    def _take_snapshot(self, dir_path: str) -> Tuple:
+        try:
+            stat = os.stat(dir_path)
+        except Exception:
+            return None
+
+        directories, files = self.utility.scan_directory(dir_path)
+        return (stat.st_mtime_ns, stat.st_ino,
+                frozenset(directories), frozenset(files))
+
+    def _put_changes(self, old: frozenset, new: frozenset,
+                     is_directory: bool):
+        for path in old - new:
+            self._put(FileEventType.DELETED, path, is_directory)
+
+        for path in new - old:
+            self._put(FileEventType.CREATED, path, is_directory)
+
+    # endregion private methods
+
+
+class InotifyFileWatcher(FileWatcher):
+    """
+    Linux watcher, the kernel reports changes as they happen
+    """
+
+    _in_moved_from = 0x00000040
+    _in_moved_to = 0x00000080
+    _in_create = 0x00000100
+    _in_delete = 0x00000200
+    _in_delete_self = 0x00000400
+    _in_move_self = 0x00000800
+    _in_q_overflow = 0x00004000
+    _in_ignored = 0x00008000
+    _in_onlydir = 0x01000000
+    _in_isdir = 0x40000000
+
+    _watch_mask = (_in_create | _in_delete | _in_moved_from | _in_moved_to |
+                   _in_delete_self | _in_move_self | _in_onlydir)
+
+    _event_header = struct.Struct('iIII')
+
+    def __init__(self):
+        FileWatcher.__init__(self)
+
+        self._libc = ctypes.CDLL(
+            ctypes.util.find_library('c'), use_errno=True)
+        self._fd: int = -1
+        self._open()
+
+        # watch descriptor -> directory path
+        self._watches: Dict[int, str] = {}
+
+    # region public methods
+
+    @staticmethod
+    def is_supported() -> bool:
+        """
+        Check whether inotify is available on this platform
+
+        Returns:
+            bool:
+        """
+
+        if not sys.platform.startswith('linux'):
+            return False
+
+        libc_path = ctypes.util.find_library('c')
+        if not libc_path:
+            return False
+
+        return hasattr(ctypes.CDLL(libc_path), 'inotify_init1')
+
+    def get_watched(self) -> Set[str]:
+        with self._lock:
+            return set(self._watches.values())
+
+    def watch(self, dir_path: str) -> bool:
+        wd = self._libc.inotify_add_watch(
+            self._fd, os.fsencode(dir_path), self._watch_mask)
+        if wd < 0:
+            return False
+
+        with self._lock:
+            self._watches[wd] = dir_path
+
+        return True
+
+    def unwatch(self, dir_path: str):
+        with self._lock:
+            wds = [wd for wd, path in self._watches.items()
+                   if path == dir_path]
+            for wd in wds:
+                del self._watches[wd]
+
+        for wd in wds:
+            self._libc.inotify_rm_watch(self._fd, wd)
+
+    def start(self):
+        # * Closed by stop, directories must be watched again
+        if self._fd < 0:
+            self._open()
+
+        FileWatcher.start(self)
+
+    def stop(self):
+        FileWatcher.stop(self)
+
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+        # watches are removed with the descriptor
+        with self._lock:
+            self._watches = {}
+
+    # endregion public methods
+
+    # region private methods
+
+    def _open(self):
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+
+    def _run(self):
+        while not self._stopped.is_set():
+            readable, _, _ = select.select([self._fd], [], [], 0.5)
+            if not readable:
+                continue
+
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                continue
+
+            self._put_events(data)
+
+    def _put_events(self, data: bytes):
+        offset = 0
+        while offset + self._event_header.size <= len(data):
+            wd, mask, _, length = self._event_header.unpack_from(
+                data, offset)
+            offset += self._event_header.size
+            name = os.fsdecode(
+                data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+
+            self._put_event(wd, mask, name)
+
+    def _put_event(self, wd: int, mask: int, name: str):
+        if mask & self._in_q_overflow:
+            self._put(FileEventType.OVERFLOWED, '', True)
+            return
+
+        with self._lock:
+            dir_path = self._watches.get(wd)
+            # kernel removed the watch, e.g. directory deleted
+            if mask & self._in_ignored:
+                self._watches.pop(wd, None)
+
+        if not dir_path:
+            return
+
+        if mask & (self._in_delete_self | self._in_move_self):
+            self._put(FileEventType.DELETED, dir_path, True)
+            return
+
+        path = os.path.join(dir_path, name)
+        is_directory = bool(mask & self._in_isdir)
+
+        if mask & (self._in_create | self._in_moved_to):
+            self._put(FileEventType.CREATED, path, is_directory)
+        elif mask & (self._in_delete | self._in_moved_from):
+            self._put(FileEventType.DELETED, path, is_directory)
+
+    # endregion private methods
+
+
+def create_file_watcher(interval: float = 2.0) -> FileWatcher:
+    """
+    Create the best file watcher for the platform,
+    fall back to polling when native watcher is not available
+
+    Args:
+        interval (float, optional): Defaults to 2.0. Polling interval
+            in seconds, used by polling watcher only
+
+    Returns:
+        FileWatcher: file watcher, not started
+    """
+
+    if InotifyFileWatcher.is_supported():
+        try:
+            return InotifyFileWatcher()
+        except Exception:
+            pass
+
+    return PollingFileWatcher(interval)
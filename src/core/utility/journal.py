@@ -0,0 +1,239 @@
+import json
+import os
+import threading
+import time
+from typing import Any, List, Optional, Tuple
+
+from src.core.utility.utility import Utility
+
+
+class Journal():
+    """
+    Journal saves a repository as a snapshot file and a log of the
+    changes made after the snapshot, one JSON record per line,
+    so a save only appends the changes.
+
+    The log is compacted into a new snapshot when it grows too long,
+    loading reads the snapshot and the records to replay on it.
+
+    Snapshot is replaced atomically, the previous snapshot and its log
+    are kept as backup and loaded when the snapshot is damaged.
+    Snapshot and log are tagged with a generation, so a log is never
+    replayed on a snapshot it was not written for.
+
+    Journal may be written on another thread, record count and
+    generation are changed under the lock, read them holding it
+    """
+
+    utility: Utility = Utility()
+
+    # key of the generation in snapshot and log header
+    generation_key = 'journal_generation'
+
+    def __init__(self, path: str, lock: threading.Lock = None):
+        self.path: str = path
+        self.log_path: str = path + '.log'
+        # guards record count and generation
+        self.lock: threading.Lock = lock or threading.Lock()
+
+        # records in the log, None until loaded or compacted,
+        # the log of an unknown snapshot must not be appended to
+        self.record_count: Optional[int] = None
+        # generation of the snapshot
+        self.generation: Optional[int] = None
+
+    # region public methods
+
+    def load(self) -> Tuple[Any, List[list]]:
+        """
+        Load the snapshot and the records logged after it,
+        previous snapshot is loaded when the snapshot is damaged
+
+        Returns:
+            Tuple[Any, List[list]]:
+                Any: snapshot json, empty string when not saved
+                List[list]: records, in the order they were appended
+        """
+
+        self.reset()
+
+        snapshot = self._read_snapshot(self.path)
+        if snapshot is not None:
+            generation = snapshot.get(self.generation_key, 0)
+            log_generation, records, completed = \
+                self._read_log(self.log_path)
+
+            self.generation = generation
+            if log_generation not in (None, generation):
+                # log of the replaced snapshot, changes are in the snapshot
+                return snapshot, []
+
+            # ! Broken record, records appended after it would be lost
+            if completed:
+                self.record_count = len(records)
+
+            return snapshot, records
+
+        # * Snapshot damaged or lost, load previous one with both logs
+        snapshot = self._read_snapshot(self.path + '.bak')
+        if snapshot is None:
+            return '', []
+
+        generation = snapshot.get(self.generation_key, 0)
+        backup_generation, records, _ = \
+            self._read_log(self.log_path + '.bak')
+        if backup_generation != generation:
+            records = []
+
+        # log is of the damaged snapshot when the backup log is found,
+        # otherwise snapshot was replaced before its log was kept
+        log_generation, log_records, _ = self._read_log(self.log_path)
+        if generation in (backup_generation, log_generation):
+            records.extend(log_records)
+
+        return snapshot, records
+
+    def load_backup(self) -> Optional[dict]:
+        """
+        Load the previous snapshot, e.g. to recover data of
+        the snapshot lost
+
+        Returns:
+            Optional[dict]: snapshot json, None when not found or damaged
+        """
+
+        return self._read_snapshot(self.path + '.bak')
+
+    def should_compact(self, count: int, limit: int) -> bool:
+        """
+        Check whether a snapshot should be saved instead of
+        appending the records, called holding the lock
+
+        Args:
+            count (int): number of records to append
+            limit (int): maximum number of records in the log
+
+        Returns:
+            bool: return true when the log is unknown or too long
+        """
+
+        return self.record_count is None or \
+            self.record_count + count > limit
+
+    def append(self, records: List[list], sync: bool = False) -> bool:
+        """
+        Append records to the log
+
+        Args:
+            records (List[list]): records, must be json serializable
+            sync (bool, optional): Defaults to False. Flush to disk
+
+        Returns:
+            bool: return true if records written
+        """
+
+        lines = [json.dumps(x, separators=(',', ':')) + '\n'
+                 for x in records]
+        if not os.path.exists(self.log_path):
+            lines.insert(0, json.dumps(
+                {self.generation_key: self.generation}) + '\n')
+
+        try:
+            with open(self.log_path, 'a') as outfile:
+                outfile.writelines(lines)
+                if sync:
+                    outfile.flush()
+                    os.fsync(outfile.fileno())
+        except Exception:
+            return False
+
+        with self.lock:
+            self.record_count += len(records)
+        return True
+
+    def compact(self, snapshot: Any, sync: bool = False) -> bool:
+        """
+        Save the snapshot and start a new log,
+        replaced snapshot and log are kept as backup
+
+        Args:
+            snapshot (Any): repository json
+            sync (bool, optional): Defaults to False. Flush to disk
+
+        Returns:
+            bool: return true if snapshot written
+        """
+
+        # only compared for equality, unique per snapshot
+        generation = time.time_ns()
+        out = dict(snapshot)
+        out[self.generation_key] = generation
+
+        if not self.utility.write_file(
+                self.path, json.dumps(out, indent=4), sync, backup=True):
+            return False
+
+        # * Keep the log of the replaced snapshot with it
+        try:
+            if os.path.exists(self.log_path):
+                os.replace(self.log_path, self.log_path + '.bak')
+            elif os.path.exists(self.log_path + '.bak'):
+                os.remove(self.log_path + '.bak')
+        except Exception:
+            # log is ignored by its generation, but cannot be appended to
+            return False
+
+        with self.lock:
+            self.generation = generation
+            self.record_count = 0
+        return True
+
+    def reset(self):
+        """
+        Forget the log, next save compacts,
+        e.g. after the journal failed to save
+        """
+
+        with self.lock:
+            self.record_count = None
+
+    # endregion public methods
+
+    # region private methods
+
+    def _read_snapshot(self, path: str) -> Optional[dict]:
+        try:
+            with open(path, 'r') as infile:
+                return json.load(infile)
+        except Exception:
+            return None
+
+    def _read_log(self, path: str) \
+            -> Tuple[Optional[int], List[list], bool]:
+        # generation, records, whether all records were read,
+        # generation is None when log not found
+        if not os.path.exists(path):
+            return None, [], True
+
+        generation = None
+        records = []
+        try:
+            with open(path, 'r') as infile:
+                for line in infile:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # ! Record was not completely written
+                        return generation, records, False
+
+                    if isinstance(record, dict):
+                        generation = record.get(self.generation_key)
+                    else:
+                        records.append(record)
+        except Exception:
+            return generation, records, False
+
+        # log without header is written before generations, use 0
+        return generation if generation is not None else 0, records, True
+
+    # endregion private methods
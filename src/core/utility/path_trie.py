@@ -0,0 +1,209 @@
+import os
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class PathTrieNode():
+    """
+    Node of path trie, one node per path component
+    """
+
+    __slots__ = ('children', 'value')
+
+    def __init__(self):
+        self.children: Dict[str, 'PathTrieNode'] = {}
+        self.value: Any = None
+
+
+class PathTrie():
+    """
+    Path trie stores values by path, split into components,
+    so values under a directory can be found and removed
+    without checking every path.
+
+    Paths should be normalized before use (e.g. Utility.get_path_key),
+    the trie does not normalize them
+    """
+
+    def __init__(self):
+        self.root: PathTrieNode = PathTrieNode()
+
+    # region public methods
+
+    def add(self, path: str, value: Any):
+        """
+        Add value of the path, existing value is replaced
+
+        Args:
+            path (str): normalized path
+            value (Any): value, must not be None
+        """
+
+        node = self.root
+        for part in self._split(path):
+            child = node.children.get(part)
+            if not child:
+                child = node.children[part] = PathTrieNode()
+            node = child
+
+        node.value = value
+
+    def find(self, path: str) -> Any:
+        """
+        Find value of the path
+
+        Args:
+            path (str): normalized path
+
+        Returns:
+            Any: value or None
+        """
+
+        node = self._find_node(path)
+        return node.value if node else None
+
+    def find_longest_prefix(self, path: str) -> Any:
+        """
+        Find value of the longest path which is the path itself
+        or one of its parent directories
+
+        Args:
+            path (str): normalized path
+
+        Returns:
+            Any: value or None
+        """
+
+        found = None
+        node = self.root
+        for part in self._split(path):
+            node = node.children.get(part)
+            if not node:
+                break
+
+            if node.value is not None:
+                found = node.value
+
+        return found
+
+    def iter_subtree(self, path: str) -> Iterator[Any]:
+        """
+        Iterate values of the path and all paths under it, parent first
+
+        Args:
+            path (str): normalized path
+
+        Returns:
+            Iterator[Any]: values
+        """
+
+        node = self._find_node(path)
+        if node:
+            yield from self._iter_values(node)
+
+    def remove(self, path: str) -> Any:
+        """
+        Remove value of the path, paths under it are kept
+
+        Args:
+            path (str): normalized path
+
+        Returns:
+            Any: removed value or None
+        """
+
+        nodes = self._find_path_nodes(path)
+        if not nodes or nodes[-1][1].value is None:
+            return None
+
+        value = nodes[-1][1].value
+        nodes[-1][1].value = None
+        self._prune(nodes)
+
+        return value
+
+    def remove_subtree(self, path: str) -> List[Any]:
+        """
+        Remove values of the path and all paths under it
+
+        Args:
+            path (str): normalized path
+
+        Returns:
+            List[Any]: removed values, parent first
+        """
+
+        nodes = self._find_path_nodes(path)
+        if not nodes:
+            return []
+
+        values = list(self._iter_values(nodes[-1][1]))
+
+        # detach the whole branch at once
+        nodes[-1][1].children = {}
+        nodes[-1][1].value = None
+        self._prune(nodes)
+
+        return values
+
+    def clear(self):
+        """
+        Remove all values
+        """
+
+        self.root = PathTrieNode()
+
+    # endregion public methods
+
+    # region private methods
+
+    def _split(self, path: str) -> List[str]:
+        parts = path.split(os.sep)
+
+        # root directory ends with separator
+        if len(parts) > 1 and not parts[-1]:
+            parts.pop()
+
+        return parts
+
+    def _find_node(self, path: str) -> Optional[PathTrieNode]:
+        node = self.root
+        for part in self._split(path):
+            node = node.children.get(part)
+            if not node:
+                return None
+
+        return node
+
+    def _find_path_nodes(self, path: str) -> List[tuple]:
+        # (component, node) from the root to the path node
+        nodes = []
+        node = self.root
+        for part in self._split(path):
+            node = node.children.get(part)
+            if not node:
+                return []
+
+            nodes.append((part, node))
+
+        return nodes
+
+    def _prune(self, nodes: List[tuple]):
+        # remove empty nodes from the bottom
+        for i in range(len(nodes) - 1, -1, -1):
+            part, node = nodes[i]
+            if node.value is not None or node.children:
+                return
+
+            parent = nodes[i - 1][1] if i > 0 else self.root
+            del parent.children[part]
+
+    def _iter_values(self, node: PathTrieNode) -> Iterator[Any]:
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.value is not None:
+                yield node.value
+
+            stack.extend(reversed(list(node.children.values())))
+
+    # endregion private methods
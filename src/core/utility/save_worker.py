@@ -0,0 +1,120 @@
+import threading
+from typing import Callable
+
+from src.core.utility.logger import Logger
+
+
+class SaveWorker():
+    """
+    Save worker runs the save function on its own thread.
+
+    Save requests received within the delay after the first one are
+    coalesced, the function runs once for all of them.
+    Data should be prepared by the requesting thread,
+    the save function only writes it.
+    Failed save is logged, worker keeps running for later requests
+    """
+
+    logger = Logger('SaveWorker')
+
+    def __init__(self, save: Callable[[], bool]):
+        # returns true when anything was written
+        self.save: Callable[[], bool] = save
+
+        # number of saves requested and written
+        self.requested: int = 0
+        self.performed: int = 0
+
+        self._thread: threading.Thread = None
+        self._condition: threading.Condition = threading.Condition()
+        self._stopped: bool = False
+        # time to wait for more requests, None when no request pending
+        self._delay: float = None
+
+    # region public methods
+
+    def start(self):
+        """
+        Start worker thread
+        """
+
+        if self._thread:
+            return
+
+        self._stopped = False
+        self._thread = threading.Thread(
+            target=self._run, name=type(self).__name__, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop worker thread, pending save is written before returning
+        """
+
+        if self._thread:
+            with self._condition:
+                self._stopped = True
+                self._condition.notify()
+
+            self._thread.join()
+            self._thread = None
+
+        self.flush()
+
+    def request(self, delay: float):
+        """
+        Request save, written by the worker thread after the delay
+
+        Args:
+            delay (float): seconds to wait for more requests
+        """
+
+        with self._condition:
+            self.requested += 1
+            if self._delay is None:
+                self._delay = delay
+                self._condition.notify()
+
+    def flush(self):
+        """
+        Write pending save on the calling thread
+        """
+
+        with self._condition:
+            self._delay = None
+
+        self._save()
+
+    # endregion public methods
+
+    # region private methods
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._delay is None and not self._stopped:
+                    self._condition.wait()
+
+                if self._stopped:
+                    return
+
+                # * Coalesce requests received within the delay
+                self._condition.wait_for(lambda: self._stopped,
+                                         self._delay)
+                self._delay = None
+
+            self._save()
+
+    def _save(self):
+        try:
+            saved = self.save()
+        except Exception as error:
+            # ! Data taken for this save is lost
+            self.logger.error('Failed to save: {}'.format(error))
+            return
+
+        if saved:
+            with self._condition:
+                self.performed += 1
+
+    # endregion private methods
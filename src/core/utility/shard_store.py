@@ -0,0 +1,220 @@
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from src.core.utility.logger import Logger
+from src.core.utility.utility import Utility
+
+
+class ShardStore():
+    """
+    Shard store saves each item of a snapshot in its own file,
+    named by hash of the item key, and a manifest listing the files
+    is saved as the snapshot.
+
+    Only items changed since the last snapshot are written,
+    unchanged items keep their files. A written item gets a new file,
+    so files of the previous manifest are kept for backup until
+    the manifest after it is written, item cannot be read
+    is loaded from the file of the previous manifest
+    """
+
+    logger = Logger('ShardStore')
+    utility: Utility = Utility()
+
+    # key of the file list in manifest
+    manifest_key = 'shard_list'
+
+    def __init__(self, dir_path: str):
+        self.dir_path: str = dir_path
+
+        # item key -> file of the item in the latest planned manifest,
+        # empty when latest snapshot is not sharded
+        self.files: Dict[str, str] = {}
+
+        # files of the saved manifest, None when not known
+        self.manifest_files: Optional[Set[str]] = None
+
+    # region public methods
+
+    @classmethod
+    def is_manifest(cls, snapshot: Any) -> bool:
+        """
+        Check whether snapshot is a shard manifest
+
+        Args:
+            snapshot (Any): snapshot json
+
+        Returns:
+            bool: return true when items are saved in shards
+        """
+
+        return isinstance(snapshot, dict) and cls.manifest_key in snapshot
+
+    def plan(self, keys: List[str], modified: Optional[Set[str]]) \
+            -> Tuple[dict, Dict[str, str]]:
+        """
+        Plan manifest of the items, files are assigned to items modified
+        or not saved yet, other items keep their files
+
+        Args:
+            keys (List[str]): keys of all items, in order
+            modified (Optional[Set[str]]): keys of modified items,
+                None when all items modified
+
+        Returns:
+            Tuple[dict, Dict[str, str]]:
+                dict: manifest, saved as snapshot after items written
+                Dict[str, str]: file name -> key of item to write
+        """
+
+        suffix = time.time_ns()
+        files = {}
+        writes = {}
+
+        for key in keys:
+            file_name = self.files.get(key)
+            if not file_name or modified is None or key in modified:
+                file_name = '{}-{}.json'.format(
+                    hashlib.sha1(key.encode('utf-8')).hexdigest(), suffix)
+                writes[file_name] = key
+
+            files[key] = file_name
+
+        self.files = files
+        manifest = {self.manifest_key: [[x, files[x]] for x in keys]}
+
+        return manifest, writes
+
+    def write(self, items: Dict[str, Any], sync: bool = False) -> bool:
+        """
+        Write items planned to be written
+
+        Args:
+            items (Dict[str, Any]): file name -> item json
+            sync (bool, optional): Defaults to False. Flush to disk
+
+        Returns:
+            bool: return true when all items written
+        """
+
+        if items and not self.utility.make_dirs(
+                os.path.join(self.dir_path, '')):
+            return False
+
+        for file_name, item in items.items():
+            if not self.utility.write_file(
+                    os.path.join(self.dir_path, file_name),
+                    json.dumps(item, separators=(',', ':')), sync):
+                return False
+
+        return True
+
+    def saved(self, manifest: Optional[dict]):
+        """
+        Remove files not used by the manifest or the one before it,
+        which is kept as backup, called after snapshot written
+
+        Args:
+            manifest (Optional[dict]): saved manifest,
+                None when snapshot is not sharded
+        """
+
+        files = self._get_manifest_files(manifest)
+
+        # ? Manifest before it is not known, keep all files
+        if self.manifest_files is not None:
+            used = files | self.manifest_files
+            for file_name in self._list_files():
+                if file_name not in used:
+                    self.utility.remove_file(
+                        os.path.join(self.dir_path, file_name))
+
+        self.manifest_files = files
+
+    def load(self, manifest: dict, max_workers: int = 1,
+             backup: Optional[dict] = None) -> List[Any]:
+        """
+        Load items listed in the manifest, files are read in parallel.
+        Item cannot be read is loaded from its file in the backup manifest,
+        and written again with the next snapshot,
+        item cannot be read from both is skipped
+
+        Args:
+            manifest (dict): manifest
+            max_workers (int, optional): Defaults to 1. Number of threads
+            backup (Optional[dict], optional): Defaults to None.
+                Manifest saved before the manifest
+
+        Returns:
+            List[Any]: items json, in order
+        """
+
+        entries = manifest[self.manifest_key]
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            items = list(executor.map(self._read, (x[1] for x in entries)))
+
+        backup_files = dict(backup[self.manifest_key]) if backup else {}
+        self.files = {}
+        self.manifest_files = self._get_manifest_files(manifest)
+        out = []
+
+        for (key, file_name), item in zip(entries, items):
+            if item is not None:
+                self.files[key] = file_name
+                out.append(item)
+                continue
+
+            # * Damaged or lost, load older item of the backup manifest
+            backup_file = backup_files.get(key)
+            if backup_file and backup_file != file_name:
+                item = self._read(backup_file)
+
+            if item is None:
+                self.logger.error('Failed to load {}'.format(key))
+                continue
+
+            self.logger.warning(
+                'Failed to load {}, loaded from backup'.format(key))
+            # kept until the item is written again
+            self.manifest_files.add(backup_file)
+            out.append(item)
+
+        return out
+
+    def clear(self):
+        """
+        Forget files of the items, all items are written next time,
+        e.g. after failed to write or snapshot not sharded
+        """
+
+        self.files = {}
+
+    # endregion public methods
+
+    # region private methods
+
+    def _read(self, file_name: str) -> Any:
+        try:
+            with open(os.path.join(self.dir_path, file_name), 'r') as infile:
+                return json.load(infile)
+        except Exception:
+            return None
+
+    def _get_manifest_files(self, manifest: Optional[dict]) -> Set[str]:
+        if not manifest:
+            return set()
+
+        return set(x[1] for x in manifest[self.manifest_key])
+
+    def _list_files(self) -> List[str]:
+        try:
+            return [x for x in os.listdir(self.dir_path)
+                    if x.endswith('.json')]
+        except Exception:
+            return []
+
+    # endregion private methods
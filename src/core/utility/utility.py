@@ -1,9 +1,135 @@
 import os
+import stat
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import lru_cache
+from itertools import islice
 from shutil import copyfile
-from typing import List
+from typing import (Any, Callable, Dict, Iterable, Iterator, List, Optional,
+                    Tuple)
+
+
+class StatCache:
+    """
+    Stat cache stores file mode by normalized path,
+    so the same path is not checked repeatedly, e.g. scan, refresh and
+    start script checking the same file one after another.
+
+    Entry is valid only in the generation it was created and within ttl.
+    Start a new generation to see changes made by other process
+    """
+
+    def __init__(self):
+        self.enabled: bool = False
+        self.ttl: float = 1.0
+        self.generation: int = 0
+
+        # path -> (generation, time, file mode or None when not exists)
+        self._entries: Dict[str, Tuple[int, float, Optional[int]]] = {}
+
+    # region public methods
+
+    def configure(self, enabled: bool, ttl: float):
+        """
+        Enable or disable the cache, cached entries are dropped
+
+        Args:
+            enabled (bool): whether stat result is cached
+            ttl (float): seconds an entry is valid
+        """
+
+        self.enabled = enabled
+        self.ttl = ttl
+        self.new_generation()
+
+    def new_generation(self):
+        """
+        Invalidate all entries,
+        e.g. at the beginning of scan or refresh
+        """
+
+        self.generation += 1
+        self._entries = {}
+
+    def invalidate(self, path: str):
+        """
+        Invalidate entry of the given path,
+        e.g. file changed by this application
+
+        Args:
+            path (str): file or directory path
+        """
+
+        self._entries.pop(os.path.normpath(path), None)
+
+    def get_mode(self, path: str) -> Optional[int]:
+        """
+        Get file mode, stat is called only when not cached
+
+        Args:
+            path (str): file or directory path
+
+        Returns:
+            Optional[int]: file mode or None when path not exists
+        """
+
+        if not self.enabled:
+            return self._stat_mode(path)
+
+        key = os.path.normpath(path)
+        now = time.monotonic()
+
+        entry = self._entries.get(key)
+        if entry and entry[0] == self.generation \
+                and now - entry[1] < self.ttl:
+            return entry[2]
+
+        mode = self._stat_mode(path)
+        self._entries[key] = (self.generation, now, mode)
+        return mode
+
+    def add(self, path: str, mode: Optional[int]):
+        """
+        Add entry known from other source, e.g. directory listing
+
+        Args:
+            path (str): file or directory path
+            mode (Optional[int]): file mode or None when path not exists
+        """
+
+        if not self.enabled:
+            return
+
+        self._entries[os.path.normpath(path)] = \
+            (self.generation, time.monotonic(), mode)
+
+    # endregion public methods
+
+    # region private methods
+
+    def _stat_mode(self, path: str) -> Optional[int]:
+        try:
+            return os.stat(path).st_mode
+        except Exception:
+            return None
+
+    # endregion private methods
+
+
+@lru_cache(maxsize=65536)
+def _get_path_key(path: str) -> str:
+    try:
+        return sys.intern(os.path.normcase(os.path.normpath(path)))
+    except Exception:
+        return ""
 
 
 class Utility:
+
+    # shared by all instances
+    stat_cache: StatCache = StatCache()
+
     def get_file_name(self, path: str) -> str:
         """
         Get file name for the given path
@@ -20,6 +146,28 @@ class Utility:
         except Exception:
             return ""
 
+    def iter_items(self, items: Iterable, predicate: Callable = None,
+                   start: int = 0, stop: int = None) -> Iterator[Any]:
+        """
+        Iterate items matching the predicate, in the range of the matches
+
+        Args:
+            items (Iterable): items to iterate
+            predicate (Callable, optional): Defaults to None.
+                Function returns true for item to include, all items
+                included when not provided
+            start (int, optional): Defaults to 0. Index of first match
+            stop (int, optional): Defaults to None. Index after last match
+
+        Returns:
+            Iterator[Any]: matched items
+        """
+
+        if predicate:
+            items = filter(predicate, items)
+
+        return islice(items, start, stop)
+
     def get_file_name_no_extension(self, path: str) -> str:
         """
         Get file name without file extension
@@ -147,31 +295,98 @@ class Utility:
         except Exception:
             return []
 
-    def is_dir(self, path: str) -> bool:
+    def scan_directory(self, dir_path: str) -> Tuple[List[str], List[str]]:
         """
-        Check whether given path is directory path
+        List the immediate directory in a single pass
+
+        Entry types come from the directory listing itself,
+        no extra stat call is made per entry
 
         Args:
-            path (str): file/directory path
+            dir_path (str): directory path
 
         Returns:
-            bool:
+            Tuple[List[str], List[str]]:
+                List[str]: list of sub-directory path
+                List[str]: list of file path
         """
 
+        dir_list = []
+        file_list = []
+
         try:
-            self.format_path(path)
+            with os.scandir(dir_path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir():
+                            dir_list.append(entry.path)
+                            self.stat_cache.add(entry.path, stat.S_IFDIR)
+                        elif entry.is_file():
+                            file_list.append(entry.path)
+                            self.stat_cache.add(entry.path, stat.S_IFREG)
+                    except OSError:
+                        continue
+        except Exception:
+            return [], []
 
-            # check whether path is a valid directory
-            if not os.path.isdir(path):
-                return False
+        return dir_list, file_list
 
-            # check whether path exists
-            if not self.path_exists(path):
-                return False
+    def walk_directories(self, dir_path: str, max_workers: int = 1,
+                         scanner: Callable = None) \
+            -> Iterator[Tuple[str, List[str]]]:
+        """
+        Walk the directory and all its sub-directories,
+        each directory is listed exactly once
 
-            return True
-        except Exception:
-            return False
+        Directories are yielded in the same order as get_directories,
+        with the given directory itself first
+
+        Args:
+            dir_path (str): directory path
+            max_workers (int, optional): Defaults to 1. Number of threads
+                listing directories concurrently, the whole tree is listed
+                before the first directory is yielded when greater than 1
+            scanner (Callable, optional): Defaults to scan_directory.
+                Function listing the immediate directory,
+                e.g. ScanCache.scan_directory
+
+        Returns:
+            Iterator[Tuple[str, List[str]]]: directory path and
+                the files in the immediate directory
+        """
+
+        scanner = scanner or self.scan_directory
+
+        listing = None
+        if max_workers > 1:
+            listing = self._scan_tree(dir_path, max_workers, scanner)
+
+        pending = [dir_path]
+        while pending:
+            path = pending.pop()
+            if listing is None:
+                dir_list, file_list = scanner(path)
+            else:
+                dir_list, file_list = listing[path]
+
+            yield path, file_list
+
+            # reversed, so the first sub-directory is walked first
+            pending.extend(reversed(dir_list))
+
+    def is_dir(self, path: str) -> bool:
+        """
+        Check whether given path is directory path
+
+        Args:
+            path (str): file/directory path
+
+        Returns:
+            bool:
+        """
+
+        mode = self.stat_cache.get_mode(path)
+        return mode is not None and stat.S_ISDIR(mode)
 
     def format_path(self, path: str) -> str:
         """
@@ -189,6 +404,21 @@ class Utility:
         except Exception:
             return ""
 
+    def get_path_key(self, path: str) -> str:
+        """
+        Get canonical key of the path, used to index and compare paths.
+        The key is normalized, case folded on case insensitive platform
+        and interned, so the same path always gets the same string object
+
+        Args:
+            path (str): file path
+
+        Returns:
+            str: path key
+        """
+
+        return _get_path_key(path)
+
     def path_exists(self, path: str) -> bool:
         """
         Check whether path exists
@@ -200,10 +430,7 @@ class Utility:
             bool:
         """
 
-        try:
-            return os.path.exists(path)
-        except Exception:
-            return False
+        return self.stat_cache.get_mode(path) is not None
 
     def is_file(self, path: str) -> bool:
         """
@@ -216,18 +443,8 @@ class Utility:
             bool:
         """
 
-        try:
-            # check if path is a file
-            if not os.path.isfile(path):
-                return False
-
-            # check if path exists
-            if not self.path_exists(path):
-                return False
-
-            return True
-        except Exception:
-            return False
+        mode = self.stat_cache.get_mode(path)
+        return mode is not None and stat.S_ISREG(mode)
 
     def join_path(self, p_1: str, p_2: str) -> str:
         """
@@ -264,6 +481,7 @@ class Utility:
                not self.path_exists(os.path.dirname(path)):
                 try:
                     os.makedirs(os.path.dirname(path))
+                    self.stat_cache.invalidate(os.path.dirname(path))
                     return True
                 except Exception:
                     return False
@@ -272,6 +490,52 @@ class Utility:
         except Exception:
             return False
 
+    def write_file(self, path: str, text: str, sync: bool = False,
+                   backup: bool = False) -> bool:
+        """
+        Write file atomically, text is written to a temporary file
+        in the same directory, which then replaces the file.
+        The file is never left partially written
+
+        Args:
+            path (str): file path
+            text (str): file content
+            sync (bool, optional): Defaults to False. Flush content to
+                disk before replacing, survives power loss
+            backup (bool, optional): Defaults to False. Keep the
+                replaced file as path + '.bak', the file is kept
+                at path while backup is made
+
+        Returns:
+            bool: return true if file written
+        """
+
+        temp_path = path + '.tmp'
+        try:
+            with open(temp_path, 'w') as outfile:
+                outfile.write(text)
+                if sync:
+                    outfile.flush()
+                    os.fsync(outfile.fileno())
+
+            if backup and os.path.exists(path):
+                # * Link the file as backup, path exists until replaced
+                backup_path = path + '.bak'
+                self.remove_file(backup_path + '.tmp')
+                try:
+                    os.link(path, backup_path + '.tmp')
+                except OSError:
+                    # ? File system does not support hard link
+                    copyfile(path, backup_path + '.tmp')
+                os.replace(backup_path + '.tmp', backup_path)
+            os.replace(temp_path, path)
+
+            self.stat_cache.invalidate(path)
+            return True
+        except Exception:
+            self.remove_file(temp_path)
+            return False
+
     def remove_file(self, path: str) -> bool:
         """
         Delete file
@@ -285,6 +549,7 @@ class Utility:
 
         try:
             os.remove(path)
+            self.stat_cache.invalidate(path)
             return True
         except Exception:
             return False
@@ -302,6 +567,7 @@ class Utility:
 
         try:
             os.rmdir(path)
+            self.stat_cache.invalidate(path)
             return True
         except Exception:
             return False
@@ -320,9 +586,36 @@ class Utility:
 
         try:
             copyfile(src, dst)
+            self.stat_cache.invalidate(dst)
             return True
         except Exception:
             return False
 
+    # region private methods
+
+    def _scan_tree(self, dir_path: str, max_workers: int,
+                   scanner: Callable) \
+            -> Dict[str, Tuple[List[str], List[str]]]:
+        # list each sub-directory as soon as its parent is listed,
+        # the total time depends on the tree depth not directory count
+        listing = {}
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(scanner, dir_path): dir_path}
+
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path = futures.pop(future)
+                    dir_list, file_list = future.result()
+                    listing[path] = (dir_list, file_list)
+
+                    for child in dir_list:
+                        futures[executor.submit(scanner, child)] = child
+
+        return listing
+
+    # endregion private methods
+
 
 utility = Utility()
@@ -0,0 +1,35 @@
+import pytest
+
+from src.core.model.configuration_models import (MainWindowConfiguration,
+                                                 UtilityConfiguration)
+
+
+class ConfigurationModelsTest:
+
+    def version_test(self):
+        # * Prepare
+        target = MainWindowConfiguration()
+        version = target.version
+
+        # * Act
+        target.width = 100
+        target.height = 100
+
+        # * Assert
+        assert target.version == version + 2
+
+    def from_json_test(self):
+        # * Prepare
+        config = UtilityConfiguration()
+        config.save_delay = 100
+
+        # * Act
+        result = UtilityConfiguration.from_json(config.to_json())
+
+        # * Assert
+        assert result.save_delay == 100
+        assert 'version' not in config.to_json()
+
+
+if __name__ == '__main__':
+    pytest.main()
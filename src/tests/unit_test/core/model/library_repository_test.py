@@ -0,0 +1,288 @@
+import os
+import pytest
+
+from unittest.mock import MagicMock
+
+from src.core.model.library import Library
+from src.core.model.library_repository import LibraryRepository
+from src.core.model.script import Script
+
+
+class LibraryRepositoryTest:
+    directory = os.path.join('test', 'library')
+    files = [os.path.join('test', 'library', 'script0.ahk'),
+             os.path.join('test', 'library', 'script1.ahk'),
+             os.path.join('test', 'library', 'script2.ahk')]
+
+    @pytest.fixture()
+    def library(self) -> Library:
+        library = Library(self.directory)
+        for file in self.files:
+            library.add(Script(file))
+
+        return library
+
+    @pytest.fixture()
+    def target(self, library: Library) -> LibraryRepository:
+        repository = LibraryRepository()
+        repository.add(library)
+
+        return repository
+
+    def find_test(self, target: LibraryRepository, library: Library):
+        # * Act
+        result = target.find(self.directory + os.sep)
+
+        # * Assert
+        assert result is library
+
+    def find_script_test(self, target: LibraryRepository, library: Library):
+        # * Act
+        script = target.find_script(self.files[1])
+        result = target.find_library_contains_script(self.files[1])
+
+        # * Assert
+        assert script is library.script_list[1]
+        assert result is library
+
+    def find_script_test_script_added(self, target: LibraryRepository,
+                                      library: Library):
+        # * Prepare
+        path = os.path.join(self.directory, 'new.ahk')
+
+        # * Act
+        library.add(Script(path))
+
+        # * Assert
+        assert target.find_script(path)
+        assert target.find_library_contains_script(path) is library
+
+    def find_script_test_script_removed(self, target: LibraryRepository,
+                                        library: Library):
+        # * Act
+        library.remove(library.script_list[0])
+
+        # * Assert
+        assert not target.find_script(self.files[0])
+        assert not target.find_library_contains_script(self.files[0])
+
+    def get_running_scripts_test(self, target: LibraryRepository,
+                                 library: Library):
+        # * Prepare
+        script0, script1, script2 = library.script_list
+
+        # * Act
+        script0.start(MagicMock())
+        script1.start(MagicMock())
+        script2.start(MagicMock())
+        script1.stop()
+        script2.pause()
+
+        # * Assert
+        assert target.get_running_scripts() == [script0]
+        assert target.get_paused_scripts() == [script2]
+        assert library.find_running_scripts() == [script0]
+        assert library.find_paused_scripts() == [script2]
+
+    def get_running_scripts_test_script_removed(self,
+                                                target: LibraryRepository,
+                                                library: Library):
+        # * Prepare
+        script = library.script_list[0]
+        script.start(MagicMock())
+
+        # * Act
+        library.remove(script)
+
+        # * Assert
+        assert not target.get_running_scripts()
+        assert not library.find_running_scripts()
+
+    def iter_scripts_test(self, target: LibraryRepository, library: Library):
+        # * Prepare
+        other = Library(self.directory + '2')
+        other.add(Script(os.path.join(other.path, 'other.ahk')))
+        target.add(other)
+
+        # * Act
+        result = list(target.iter_scripts())
+        sliced = list(target.iter_scripts(start=1, stop=3))
+        filtered = list(target.iter_scripts(
+            lambda x: x.name != 'script1', 1))
+
+        # * Assert
+        assert result == library.script_list + other.script_list
+        assert sliced == library.script_list[1:3]
+        assert filtered == [library.script_list[2], other.script_list[0]]
+
+    def remove_test(self, target: LibraryRepository, library: Library):
+        # * Act
+        target.remove(library)
+        library.add(Script(os.path.join(self.directory, 'new.ahk')))
+
+        # * Assert
+        assert not target.library_list
+        assert not target.find(self.directory)
+        assert not target.scripts
+        assert not target.script_libraries
+
+    def remove_tree_test(self, target: LibraryRepository, library: Library):
+        # * Prepare
+        sub_library = Library(os.path.join(self.directory, 'sub'))
+        sub_library.add(Script(os.path.join(sub_library.path, 'sub.ahk')))
+        other = Library(self.directory + '2')
+        target.add(sub_library)
+        target.add(other)
+
+        # * Act
+        found = target.find_libraries_under(self.directory)
+        scripts = target.find_scripts_under(self.directory)
+        result = target.remove_tree(self.directory)
+
+        # * Assert
+        assert found == [library, sub_library]
+        assert len(scripts) == 4
+        assert result == [library, sub_library]
+        assert target.library_list == [other]
+        assert not target.scripts
+        assert not target.find_scripts_under(self.directory)
+
+    def remove_tree_test_no_library(self, target: LibraryRepository,
+                                    library: Library):
+        # * Prepare
+        sub_dir = os.path.join(self.directory, 'a')
+        sub_libraries = [Library(os.path.join(sub_dir, x))
+                         for x in ['b', 'c']]
+        for sub_library in sub_libraries:
+            target.add(sub_library)
+
+        # * Act
+        # directory of the subtree has no library
+        result = target.remove_tree(sub_dir)
+
+        # * Assert
+        assert result == sub_libraries
+        assert not library.children
+        assert list(library.iter_tree()) == [library]
+        assert all(x.parent is None for x in sub_libraries)
+
+    def remove_tree_test_running(self, target: LibraryRepository,
+                                 library: Library):
+        # * Prepare
+        handle = target.registry.find_handle(self.files[0])
+        library.start()
+        started = target.registry.get_owner_count(handle)
+
+        # * Act
+        target.remove_tree(self.directory)
+        library.stop()
+        library.start()
+
+        # * Assert
+        assert started == 1
+        assert target.registry.find_handle(self.files[0]) is None
+        assert not target.registry.handles
+        assert not target.running_libraries
+
+    def add_test_tree(self, target: LibraryRepository, library: Library):
+        # * Prepare
+        grandchild = Library(os.path.join(self.directory, 'a', 'b'))
+        child = Library(os.path.join(self.directory, 'a'))
+
+        # * Act
+        target.add(grandchild)
+        linked = grandchild.parent
+        target.add(child)
+
+        # * Assert
+        assert linked is library
+        assert grandchild.parent is child
+        assert child.parent is library
+        assert list(library.children.values()) == [child]
+        assert list(library.iter_tree()) == [library, child, grandchild]
+
+    def remove_test_tree(self, target: LibraryRepository, library: Library):
+        # * Prepare
+        child = Library(os.path.join(self.directory, 'a'))
+        grandchild = Library(os.path.join(self.directory, 'a', 'b'))
+        target.add(child)
+        target.add(grandchild)
+
+        # * Act
+        target.remove(child)
+
+        # * Assert
+        assert grandchild.parent is library
+        assert list(library.children.values()) == [grandchild]
+        assert not child.parent
+
+    def find_closest_library_test(self, target: LibraryRepository,
+                                  library: Library):
+        # * Act
+        result = target.find_closest_library(
+            os.path.join(self.directory, 'new', 'new.ahk'))
+
+        # * Assert
+        assert result is library
+        assert not target.find_closest_library('test')
+
+    def clear_test(self, target: LibraryRepository):
+        # * Act
+        target.clear()
+
+        # * Assert
+        assert not target.library_list
+        assert not target.find(self.directory)
+        assert not target.find_script(self.files[0])
+
+    def from_json_test(self, target: LibraryRepository):
+        # * Act
+        result = LibraryRepository.from_json(target.to_json())
+
+        # * Assert
+        assert result.find(self.directory)
+        assert result.find_library_contains_script(self.files[2]) is \
+            result.find(self.directory)
+
+    def replay_test(self, target: LibraryRepository, library: Library):
+        # * Prepare
+        saved = LibraryRepository.from_json(target.to_json())
+        target.take_changes()
+        other = Library(self.directory + '2')
+        other.add(Script(os.path.join(other.path, 'other.ahk')))
+        target.add(other)
+        library.remove(library.script_list[0])
+        library.script_list[0].lock()
+        library.script_list[0].lock()
+        other.start()
+
+        # * Act
+        records = target.take_changes()
+        saved.replay(records)
+
+        # * Assert
+        assert len(records) == 4
+        assert saved.to_json() == target.to_json()
+        assert saved.find_script(self.files[1]).is_locked()
+        assert not saved.find(other.path).is_running()
+
+    def take_modified_libraries_test(self, target: LibraryRepository,
+                                     library: Library):
+        # * Prepare
+        saved = LibraryRepository.from_json(target.to_json())
+        other = Library(self.directory + '2')
+        saved.add(other)
+        saved.take_modified_libraries()
+
+        # * Act
+        saved.find(self.directory).script_list[0].lock()
+        result = saved.take_modified_libraries()
+
+        # * Assert
+        assert target.take_modified_libraries() is None
+        assert result == {library.key}
+        assert not saved.take_modified_libraries()
+
+
+if __name__ == '__main__':
+    pytest.main()
@@ -0,0 +1,51 @@
+import os
+import pytest
+
+from src.core.model.library import Library
+from src.core.model.script import Script
+
+
+class LibraryTest:
+    directory = os.path.join('test', 'library')
+    files = [os.path.join('test', 'library', 'script0.ahk'),
+             os.path.join('test', 'library', 'script1.ahk')]
+
+    @pytest.fixture()
+    def target(self) -> Library:
+        library = Library(self.directory)
+        for file in self.files:
+            library.add(Script(file))
+
+        return library
+
+    def add_test_same_path(self, target: Library):
+        # * Prepare
+        script = Script(self.files[0])
+
+        # * Act
+        target.add(script)
+
+        # * Assert
+        assert len(target.script_list) == 2
+        assert target.find(self.files[0]) is script
+
+    def find_test(self, target: Library):
+        # * Act
+        result = target.find(
+            os.path.join(self.directory, '.', 'script1.ahk'))
+
+        # * Assert
+        assert result is target.script_list[1]
+        assert target.has_script(self.files[1])
+
+    def remove_test(self, target: Library):
+        # * Act
+        target.remove(Script(self.files[0]))
+        target.remove(target.script_list[1])
+
+        # * Assert
+        assert [x.path for x in target.script_list] == [self.files[0]]
+
+
+if __name__ == '__main__':
+    pytest.main()
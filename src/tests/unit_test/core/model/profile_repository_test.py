@@ -0,0 +1,179 @@
+import pytest
+
+from src.core.model.profile import Profile
+from src.core.model.profile_repository import ProfileRepository
+from src.core.model.state import State
+
+
+class ProfileRepositoryTest:
+    script_id = 'script.ahk'
+
+    @pytest.fixture()
+    def profile(self) -> Profile:
+        profile = Profile('profile')
+        profile.add(self.script_id)
+
+        return profile
+
+    @pytest.fixture()
+    def target(self, profile: Profile) -> ProfileRepository:
+        repository = ProfileRepository()
+        repository.add(profile)
+        repository.add(Profile('other'))
+
+        return repository
+
+    def find_profiles_contains_script_test(self, target: ProfileRepository,
+                                           profile: Profile):
+        # * Act
+        result = target.find_profiles_contains_script(self.script_id)
+
+        # * Assert
+        assert result == [profile]
+
+    def find_profiles_contains_script_test_script_added(
+            self, target: ProfileRepository):
+        # * Prepare
+        other = target.find('other')
+
+        # * Act
+        other.add(self.script_id)
+
+        # * Assert
+        assert target.find_profiles_contains_script(self.script_id) == \
+            [target.find('profile'), other]
+
+    def find_profiles_contains_script_test_script_removed(
+            self, target: ProfileRepository, profile: Profile):
+        # * Act
+        profile.remove(self.script_id)
+
+        # * Assert
+        assert not target.find_profiles_contains_script(self.script_id)
+        assert not target.script_profiles
+
+    def find_running_profiles_contains_script_test(
+            self, target: ProfileRepository, profile: Profile):
+        # * Act
+        before = target.find_running_profiles_contains_script(self.script_id)
+        profile.start()
+        started = target.find_running_profiles_contains_script(self.script_id)
+        profile.stop()
+        stopped = target.find_running_profiles_contains_script(self.script_id)
+
+        # * Assert
+        assert not before
+        assert started == [profile]
+        assert not stopped
+
+    def get_running_script_bits_test(self, target: ProfileRepository,
+                                     profile: Profile):
+        # * Prepare
+        other = target.find('other')
+        other.add('other.ahk')
+        profile.start()
+        other.start()
+
+        # * Act
+        result = target.get_running_script_bits()
+        excluded = target.get_running_script_bits(profile)
+
+        # * Assert
+        assert result == profile.script_bits | other.script_bits
+        assert excluded == other.script_bits
+        assert not excluded & profile.script_bits
+
+    def remove_test(self, target: ProfileRepository, profile: Profile):
+        # * Prepare
+        handle = target.registry.find_handle(self.script_id)
+        profile.start()
+        started = target.registry.get_owner_count(handle)
+
+        # * Act
+        target.remove(profile)
+        profile.add('new.ahk')
+        profile.stop()
+
+        # * Assert
+        assert not target.find('profile')
+        assert not target.script_profiles
+        assert not target.running_profiles
+        assert started == 1
+        assert not target.registry.handles
+        assert profile.has_script(self.script_id)
+        assert profile.has_script('new.ahk')
+
+    def from_json_test(self, target: ProfileRepository):
+        # * Act
+        result = ProfileRepository.from_json(target.to_json())
+
+        # * Assert
+        assert result.find_profiles_contains_script(self.script_id) == \
+            [result.find('profile')]
+
+    def replay_test(self, target: ProfileRepository, profile: Profile):
+        # * Prepare
+        saved = ProfileRepository.from_json(target.to_json())
+        target.take_changes()
+        other = target.find('other')
+        other.add(self.script_id)
+        other.start()
+        profile.remove(self.script_id)
+        target.remove(profile)
+        target.add(Profile('new'))
+
+        # * Act
+        records = target.take_changes()
+        saved.replay(records)
+
+        # * Assert
+        assert len(records) == 4
+        assert saved.to_json() == target.to_json()
+        assert not saved.find('other').is_running()
+        assert not saved.take_changes()
+
+    def replay_test_running_state(self, target: ProfileRepository,
+                                  profile: Profile):
+        # * Prepare
+        saved = ProfileRepository.from_json(target.to_json())
+        saved.find('profile').start()
+        target.take_changes()
+
+        # * Act
+        profile.restore_state(State.LOCK | State.RUNNING)
+        records = target.take_changes()
+        saved.replay(records)
+
+        # * Assert
+        assert records == [['state', 'profile', State.LOCK]]
+        assert not profile.is_running()
+        assert saved.find('profile').is_running()
+        assert saved.find('profile').state.lock
+
+    def take_changes_test_not_loaded(self):
+        # * Prepare
+        target = ProfileRepository()
+        target.add(Profile('profile'))
+
+        # * Act
+        result = target.take_changes()
+
+        # * Assert
+        assert result is None
+        assert target.take_changes() == []
+
+    def version_test(self, target: ProfileRepository, profile: Profile):
+        # * Prepare
+        version = target.version
+
+        # * Act
+        profile.add('other.ahk')
+        profile.has_script('other.ahk')
+        profile.start()
+
+        # * Assert
+        assert target.version == version + 1
+
+
+if __name__ == '__main__':
+    pytest.main()
@@ -0,0 +1,62 @@
+import pytest
+
+from src.core.model.profile import Profile
+
+
+class ProfileTest:
+
+    @pytest.fixture()
+    def target(self) -> Profile:
+        profile = Profile('profile')
+        profile.add('script0.ahk')
+        profile.add('script1.ahk')
+
+        return profile
+
+    def add_test_duplicated(self, target: Profile):
+        # * Act
+        target.add('script0.ahk')
+
+        # * Assert
+        assert target.get_script_ids() == ['script0.ahk', 'script1.ahk']
+
+    def remove_test(self, target: Profile):
+        # * Act
+        target.remove('script0.ahk')
+        target.remove('not_found.ahk')
+
+        # * Assert
+        assert not target.has_script('script0.ahk')
+        assert target.has_script('script1.ahk')
+
+    def script_bits_test(self, target: Profile):
+        # * Act
+        before = target.script_bits
+        target.remove('script0.ahk')
+        after = target.script_bits
+
+        # * Assert
+        assert before == 0b11
+        assert after == 0b10
+
+    def to_json_test(self, target: Profile):
+        # * Act
+        result = target.to_json()
+
+        # * Assert
+        assert result['script_id_list'] == ['script0.ahk', 'script1.ahk']
+
+    def from_json_test_duplicated(self, target: Profile):
+        # * Prepare
+        json_str = target.to_json()
+        json_str['script_id_list'].insert(0, 'script1.ahk')
+
+        # * Act
+        result = Profile.from_json(json_str)
+
+        # * Assert
+        assert result.get_script_ids() == ['script1.ahk', 'script0.ahk']
+
+
+if __name__ == '__main__':
+    pytest.main()
@@ -0,0 +1,105 @@
+import os
+import pytest
+
+from unittest.mock import MagicMock
+
+from src.core.model.scan_cache import ScanCache
+
+
+class ScanCacheTest:
+
+    @pytest.fixture()
+    def target(self) -> ScanCache:
+        return ScanCache()
+
+    @pytest.fixture()
+    def test_dir(self, tmp_path) -> str:
+        (tmp_path / 'sub').mkdir()
+        (tmp_path / 'script.ahk').write_text('')
+
+        return str(tmp_path)
+
+    def scan_directory_test(self, target: ScanCache, test_dir: str):
+        # * Act
+        directories, files = target.scan_directory(test_dir)
+
+        # * Assert
+        assert directories == [os.path.join(test_dir, 'sub')]
+        assert files == [os.path.join(test_dir, 'script.ahk')]
+        assert target.modified
+        assert test_dir in target.entries
+
+    def scan_directory_test_unchanged(self, target: ScanCache,
+                                      test_dir: str):
+        # * Prepare
+        expected_result = target.scan_directory(test_dir)
+        target.modified = False
+
+        # * Key
+        target.utility = MagicMock()
+
+        # * Act
+        result = target.scan_directory(test_dir)
+
+        # * Assert
+        assert expected_result == result
+        assert not target.utility.scan_directory.called
+        assert not target.modified
+
+    def scan_directory_test_changed(self, target: ScanCache, test_dir: str):
+        # * Prepare
+        target.scan_directory(test_dir)
+
+        # * Key
+        # another process changed directory since last scan
+        target.entries[test_dir].mtime -= 1
+
+        # * Act
+        _, files = target.scan_directory(test_dir)
+
+        # * Assert
+        assert files == [os.path.join(test_dir, 'script.ahk')]
+        assert target.entries[test_dir].matches(os.stat(test_dir))
+
+    def scan_directory_test_directory_removed(self, target: ScanCache,
+                                              test_dir: str):
+        # * Prepare
+        sub_dir = os.path.join(test_dir, 'sub')
+        target.scan_directory(sub_dir)
+        os.rmdir(sub_dir)
+
+        # * Act
+        result = target.scan_directory(sub_dir)
+
+        # * Assert
+        assert result == ([], [])
+        assert sub_dir not in target.entries
+
+    def retain_test(self, target: ScanCache, test_dir: str):
+        # * Prepare
+        sub_dir = os.path.join(test_dir, 'sub')
+        target.scan_directory(test_dir)
+        target.scan_directory(sub_dir)
+
+        # * Act
+        target.retain(test_dir, [test_dir])
+
+        # * Assert
+        assert test_dir in target.entries
+        assert sub_dir not in target.entries
+
+    def from_json_test(self, target: ScanCache, test_dir: str):
+        # * Prepare
+        target.scan_directory(test_dir)
+
+        # * Act
+        result = ScanCache.from_json(target.to_json())
+
+        # * Assert
+        assert result.entries[test_dir].matches(os.stat(test_dir))
+        assert result.entries[test_dir].files == \
+            target.entries[test_dir].files
+
+
+if __name__ == '__main__':
+    pytest.main()
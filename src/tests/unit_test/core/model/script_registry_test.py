@@ -0,0 +1,140 @@
+import os
+import pytest
+
+from unittest.mock import MagicMock
+
+from src.core.model.script import Script
+from src.core.model.script_registry import ScriptRegistry
+from src.core.model.state import State
+
+
+class ScriptRegistryTest:
+    path = os.path.join('test', 'library', 'script.ahk')
+
+    @pytest.fixture()
+    def target(self) -> ScriptRegistry:
+        return ScriptRegistry()
+
+    def get_handle_test(self, target: ScriptRegistry):
+        # * Act
+        handle = target.get_handle(self.path)
+        other = target.get_handle(os.path.join('test', 'other.ahk'))
+
+        # * Assert
+        assert target.get_handle(self.path) == handle
+        assert target.find_handle(self.path) == handle
+        assert other != handle
+        assert target.find_handle('not_found.ahk') is None
+
+    def get_path_test(self, target: ScriptRegistry):
+        # * Prepare
+        new_path = os.path.join('test', 'new.ahk')
+        handle = target.get_handle(self.path)
+
+        # * Act
+        path = target.get_path(handle)
+        target.free_handle(handle)
+        freed = target.get_path(handle)
+        target.get_handle(new_path)
+
+        # * Assert
+        assert path == self.path
+        assert freed is None
+        assert target.get_path(handle) == new_path
+
+    def bind_test(self, target: ScriptRegistry):
+        # * Prepare
+        script = Script(self.path)
+
+        # * Act
+        target.bind(script)
+
+        # * Assert
+        assert target.get_script(target.find_handle(self.path)) is script
+
+    def get_scripts_test(self, target: ScriptRegistry):
+        # * Prepare
+        scripts = [Script(os.path.join('test', 'script{}.ahk'.format(i)))
+                   for i in range(3)]
+        for script in scripts:
+            target.bind(script)
+        target.get_handle(os.path.join('test', 'not_bound.ahk'))
+
+        # * Act
+        result = target.get_scripts(0b1101)
+
+        # * Assert
+        assert list(ScriptRegistry.iter_handles(0b1101)) == [0, 2, 3]
+        assert result == [scripts[0], scripts[2]]
+
+    def to_bits_test(self):
+        # * Act
+        result = ScriptRegistry.to_bits([3, 0, 10, 3])
+
+        # * Assert
+        assert result == 0b10000001001
+        assert ScriptRegistry.to_bits([]) == 0
+
+    def select_scripts_test(self, target: ScriptRegistry):
+        # * Prepare
+        scripts = [Script(os.path.join('test', 'script{}.ahk'.format(i)))
+                   for i in range(3)]
+        for script in scripts:
+            target.bind(script)
+        process = MagicMock()
+        process.pid = 100
+
+        # * Act
+        scripts[1].start(process)
+        target.update_state(scripts[1])
+        scripts[2].start(process)
+        target.update_state(scripts[2])
+        scripts[2].pause()
+        target.update_state(scripts[2])
+        target.update_state(Script(scripts[0].path))
+
+        # * Assert
+        assert target.select_scripts(State.RUNNING, State.PAUSED) == \
+            [scripts[1]]
+        assert target.select_scripts(State.PAUSED) == [scripts[2]]
+        assert target.states.get_pids([0, 1, 2]) == [100]
+
+    def unbind_test(self, target: ScriptRegistry):
+        # * Prepare
+        script = Script(self.path)
+        script.lock()
+        target.bind(script)
+        handle = target.find_handle(self.path)
+
+        # * Act
+        target.unbind(Script(self.path))
+        bound = target.get_script(handle)
+        target.unbind(script)
+
+        # * Assert
+        assert bound is script
+        assert target.get_script(handle) is None
+        assert not target.select_scripts(State.LOCK)
+        assert target.find_handle(self.path) is None
+
+    def free_handle_test(self, target: ScriptRegistry):
+        # * Prepare
+        handle = target.get_handle(self.path)
+        target.get_handle(self.path)
+        other = target.get_handle(os.path.join('test', 'other.ahk'))
+
+        # * Act
+        target.free_handle(handle)
+        kept = target.find_handle(self.path)
+        target.free_handle(handle)
+        reused = target.get_handle(os.path.join('test', 'new.ahk'))
+
+        # * Assert
+        assert kept == handle
+        assert target.find_handle(self.path) is None
+        assert reused == handle
+        assert other != handle
+
+
+if __name__ == '__main__':
+    pytest.main()
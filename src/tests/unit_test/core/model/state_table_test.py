@@ -0,0 +1,60 @@
+import pytest
+
+from src.core.model.state import State
+from src.core.model.state_table import StateTable
+
+
+class StateTableTest:
+
+    @pytest.fixture()
+    def target(self) -> StateTable:
+        table = StateTable()
+
+        table.update(0, State.RUNNING, 100)
+        table.update(1, State.RUNNING | State.PAUSED)
+        table.update(2, 0)
+        table.update(4, State.RUNNING | State.LOCK, 300)
+
+        return table
+
+    def select_test(self, target: StateTable):
+        # * Act
+        running = target.select(State.RUNNING, State.PAUSED)
+        paused = target.select(State.PAUSED)
+        locked = target.select(State.RUNNING | State.LOCK)
+
+        # * Assert
+        assert running == [0, 4]
+        assert paused == [1]
+        assert locked == [4]
+        assert target.count(State.RUNNING, State.PAUSED) == 2
+        assert target.count(State.STARTUP) == 0
+
+    def update_test(self, target: StateTable):
+        # * Act
+        target.update(1, State.RUNNING, 200)
+
+        # * Assert
+        assert target.select(State.RUNNING, State.PAUSED) == [0, 1, 4]
+        assert len(target.flags) == len(target.pids) == 5
+        assert target.pids[3] == 0
+
+    def get_pids_test(self, target: StateTable):
+        # * Act
+        result = target.get_pids(target.select(State.RUNNING))
+
+        # * Assert
+        assert result == [100, 300]
+
+    def remove_test(self, target: StateTable):
+        # * Act
+        target.remove(0)
+        target.remove(10)
+
+        # * Assert
+        assert target.select(State.RUNNING, State.PAUSED) == [4]
+        assert target.pids[0] == 0
+
+
+if __name__ == '__main__':
+    pytest.main()
@@ -0,0 +1,40 @@
+import pytest
+
+from src.core.model.state import State
+
+
+class StateTest:
+
+    def flags_test(self):
+        # * Prepare
+        target = State()
+
+        # * Act
+        target.running = True
+        target.lock = True
+        target.running = False
+        target.paused = True
+
+        # * Assert
+        assert target.lock
+        assert target.paused
+        assert not target.running
+        assert not target.startup
+
+    def from_json_test(self):
+        # * Prepare
+        state = State()
+        state.lock = True
+        state.running = True
+
+        # * Act
+        result = State.from_json(state.to_json())
+
+        # * Assert
+        assert state.to_json() == {'lock': True, 'startup': False}
+        assert result.lock
+        assert not result.running
+
+
+if __name__ == '__main__':
+    pytest.main()
@@ -47,6 +47,25 @@ class LibraryManagerTest:
         assert not result.messages
         assert library.is_paused()
 
+    def start_tree_test(self, target: LibraryManager, library: Library):
+        # * Prepare
+        child = Library(self.example_paths['directory'] + '\\child')
+        child.add(Script(child.path + '\\child.ahk'))
+        child.parent = library
+        library.children[child.key] = child
+
+        target.script_manager.start = MagicMock(
+            side_effect=lambda script: (ActionResult(), script))
+
+        # * Act
+        result, _ = target.start_tree(library)
+
+        # * Assert
+        assert result.success()
+        assert target.script_manager.start.call_count == 6
+        assert library.is_running()
+        assert child.is_running()
+
     def resume_test(self, target: LibraryManager, library: Library):
         # * Prepare
         target.script_manager.resume = MagicMock(
@@ -80,7 +80,7 @@ class LibraryServiceTest():
 
         return count
 
-    def _setup_data(self):
+    def _setup_data(self, running: bool = False):
         # > Create new library service and initialize
         library_service = LibraryService()
         for item in self.example_paths:
@@ -89,8 +89,13 @@ class LibraryServiceTest():
                 script = Script(script_path)
                 library.add(script)
 
+            if running:
+                library.start()
             library_service.repository.add(library)
 
+    def _walk_result(self, test_dir: str, sub_dirs: List[str]):
+        return [(directory, []) for directory in [test_dir] + sub_dirs]
+
     # region add
 
     def add_test_new(self, target: LibraryService,
@@ -103,14 +108,14 @@ class LibraryServiceTest():
         # * Prepare
         target.utility.format_path = MagicMock(return_value=test_dir)
         target.utility.is_dir = MagicMock(return_value=True)
-        target.utility.get_directories = MagicMock(
-            return_value=sub_dirs)
+        target.utility.walk_directories = MagicMock(
+            return_value=self._walk_result(test_dir, sub_dirs))
 
         # * Key
         # Could not find library in repository
         target.find = MagicMock(return_value=None)
         target.library_manager.init_library = MagicMock(
-            side_effect=lambda path: (ActionResult(), Library(path)))
+            side_effect=lambda path, files: (ActionResult(), Library(path)))
         target.library_manager.reload = MagicMock(ActionResult(), None)
 
         # * Act
@@ -137,14 +142,15 @@ class LibraryServiceTest():
         # * Prepare
         target.utility.format_path = MagicMock(return_value=test_dir)
         target.utility.is_dir = MagicMock(return_value=True)
-        target.utility.get_directories = MagicMock(return_value=sub_dirs)
+        target.utility.walk_directories = MagicMock(
+            return_value=self._walk_result(test_dir, sub_dirs))
 
         # * Key
         # Could library found in repository, reload
         target.find = MagicMock(side_effect=lambda path: Library(path))
         target.library_manager.init_library = MagicMock()
         target.library_manager.reload = MagicMock(
-            side_effect=lambda library: (ActionResult(), library))
+            side_effect=lambda library, files: (ActionResult(), library))
 
         # * Act
         result = target.add(test_dir)
@@ -175,14 +181,14 @@ class LibraryServiceTest():
         # * Prepare
         target.utility.format_path = MagicMock(return_value=test_dir)
         target.utility.is_dir = MagicMock(return_value=True)
-        target.utility.get_directories = MagicMock(
-            return_value=sub_dirs)
+        target.utility.walk_directories = MagicMock(
+            return_value=self._walk_result(test_dir, sub_dirs))
 
         # * Key
         # Could not find library in repository
         target.find = MagicMock(return_value=None)
         target.library_manager.init_library = MagicMock(
-            side_effect=lambda path: (failed_result, None))
+            side_effect=lambda path, files: (failed_result, None))
         target.library_manager.reload = MagicMock()
 
         # * Act
@@ -699,7 +705,9 @@ class LibraryServiceTest():
         """
 
         # * Prepare
-        target.repository.add(Library(test_dir))
+        library = Library(test_dir)
+        library.start()
+        target.repository.add(library)
         stop_result = ActionResult()
         stop_result.add_error("Error")
 
@@ -737,6 +745,24 @@ class LibraryServiceTest():
         assert result.success()
         assert not result.messages
 
+    def stop_all_test_not_running(self, target: LibraryService,
+                                  test_dir: str):
+        """
+        Library is not running, nothing to stop
+        """
+
+        # * Prepare
+        target.repository.add(Library(test_dir))
+        target.library_manager.stop = MagicMock(
+            return_value=(ActionResult(), None))
+
+        # * Act
+        result = target.stop_all()
+
+        # * Assert
+        assert result.success()
+        target.library_manager.stop.assert_not_called()
+
     # endregion stop all
 
     # region refresh
@@ -804,7 +830,7 @@ class LibraryServiceTest():
         """
 
         # * Prepare
-        self._setup_data()
+        self._setup_data(True)
         target.library_manager.pause = MagicMock(
             side_effect=self._pause_all_library_manager_pause)
 
@@ -820,6 +846,19 @@ class LibraryServiceTest():
 
         target.library_manager.pause.call_count == scripts_count
 
+    def pause_all_test_not_running(self, target: LibraryService):
+        # * Prepare
+        self._setup_data()
+        target.library_manager.pause = MagicMock(
+            return_value=(ActionResult(), None))
+
+        # * Act
+        result = target.pause_all()
+
+        # * Assert
+        assert result.success()
+        target.library_manager.pause.assert_not_called()
+
     def _pause_all_library_manager_pause(self, library: Library):
         library.pause()
         return ActionResult(), library
@@ -842,6 +881,22 @@ class LibraryServiceTest():
         assert result.success()
         target.library_manager.resume.call_count == scripts_count
 
+    def resume_all_test_paused(self, target: LibraryService):
+        # * Prepare
+        self._setup_data(True)
+        library = target.repository.find(self.example_paths[0]['directory'])
+        library.pause()
+
+        target.library_manager.resume = MagicMock(
+            side_effect=lambda library: (ActionResult(), library))
+
+        # * Act
+        result = target.resume_all()
+
+        # * Assert
+        assert result.success()
+        target.library_manager.resume.assert_called_once_with(library)
+
     def resume_all_test_has_error(
             self, target: LibraryService, scripts_count: int):
         # * Prepare
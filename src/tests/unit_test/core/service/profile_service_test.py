@@ -0,0 +1,163 @@
+import os
+import pytest
+
+from unittest.mock import MagicMock
+
+from src.core.model.action_result import ActionResult
+from src.core.model.library import Library
+from src.core.model.library_repository import LibraryRepository
+from src.core.model.profile import Profile
+from src.core.model.profile_repository import ProfileRepository
+from src.core.model.script import Script
+from src.core.service.profile_service import ProfileService
+
+
+class ProfileServiceTest:
+
+    @pytest.fixture()
+    def library_repository(self, tmp_path) -> LibraryRepository:
+        library = Library(str(tmp_path))
+        for i in range(4):
+            library.add(Script(str(tmp_path / 'script{}.ahk'.format(i))))
+
+        repository = LibraryRepository()
+        repository.add(library)
+
+        return repository
+
+    @pytest.fixture()
+    def scripts(self, library_repository: LibraryRepository) -> list:
+        return library_repository.get_all_scripts()
+
+    @pytest.fixture()
+    def target(self, library_repository: LibraryRepository) \
+            -> ProfileService:
+        # * Profiles refer to scripts by handles of the library repository
+        profile_service = ProfileService()
+        profile_service.repository = ProfileRepository(
+            library_repository.registry)
+        profile_service.script_manager = MagicMock()
+        profile_service.script_manager.start = MagicMock(
+            side_effect=lambda x: (ActionResult(), x))
+        profile_service.script_manager.stop = MagicMock(
+            side_effect=lambda x: (ActionResult(), x))
+
+        return profile_service
+
+    def _add_profile(self, target: ProfileService, name: str,
+                     scripts: list) -> Profile:
+        profile = Profile(name)
+        for script in scripts:
+            profile.add(script.identifier())
+        target.repository.add(profile)
+
+        return profile
+
+    def switch_test(self, target: ProfileService, scripts: list):
+        # * Prepare
+        work = self._add_profile(target, 'work', scripts[0:3])
+        gaming = self._add_profile(target, 'gaming', scripts[1:4])
+        work.start()
+
+        # * Act
+        result, profile = target.switch('work', 'gaming')
+
+        # * Assert
+        assert result.success()
+        assert profile is gaming
+        assert not work.is_running()
+        assert gaming.is_running()
+        target.script_manager.stop.assert_called_once_with(scripts[0])
+        target.script_manager.start.assert_called_once_with(scripts[3])
+
+    def switch_test_script_needed(self, target: ProfileService,
+                                  scripts: list):
+        # * Prepare
+        work = self._add_profile(target, 'work', scripts[0:2])
+        other = self._add_profile(target, 'other', scripts[0:1])
+        self._add_profile(target, 'gaming', scripts[2:3])
+        work.start()
+        other.start()
+        scripts[1].library.start()
+
+        # * Act
+        result, _ = target.switch('work', 'gaming')
+
+        # * Assert
+        assert result.success()
+        target.script_manager.stop.assert_not_called()
+        target.script_manager.start.assert_called_once_with(scripts[2])
+
+    def switch_test_profile_not_exists(self, target: ProfileService,
+                                       scripts: list):
+        # * Prepare
+        self._add_profile(target, 'work', scripts)
+
+        # * Act
+        result, profile = target.switch('work', 'not_exists')
+
+        # * Assert
+        assert not result.success()
+        assert not profile
+
+    def is_script_needed_test(self, target: ProfileService, scripts: list):
+        # * Prepare
+        work = self._add_profile(target, 'work', scripts[0:2])
+        other = self._add_profile(target, 'other', scripts[1:2])
+        work.start()
+
+        # * Act
+        before = [target.is_script_needed(x.identifier(), 'work')
+                  for x in scripts[0:2]]
+        other.start()
+        scripts[0].library.start()
+        after = [target.is_script_needed(x.identifier(), 'work')
+                 for x in scripts[0:2]]
+        scripts[0].library.stop()
+        other.stop()
+        work.stop()
+        stopped = [target.is_script_needed(x.identifier())
+                   for x in scripts[0:2]]
+
+        # * Assert
+        assert before == [False, False]
+        assert after == [True, True]
+        assert stopped == [False, False]
+
+    def remove_test_running(self, target: ProfileService, scripts: list):
+        # * Prepare
+        work = self._add_profile(target, 'work', scripts[0:2])
+        other = self._add_profile(target, 'other', scripts[1:2])
+        work.start()
+        other.start()
+
+        # * Act
+        target.remove_script_from_profile = MagicMock(
+            side_effect=lambda profile_id, script_id: ActionResult())
+        result = target.remove('work')
+
+        # * Assert
+        assert result.success()
+        assert not target.find('work')
+        assert target.remove_script_from_profile.call_count == 2
+        assert other.has_script(scripts[1].identifier())
+
+    def stop_all_test(self, target: ProfileService, scripts: list):
+        # * Prepare
+        work = self._add_profile(target, 'work', scripts[0:2])
+        work.start()
+        for script in [scripts[0], scripts[3]]:
+            script.start(MagicMock())
+
+        # * Act
+        result = target.stop_all()
+
+        # * Assert
+        # script not in any profile is kept running
+        assert result.success()
+        assert not work.is_running()
+        target.script_manager.stop.assert_called_once_with(scripts[0])
+
+
+if __name__ == '__main__':
+    pytest.main()
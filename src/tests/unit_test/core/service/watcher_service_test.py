@@ -0,0 +1,122 @@
+import os
+import queue
+import pytest
+
+from unittest.mock import MagicMock
+
+from src.core.model.action_result import ActionResult
+from src.core.model.file_event import FileEvent, FileEventType
+from src.core.model.library import Library
+from src.core.model.library_repository import LibraryRepository
+from src.core.service.watcher_service import WatcherService
+
+
+class WatcherServiceTest:
+
+    @pytest.fixture()
+    def target(self) -> WatcherService:
+        watcher_service = WatcherService()
+        watcher_service.configuration = MagicMock()
+        watcher_service.configuration.utility.watcher_debounce = 0
+
+        library_service = MagicMock()
+        library_service.repository = LibraryRepository()
+        library_service.scan_cache.entries = {}
+        for name in ['add', 'add_script', 'remove_script', 'remove_tree']:
+            setattr(library_service, name,
+                    MagicMock(return_value=ActionResult()))
+        watcher_service.library_service = library_service
+
+        # * Fake watcher, events are put by the test
+        watcher_service.watcher = MagicMock()
+        watcher_service.watcher.events = queue.Queue()
+        watcher_service.sync()
+        watcher_service.watcher.sync.reset_mock()
+
+        return watcher_service
+
+    def process_events_test_debounce(self, target: WatcherService, tmp_path):
+        # * Prepare
+        path = str(tmp_path / 'script.ahk')
+        target.configuration.utility.watcher_debounce = 60000
+        target.watcher.events.put(FileEvent(FileEventType.CREATED, path))
+        target.watcher.events.put(FileEvent(FileEventType.DELETED, path))
+
+        # * Act
+        _, waiting = target.process_events()
+        pending = len(target.pending)
+        target.configuration.utility.watcher_debounce = 0
+        _, changed = target.process_events()
+
+        # * Assert
+        assert not waiting
+        assert pending == 1
+        assert changed
+        assert not target.pending
+        target.library_service.add_script.assert_not_called()
+        target.library_service.remove_script.assert_called_once_with(path)
+
+    def process_events_test_no_event(self, target: WatcherService, tmp_path):
+        # * Act
+        target.process_events()
+        synced = target.watcher.sync.call_count
+        target.library_service.repository.add(Library(str(tmp_path)))
+        target.process_events()
+        target.process_events()
+
+        # * Assert
+        assert synced == 0
+        target.watcher.sync.assert_called_once_with({str(tmp_path)})
+
+    def process_events_test_directory_created(self, target: WatcherService,
+                                              tmp_path):
+        # * Prepare
+        path = str(tmp_path / 'sub')
+        target.watcher.events.put(
+            FileEvent(FileEventType.CREATED, path, True))
+
+        # * Act
+        _, changed = target.process_events()
+
+        # * Assert
+        assert changed
+        target.library_service.add.assert_called_once_with(path)
+        target.watcher.sync.assert_called_once()
+
+    def process_events_test_directory_removed(self, target: WatcherService,
+                                              tmp_path):
+        # * Prepare
+        path = str(tmp_path / 'sub')
+        target.library_service.repository.add(Library(path))
+        target.watcher.events.put(
+            FileEvent(FileEventType.DELETED, path, True))
+
+        # * Act
+        _, changed = target.process_events()
+
+        # * Assert
+        assert changed
+        target.library_service.remove_tree.assert_called_once_with(path)
+        target.library_service.scan_cache.remove.assert_called_once_with(
+            path)
+        target.watcher.sync.assert_called_once()
+
+    def process_events_test_overflow(self, target: WatcherService, tmp_path):
+        # * Prepare
+        root = str(tmp_path)
+        target.library_service.repository.add(Library(root))
+        target.library_service.repository.add(
+            Library(os.path.join(root, 'sub')))
+        target.watcher.events.put(FileEvent(FileEventType.OVERFLOWED, root))
+
+        # * Act
+        _, changed = target.process_events()
+
+        # * Assert
+        assert changed
+        target.library_service.add.assert_called_once_with(root)
+        target.library_service.refresh.assert_called_once()
+
+
+if __name__ == '__main__':
+    pytest.main()
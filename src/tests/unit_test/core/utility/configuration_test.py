@@ -0,0 +1,210 @@
+import json
+import os
+from typing import Tuple
+
+import pytest
+
+from src.core.model.configuration_models import UtilityConfiguration
+from src.core.model.library import Library
+from src.core.model.library_repository import LibraryRepository
+from src.core.model.profile import Profile
+from src.core.model.profile_repository import ProfileRepository
+from src.core.model.script import Script
+from src.core.utility.configuration import Configuration
+from src.core.utility.journal import Journal
+from src.core.utility.shard_store import ShardStore
+
+
+class ConfigurationTest:
+
+    def _create(self, config_dir: str) -> Configuration:
+        # * Key
+        # each instance is a restart, files are saved in the directory
+        configuration = Configuration()
+        configuration.utility = UtilityConfiguration()
+        configuration.utility.save_delay = 0
+        configuration.config_path = os.path.join(config_dir, 'ahk.config')
+        configuration.library_journal = Journal(
+            os.path.join(config_dir, 'library.config'),
+            Configuration._pending_lock)
+        configuration.profile_journal = Journal(
+            os.path.join(config_dir, 'profile.config'),
+            Configuration._pending_lock)
+        configuration.library_shards = ShardStore(
+            os.path.join(config_dir, 'libraries'))
+
+        return configuration
+
+    def _load(self, configuration: Configuration) \
+            -> Tuple[LibraryRepository, ProfileRepository]:
+        repo, records = configuration.load_libraries()
+        libraries = LibraryRepository.from_json(repo)
+        libraries.replay(records)
+
+        repo, records = configuration.load_profiles()
+        profiles = ProfileRepository.from_json(repo, libraries.registry)
+        profiles.replay(records)
+
+        return libraries, profiles
+
+    @pytest.fixture()
+    def config_dir(self, tmp_path) -> str:
+        return str(tmp_path / 'configs')
+
+    @pytest.fixture()
+    def libraries(self, tmp_path) -> LibraryRepository:
+        repository = LibraryRepository()
+        for i in range(3):
+            library = Library(str(tmp_path / 'library{}'.format(i)))
+            library.add(Script(os.path.join(library.path, 'script.ahk')))
+            repository.add(library)
+
+        return repository
+
+    @pytest.fixture()
+    def profiles(self, libraries: LibraryRepository) -> ProfileRepository:
+        repository = ProfileRepository(libraries.registry)
+        profile = Profile('profile')
+        profile.add(libraries.get_all_scripts()[0].path)
+        repository.add(profile)
+
+        return repository
+
+    @pytest.fixture()
+    def target(self, config_dir: str) -> Configuration:
+        configuration = self._create(config_dir)
+        yield configuration
+        configuration.flush()
+
+    def _change(self, libraries: LibraryRepository,
+                profiles: ProfileRepository):
+        library = libraries.library_list[1]
+        library.add(Script(os.path.join(library.path, 'new.ahk')))
+        library.script_list[0].lock()
+        profiles.find('profile').add(library.script_list[1].path)
+
+    @pytest.mark.parametrize('sharded', [False, True])
+    def save_test(self, target: Configuration, config_dir: str,
+                  libraries: LibraryRepository,
+                  profiles: ProfileRepository, sharded: bool):
+        # * Prepare
+        target.utility.shard_libraries = sharded
+        target.save(profiles, libraries)
+        target.flush()
+        self._change(libraries, profiles)
+
+        # * Act
+        target.save(profiles, libraries)
+        target.flush()
+        loaded, loaded_profiles = self._load(self._create(config_dir))
+
+        # * Assert
+        assert target.library_journal.record_count == 2
+        assert loaded.to_json() == libraries.to_json()
+        assert loaded_profiles.to_json() == profiles.to_json()
+        assert loaded_profiles.find('profile').script_bits == \
+            loaded.registry.to_bits(
+                loaded.registry.find_handle(x)
+                for x in profiles.find('profile').get_script_ids())
+
+    def save_test_relayout(self, target: Configuration, config_dir: str,
+                           libraries: LibraryRepository,
+                           profiles: ProfileRepository):
+        # * Prepare
+        target.save(profiles, libraries)
+        target.flush()
+
+        # * Act
+        target.utility.shard_libraries = True
+        target.save(profiles, libraries)
+        target.flush()
+        with open(target.library_journal.path, 'r') as infile:
+            sharded = ShardStore.is_manifest(json.load(infile))
+        target.utility.shard_libraries = False
+        target.save(profiles, libraries)
+        target.flush()
+        with open(target.library_journal.path, 'r') as infile:
+            unsharded = not ShardStore.is_manifest(json.load(infile))
+        loaded, _ = self._load(self._create(config_dir))
+
+        # * Assert
+        assert sharded
+        assert unsharded
+        assert loaded.to_json() == libraries.to_json()
+
+    def save_test_pending_snapshot(self, target: Configuration,
+                                   config_dir: str,
+                                   libraries: LibraryRepository,
+                                   profiles: ProfileRepository):
+        # * Prepare
+        target.utility.shard_libraries = True
+        target.utility.save_delay = 60000
+        target.save(profiles, libraries)
+
+        # * Act
+        # snapshot is not written yet, changes are appended after it
+        self._change(libraries, profiles)
+        target.save(profiles, libraries)
+        target.flush()
+        loaded, loaded_profiles = self._load(self._create(config_dir))
+
+        # * Assert
+        assert target.library_journal.record_count == 2
+        assert loaded.to_json() == libraries.to_json()
+        assert loaded_profiles.to_json() == profiles.to_json()
+
+    def save_test_shard_failed(self, target: Configuration, config_dir: str,
+                               libraries: LibraryRepository,
+                               profiles: ProfileRepository):
+        # * Prepare
+        target.utility.shard_libraries = True
+        target.library_shards.write = lambda items, sync=False: False
+
+        # * Act
+        target.save(profiles, libraries)
+        target.flush()
+        failed = target.library_journal.record_count
+        files = dict(target.library_shards.files)
+        del target.library_shards.write
+        self._change(libraries, profiles)
+        target.save(profiles, libraries)
+        target.flush()
+        loaded, _ = self._load(self._create(config_dir))
+
+        # * Assert
+        assert failed is None
+        assert not files
+        assert target.library_journal.record_count == 0
+        assert loaded.to_json() == libraries.to_json()
+
+    def load_libraries_test_shard_damaged(self, target: Configuration,
+                                          config_dir: str,
+                                          libraries: LibraryRepository,
+                                          profiles: ProfileRepository):
+        # * Prepare
+        target.utility.shard_libraries = True
+        target.utility.journal_compact_size = 0
+        target.save(profiles, libraries)
+        target.flush()
+        saved = libraries.to_json()
+        self._change(libraries, profiles)
+        target.save(profiles, libraries)
+        target.flush()
+
+        key = libraries.library_list[1].key
+        damaged = os.path.join(target.library_shards.dir_path,
+                               target.library_shards.files[key])
+        with open(damaged, 'w') as outfile:
+            outfile.write('{"path": ')
+
+        # * Act
+        configuration = self._create(config_dir)
+        repo, _ = configuration.load_libraries()
+
+        # * Assert
+        assert repo == saved
+        assert key not in configuration.library_shards.files
+
+
+if __name__ == '__main__':
+    pytest.main()
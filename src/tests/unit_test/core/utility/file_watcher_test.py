@@ -0,0 +1,121 @@
+import os
+import queue
+import pytest
+
+from typing import List
+
+from src.core.model.file_event import FileEvent, FileEventType
+from src.core.utility.file_watcher import (FileWatcher, InotifyFileWatcher,
+                                           PollingFileWatcher)
+
+
+class FileWatcherTest:
+
+    @pytest.fixture()
+    def test_dir(self, tmp_path) -> str:
+        (tmp_path / 'sub').mkdir()
+        (tmp_path / 'old.ahk').write_text('')
+
+        return str(tmp_path)
+
+    def _change_files(self, test_dir: str):
+        open(os.path.join(test_dir, 'new.ahk'), 'w').close()
+        os.remove(os.path.join(test_dir, 'old.ahk'))
+        os.rmdir(os.path.join(test_dir, 'sub'))
+
+    def _get_events(self, watcher: FileWatcher, count: int) \
+            -> List[FileEvent]:
+        events = []
+        try:
+            while len(events) < count:
+                events.append(watcher.events.get(timeout=5))
+        except queue.Empty:
+            pass
+
+        return sorted(events, key=lambda x: (x.path, x.type))
+
+    def _assert_events(self, test_dir: str, events: List[FileEvent]):
+        assert [(x.type, x.path, x.is_directory) for x in events] == [
+            (FileEventType.CREATED, os.path.join(test_dir, 'new.ahk'), False),
+            (FileEventType.DELETED, os.path.join(test_dir, 'old.ahk'), False),
+            (FileEventType.DELETED, os.path.join(test_dir, 'sub'), True)]
+
+    def polling_file_watcher_test(self, test_dir: str):
+        # * Prepare
+        target = PollingFileWatcher()
+        target.watch(test_dir)
+        self._change_files(test_dir)
+
+        # * Key
+        # directory mtime may not change within the same clock tick
+        target._snapshots[test_dir] = (0,) + target._snapshots[test_dir][1:]
+
+        # * Act
+        target.poll()
+
+        # * Assert
+        self._assert_events(test_dir, self._get_events(target, 3))
+
+    def polling_file_watcher_test_unchanged(self, test_dir: str):
+        # * Prepare
+        target = PollingFileWatcher()
+        target.watch(test_dir)
+
+        # * Act
+        target.poll()
+
+        # * Assert
+        assert target.events.empty()
+
+    @pytest.mark.skipif(not InotifyFileWatcher.is_supported(),
+                        reason='inotify is not supported')
+    def inotify_file_watcher_test(self, test_dir: str):
+        # * Prepare
+        target = InotifyFileWatcher()
+        target.watch(test_dir)
+        target.start()
+
+        # * Act
+        self._change_files(test_dir)
+        events = self._get_events(target, 3)
+        target.stop()
+
+        # * Assert
+        self._assert_events(test_dir, events)
+
+    @pytest.mark.skipif(not InotifyFileWatcher.is_supported(),
+                        reason='inotify is not supported')
+    def inotify_file_watcher_test_restart(self, test_dir: str):
+        # * Prepare
+        target = InotifyFileWatcher()
+        target.watch(test_dir)
+        target.start()
+        target.stop()
+
+        # * Act
+        target.start()
+        watched = target.get_watched()
+        target.watch(test_dir)
+        self._change_files(test_dir)
+        events = self._get_events(target, 3)
+        target.stop()
+
+        # * Assert
+        assert not watched
+        self._assert_events(test_dir, events)
+
+    def sync_test(self, test_dir: str):
+        # * Prepare
+        sub_dir = os.path.join(test_dir, 'sub')
+        target = PollingFileWatcher()
+        target.watch(test_dir)
+
+        # * Act
+        target.sync({sub_dir})
+
+        # * Assert
+        assert target.get_watched() == {sub_dir}
+
+
+if __name__ == '__main__':
+    pytest.main()
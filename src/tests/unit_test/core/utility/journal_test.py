@@ -0,0 +1,104 @@
+import os
+
+import pytest
+
+from src.core.utility.journal import Journal
+
+
+class JournalTest:
+    snapshot = {'profile_list': []}
+
+    @pytest.fixture()
+    def target(self, tmp_path) -> Journal:
+        return Journal(str(tmp_path / 'profile.config'))
+
+    def load_test(self, target: Journal):
+        # * Prepare
+        target.compact(self.snapshot)
+        target.append([['profile', 'a', 0]])
+        target.append([['add', 'a', 'script.ahk'], ['state', 'a', 4]])
+
+        # * Act
+        snapshot, records = Journal(target.path).load()
+
+        # * Assert
+        assert snapshot['profile_list'] == []
+        assert records == [['profile', 'a', 0], ['add', 'a', 'script.ahk'],
+                           ['state', 'a', 4]]
+
+    def load_test_record_not_completed(self, target: Journal):
+        # * Prepare
+        target.compact(self.snapshot)
+        target.append([['profile', 'a', 0]])
+        with open(target.log_path, 'a') as outfile:
+            outfile.write('["add","a"')
+
+        # * Act
+        _, records = target.load()
+
+        # * Assert
+        assert records == [['profile', 'a', 0]]
+        assert target.should_compact(0, 10)
+
+    def load_test_snapshot_damaged(self, target: Journal):
+        # * Prepare
+        target.compact(self.snapshot)
+        target.append([['profile', 'a', 0]])
+        target.compact({'profile_list': [{'name': 'a'}]})
+        target.append([['profile', 'b', 0]])
+        with open(target.path, 'w') as outfile:
+            outfile.write('{"profile_list": [')
+
+        # * Act
+        snapshot, records = target.load()
+
+        # * Assert
+        assert snapshot['profile_list'] == []
+        assert records == [['profile', 'a', 0], ['profile', 'b', 0]]
+        assert target.should_compact(0, 10)
+
+    def load_test_log_not_replaced(self, target: Journal):
+        # * Prepare
+        target.compact(self.snapshot)
+        target.append([['profile', 'a', 0]])
+        os.replace(target.log_path, target.log_path + '.old')
+        target.compact({'profile_list': [{'name': 'a'}]})
+
+        # ! Stopped after snapshot replaced, before log was kept
+        os.replace(target.log_path + '.old', target.log_path)
+
+        # * Act
+        snapshot, records = target.load()
+
+        # * Assert
+        assert snapshot['profile_list'] == [{'name': 'a'}]
+        assert not records
+
+    def compact_test(self, target: Journal):
+        # * Prepare
+        target.compact(self.snapshot)
+        target.append([['profile', 'a', 0]])
+
+        # * Act
+        target.compact({'profile_list': [{'name': 'a'}]})
+        snapshot, records = target.load()
+
+        # * Assert
+        assert snapshot['profile_list'] == [{'name': 'a'}]
+        assert not records
+        assert os.path.exists(target.path + '.bak')
+        assert os.path.exists(target.log_path + '.bak')
+
+    def should_compact_test(self, target: Journal):
+        # * Act
+        not_loaded = target.should_compact(1, 10)
+        target.compact(self.snapshot)
+
+        # * Assert
+        assert not_loaded
+        assert not target.should_compact(10, 10)
+        assert target.should_compact(11, 10)
+
+
+if __name__ == '__main__':
+    pytest.main()
@@ -0,0 +1,58 @@
+import os
+import pytest
+
+from src.core.utility.path_trie import PathTrie
+
+
+class PathTrieTest:
+    root = os.path.join('test', 'root')
+    child = os.path.join('test', 'root', 'child')
+    grandchild = os.path.join('test', 'root', 'child', 'grandchild')
+    other = os.path.join('test', 'root2')
+
+    @pytest.fixture()
+    def target(self) -> PathTrie:
+        trie = PathTrie()
+        for path in [self.root, self.child, self.grandchild, self.other]:
+            trie.add(path, path)
+
+        return trie
+
+    def find_test(self, target: PathTrie):
+        assert target.find(self.child) == self.child
+        assert target.find('test') is None
+        assert target.find(os.path.join('not', 'found')) is None
+
+    def find_longest_prefix_test(self, target: PathTrie):
+        assert target.find_longest_prefix(
+            os.path.join(self.child, 'script.ahk')) == self.child
+        assert target.find_longest_prefix(self.other) == self.other
+        assert target.find_longest_prefix('test') is None
+
+    def iter_subtree_test(self, target: PathTrie):
+        assert list(target.iter_subtree(self.root)) == \
+            [self.root, self.child, self.grandchild]
+        assert list(target.iter_subtree('test')) == \
+            [self.root, self.child, self.grandchild, self.other]
+
+    def remove_test(self, target: PathTrie):
+        # * Act
+        result = target.remove(self.child)
+
+        # * Assert
+        assert result == self.child
+        assert target.find(self.child) is None
+        assert target.find(self.grandchild) == self.grandchild
+
+    def remove_subtree_test(self, target: PathTrie):
+        # * Act
+        result = target.remove_subtree(self.root)
+
+        # * Assert
+        assert result == [self.root, self.child, self.grandchild]
+        assert list(target.iter_subtree('test')) == [self.other]
+        assert not target.root.children['test'].children.get('root')
+
+
+if __name__ == '__main__':
+    pytest.main()
@@ -0,0 +1,91 @@
+import threading
+
+import pytest
+
+from src.core.utility.save_worker import SaveWorker
+
+
+class SaveWorkerTest:
+
+    @pytest.fixture()
+    def saved(self) -> threading.Event:
+        return threading.Event()
+
+    @pytest.fixture()
+    def target(self, saved: threading.Event) -> SaveWorker:
+        def save():
+            # nothing to write once saved
+            if saved.is_set():
+                return False
+
+            saved.set()
+            return True
+
+        worker = SaveWorker(save)
+        worker.start()
+        yield worker
+        worker.stop()
+
+    def request_test(self, target: SaveWorker, saved: threading.Event):
+        # * Act
+        for _ in range(50):
+            target.request(0.05)
+        saved.wait(5)
+        target.stop()
+
+        # * Assert
+        assert target.requested == 50
+        assert target.performed == 1
+
+    def stop_test_pending(self, target: SaveWorker, saved: threading.Event):
+        # * Act
+        target.request(60)
+        target.stop()
+
+        # * Assert
+        assert saved.is_set()
+        assert target.performed == 1
+
+    def request_test_save_failed(self, saved: threading.Event):
+        # * Prepare
+        failed = threading.Event()
+
+        def save():
+            if not failed.is_set():
+                failed.set()
+                raise ValueError('not serializable')
+            if saved.is_set():
+                return False
+
+            saved.set()
+            return True
+
+        target = SaveWorker(save)
+        target.start()
+
+        # * Act
+        target.request(0)
+        failed.wait(5)
+        target.request(0)
+        saved.wait(5)
+        target.stop()
+
+        # * Assert
+        assert saved.is_set()
+        assert target.performed == 1
+
+    def flush_test_nothing_written(self):
+        # * Prepare
+        target = SaveWorker(lambda: False)
+
+        # * Act
+        target.request(60)
+        target.flush()
+
+        # * Assert
+        assert target.requested == 1
+        assert target.performed == 0
+
+
+if __name__ == '__main__':
+    pytest.main()
@@ -0,0 +1,93 @@
+import os
+
+import pytest
+
+from src.core.utility.shard_store import ShardStore
+
+
+class ShardStoreTest:
+    keys = ['library0', 'library1', 'library2']
+
+    @pytest.fixture()
+    def target(self, tmp_path) -> ShardStore:
+        return ShardStore(str(tmp_path / 'libraries'))
+
+    def plan_test(self, target: ShardStore):
+        # * Prepare
+        _, first = target.plan(self.keys, None)
+
+        # * Act
+        manifest, writes = target.plan(self.keys, {'library1'})
+
+        # * Assert
+        assert len(first) == 3
+        assert list(writes.values()) == ['library1']
+        assert [x[0] for x in manifest[ShardStore.manifest_key]] == self.keys
+        assert ShardStore.is_manifest(manifest)
+        assert not ShardStore.is_manifest({'library_list': []})
+
+    def load_test(self, target: ShardStore):
+        # * Prepare
+        manifest, writes = target.plan(self.keys, None)
+        target.write({x: {'path': key} for x, key in writes.items()})
+
+        # * Act
+        result = ShardStore(target.dir_path).load(manifest, 2)
+
+        # * Assert
+        assert result == [{'path': x} for x in self.keys]
+
+    def load_test_file_missing(self, target: ShardStore):
+        # * Prepare
+        manifest, writes = target.plan(self.keys, None)
+        target.write({x: {'path': key} for x, key in writes.items()})
+        os.remove(os.path.join(target.dir_path,
+                               manifest[ShardStore.manifest_key][1][1]))
+
+        # * Act
+        result = target.load(manifest)
+
+        # * Assert
+        assert result == [{'path': 'library0'}, {'path': 'library2'}]
+        assert list(target.files) == ['library0', 'library2']
+
+    def load_test_backup(self, target: ShardStore):
+        # * Prepare
+        backup, writes = target.plan(self.keys, None)
+        target.write({x: {'path': key} for x, key in writes.items()})
+        manifest, writes = target.plan(self.keys, {'library1'})
+        target.write({x: {'path': key, 'new': True}
+                      for x, key in writes.items()})
+        damaged = manifest[ShardStore.manifest_key][1][1]
+        with open(os.path.join(target.dir_path, damaged), 'w') as outfile:
+            outfile.write('{"path": ')
+
+        # * Act
+        result = target.load(manifest, 2, backup)
+
+        # * Assert
+        assert result == [{'path': x} for x in self.keys]
+        assert list(target.files) == ['library0', 'library2']
+        assert backup[ShardStore.manifest_key][1][1] in \
+            target.manifest_files
+
+    def saved_test(self, target: ShardStore):
+        # * Prepare
+        manifests = []
+        for modified in [None, {'library1'}, {'library1'}, {'library1'}]:
+            manifest, writes = target.plan(self.keys, modified)
+            target.write({x: {} for x in writes})
+            manifests.append(manifest)
+
+            # * Act
+            target.saved(manifest)
+
+        # * Assert
+        # files of the last two manifests are kept
+        assert sorted(os.listdir(target.dir_path)) == sorted(
+            set(x[1] for x in manifests[2][ShardStore.manifest_key]) |
+            set(x[1] for x in manifests[3][ShardStore.manifest_key]))
+
+
+if __name__ == '__main__':
+    pytest.main()
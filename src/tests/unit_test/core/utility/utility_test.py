@@ -1,7 +1,8 @@
+import os
 import pytest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
-from src.core.utility.utility import Utility
+from src.core.utility.utility import StatCache, Utility
 
 
 class UtilityTest:
@@ -53,6 +54,143 @@ class UtilityTest:
 
         assert expected_result == result
 
+    def walk_directories_test(self, utility, tmp_path):
+        (tmp_path / 'a' / 'b').mkdir(parents=True)
+        (tmp_path / 'c').mkdir()
+        (tmp_path / 'root.ahk').write_text('')
+        (tmp_path / 'a' / 'a.ahk').write_text('')
+        (tmp_path / 'a' / 'b' / 'b.ahk').write_text('')
+
+        result = dict(utility.walk_directories(str(tmp_path)))
+
+        assert list(result) == \
+            [str(tmp_path)] + utility.get_directories(str(tmp_path))
+        assert result[str(tmp_path)] == [str(tmp_path / 'root.ahk')]
+        assert result[str(tmp_path / 'a' / 'b')] == \
+            [str(tmp_path / 'a' / 'b' / 'b.ahk')]
+        assert result[str(tmp_path / 'c')] == []
+
+    def walk_directories_test_invalid_path(self, utility):
+        result = list(utility.walk_directories('C:invalid**path'))
+
+        assert result == [('C:invalid**path', [])]
+
+    def walk_directories_test_concurrent(self, utility, tmp_path):
+        for name in ['a', 'b', 'c']:
+            (tmp_path / name / 'sub').mkdir(parents=True)
+            (tmp_path / name / 'sub' / 'script.ahk').write_text('')
+
+        expected_result = list(utility.walk_directories(str(tmp_path)))
+        result = list(utility.walk_directories(str(tmp_path), 4))
+
+        assert expected_result == result
+
+    def is_file_test(self, utility, tmp_path):
+        file_path = tmp_path / 'script.ahk'
+        file_path.write_text('')
+
+        assert utility.is_file(str(file_path))
+        assert not utility.is_file(str(tmp_path))
+        assert not utility.is_file(str(tmp_path / 'missing.ahk'))
+        assert utility.is_dir(str(tmp_path))
+        assert not utility.is_dir(str(file_path))
+        assert utility.path_exists(str(file_path))
+
+    def stat_cache_test(self, tmp_path):
+        target = StatCache()
+        target.configure(True, 60)
+        file_path = str(tmp_path / 'script.ahk')
+        open(file_path, 'w').close()
+
+        with patch('os.stat', wraps=os.stat) as stat:
+            target.get_mode(file_path)
+            target.get_mode(file_path)
+            assert stat.call_count == 1
+
+            target.new_generation()
+            target.get_mode(file_path)
+            assert stat.call_count == 2
+
+            target.invalidate(file_path)
+            target.get_mode(file_path)
+            assert stat.call_count == 3
+
+    def stat_cache_test_disabled(self, tmp_path):
+        target = StatCache()
+        file_path = str(tmp_path / 'script.ahk')
+        open(file_path, 'w').close()
+
+        with patch('os.stat', wraps=os.stat) as stat:
+            target.get_mode(file_path)
+            target.get_mode(file_path)
+            assert stat.call_count == 2
+
+    def stat_cache_test_expired(self, tmp_path):
+        target = StatCache()
+        target.configure(True, 0)
+        file_path = str(tmp_path / 'script.ahk')
+
+        assert target.get_mode(file_path) is None
+
+        open(file_path, 'w').close()
+        assert target.get_mode(file_path) is not None
+
+    def get_path_key_test(self, utility):
+        path = os.path.join('test', 'library', 'script.ahk')
+        other = os.path.join('test', '.', 'library', '..', 'library',
+                             'script.ahk')
+
+        assert utility.get_path_key(path) is utility.get_path_key(other)
+        assert utility.get_path_key(path) == os.path.normcase(path)
+
+    def write_file_test(self, utility, tmp_path):
+        file_path = str(tmp_path / 'library.config')
+
+        assert utility.write_file(file_path, 'old', backup=True)
+        assert utility.write_file(file_path, 'new', sync=True, backup=True)
+
+        assert open(file_path).read() == 'new'
+        assert open(file_path + '.bak').read() == 'old'
+        assert not os.path.exists(file_path + '.tmp')
+
+    def write_file_test_failed(self, utility, tmp_path):
+        file_path = str(tmp_path / 'library.config')
+        utility.write_file(file_path, 'old')
+
+        with patch('os.replace', side_effect=OSError):
+            assert not utility.write_file(file_path, 'new')
+
+        assert open(file_path).read() == 'old'
+        assert not os.path.exists(file_path + '.tmp')
+
+    def write_file_test_backup_replace_failed(self, utility, tmp_path):
+        file_path = str(tmp_path / 'library.config')
+        utility.write_file(file_path, 'old')
+        replace = os.replace
+
+        def replace_backup_only(src, dst):
+            if dst == file_path:
+                raise OSError()
+            replace(src, dst)
+
+        # file is kept when failed after backup, e.g. crashed
+        with patch('os.replace', side_effect=replace_backup_only):
+            assert not utility.write_file(file_path, 'new', backup=True)
+
+        assert open(file_path).read() == 'old'
+        assert open(file_path + '.bak').read() == 'old'
+
+    def write_file_test_backup_copied(self, utility, tmp_path):
+        file_path = str(tmp_path / 'library.config')
+        utility.write_file(file_path, 'old')
+
+        with patch('os.link', side_effect=OSError):
+            assert utility.write_file(file_path, 'new', backup=True)
+
+        assert open(file_path).read() == 'new'
+        assert open(file_path + '.bak').read() == 'old'
+        assert not os.path.exists(file_path + '.bak.tmp')
+
 
 if __name__ == '__main__':
     pytest.main()